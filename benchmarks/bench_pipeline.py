@@ -0,0 +1,226 @@
+"""Load-test evaluate_image against the local mock Responses API server.
+
+Starts ``vibeai.llm.mock_server`` in a subprocess (so its CPU time isn't
+counted as ours), points the OpenAI client at it, and runs
+``evaluate_images`` for each metric at each concurrency over a synthetic
+corpus (cached under --corpus-dir). Each run gets a fresh LLM cache and goes
+over the corpus twice:
+
+- cold: every call goes to the mock, with its latency, 429s and malformed
+  outputs; reports images/s and CPU ms per image - the pipeline's own
+  overhead (prompt building, image encoding, SSE parsing, validation,
+  caching, logging), which is what this benchmark exists to watch;
+- warm: every call is an LLM-cache hit; images/s and CPU ms per image of
+  the orchestration alone.
+
+Retry amplification is the API requests the mock served per logical call
+(first attempts in the usage log): 1.0 means nothing was retried.
+
+--save writes the results as JSON; --check compares CPU ms per image
+against saved results and exits non-zero if any got more than --tolerance
+slower, so a CI job can catch orchestration regressions without spending
+tokens.
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --metrics plausibility --concurrency 10 50 --n-images 100
+    python benchmarks/bench_pipeline.py --rate-limit-share 0.05 --malformed-share 0.02
+    python benchmarks/bench_pipeline.py --save results/_experiments/bench_pipeline/baseline.json
+    python benchmarks/bench_pipeline.py --check results/_experiments/bench_pipeline/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from PIL import Image
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from vibeai.llm import budget, client, usage_log  # noqa: E402
+from vibeai.llm.transport import TransportConfig, set_transport  # noqa: E402
+from vibeai.metrics.decomposition_quality import DecompositionQualityMetric  # noqa: E402
+from vibeai.metrics.plausibility import PlausibilityMetric  # noqa: E402
+from vibeai.pipeline import image_policy  # noqa: E402
+from vibeai.pipeline.evaluate import evaluate_images  # noqa: E402
+
+DEFAULT_CORPUS_DIR = REPO_ROOT / ".cache" / "bench" / "pipeline_corpus"
+METRICS = {"plausibility": PlausibilityMetric, "decomposition_quality": DecompositionQualityMetric}
+
+
+def build_corpus(corpus_dir: Path, n_images: int) -> list[Path]:
+    """Small, distinct JPEGs: the mock never looks at them, but the pipeline
+    still loads, resizes and encodes each one."""
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(n_images):
+        path = corpus_dir / f"synthetic_{i}.jpg"
+        if not path.exists():
+            noise = Image.effect_noise((1024, 768), 32 + i % 64).convert("RGB")
+            noise.save(path, format="JPEG", quality=85)
+        paths.append(path)
+    return paths
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _mock(base: str, path: str, method: str = "GET") -> dict:
+    with urllib.request.urlopen(urllib.request.Request(f"{base}{path}", method=method), timeout=5) as r:
+        return json.loads(r.read())
+
+
+def start_mock_server(port: int, args: argparse.Namespace) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "vibeai.llm.mock_server",
+            "--port", str(port),
+            "--latency", args.latency,
+            "--seconds-per-output-token", str(args.seconds_per_output_token),
+            "--rate-limit-share", str(args.rate_limit_share),
+            "--malformed-share", str(args.malformed_share),
+        ],
+        cwd=REPO_ROOT,
+    )
+    deadline = time.monotonic() + 15
+    while True:
+        try:
+            _mock(f"http://127.0.0.1:{port}", "/usage")
+            return server
+        except OSError:
+            if server.poll() is not None or time.monotonic() > deadline:
+                server.kill()
+                raise RuntimeError("Mock server didn't start")
+            time.sleep(0.1)
+
+
+async def _pass(metric, paths: list[Path], concurrency: int) -> dict:
+    wall, cpu = time.perf_counter(), time.process_time()
+    errors = 0
+    async for _, outcome in evaluate_images(paths, metric, limit=concurrency):
+        errors += isinstance(outcome, BaseException)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return {
+        "images_per_sec": len(paths) / wall,
+        "cpu_ms_per_image": 1000 * cpu / len(paths),
+        "errors": errors,
+    }
+
+
+async def run(metric_name: str, concurrency: int, paths: list[Path], base: str, work_dir: Path) -> dict:
+    # A fresh LLM cache, resized-image cache, usage log and token budget per run.
+    client.CACHE_DIR = work_dir / "llm"
+    image_policy.VARIANT_CACHE_DIR = work_dir / "image_variants"
+    usage_log.USAGE_LOG_PATH = work_dir / "calls.jsonl"
+    budget._default_budget = budget.TokenBudget(daily_limit=10**12, path=work_dir / "budget.json")
+    set_transport(TransportConfig.for_concurrency(concurrency))
+    _mock(base, "/usage/reset", method="POST")
+    metric = METRICS[metric_name]()
+
+    cold = await _pass(metric, paths, concurrency)
+    served = _mock(base, "/usage")
+    first_attempts = sum(r.get("attempt") == 1 for r in usage_log.read_records(usage_log.USAGE_LOG_PATH))
+    warm = await _pass(metric, paths, concurrency)
+    return {
+        "metric": metric_name,
+        "concurrency": concurrency,
+        "cold": cold,
+        "warm": warm,
+        "retry_amplification": served["requests"] / max(first_attempts, 1),
+        "mock_usage": served,
+    }
+
+
+def _check(results: list[dict], baseline_path: Path, tolerance: float) -> list[str]:
+    baseline = {(r["metric"], r["concurrency"]): r for r in json.loads(baseline_path.read_text())}
+    regressions = []
+    for r in results:
+        before = baseline.get((r["metric"], r["concurrency"]))
+        if before is None:
+            continue
+        for phase in ("cold", "warm"):
+            now, then = r[phase]["cpu_ms_per_image"], before[phase]["cpu_ms_per_image"]
+            if now > then * (1 + tolerance):
+                regressions.append(
+                    f"{r['metric']} @ {r['concurrency']} {phase}: {now:.1f} CPU ms/image (was {then:.1f})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--metrics", nargs="+", choices=sorted(METRICS), default=sorted(METRICS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 30])
+    parser.add_argument("--n-images", type=int, default=30)
+    parser.add_argument("--corpus-dir", type=Path, default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--latency", default="lognormal:0.2,0.4", help="See vibeai.llm.mock_server.")
+    parser.add_argument("--seconds-per-output-token", type=float, default=0.0005)
+    parser.add_argument("--rate-limit-share", type=float, default=0.0)
+    parser.add_argument("--malformed-share", type=float, default=0.0)
+    parser.add_argument("--save", type=Path, default=None)
+    parser.add_argument("--check", type=Path, default=None, help="Fail on CPU ms/image regressions vs. this.")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    paths = build_corpus(args.corpus_dir, args.n_images)
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    os.environ.update(OPENAI_BASE_URL=f"{base}/v1", OPENAI_API_KEY="mock")
+    server = start_mock_server(port, args)
+
+    async def run_all() -> list[dict]:
+        # One event loop throughout: the async clients are kept per transport config.
+        results = []
+        for metric_name in args.metrics:
+            for concurrency in args.concurrency:
+                with tempfile.TemporaryDirectory() as work_dir:
+                    results.append(await run(metric_name, concurrency, paths, base, Path(work_dir)))
+        return results
+
+    try:
+        results = asyncio.run(run_all())
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{len(paths)} images; mock latency {args.latency}, 429 share {args.rate_limit_share}, "
+          f"malformed share {args.malformed_share}")
+    print(
+        f"{'metric':<24}{'conc':>5}{'img/s':>8}{'CPU ms/img':>12}{'warm img/s':>12}"
+        f"{'warm CPU ms':>13}{'retry amp':>11}{'errors':>8}"
+    )
+    for r in results:
+        cold, warm = r["cold"], r["warm"]
+        print(
+            f"{r['metric']:<24}{r['concurrency']:>5}"
+            f"{cold['images_per_sec']:>8.2f}{cold['cpu_ms_per_image']:>12.1f}"
+            f"{warm['images_per_sec']:>12.1f}{warm['cpu_ms_per_image']:>13.1f}"
+            f"{r['retry_amplification']:>11.2f}{cold['errors'] + warm['errors']:>8d}"
+        )
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(results, indent=2))
+        print(f"\nSaved to {args.save}")
+    if args.check:
+        regressions = _check(results, args.check, args.tolerance)
+        if regressions:
+            print(f"\nCPU time regressions (> {args.tolerance:.0%}):\n" + "\n".join(regressions))
+            sys.exit(1)
+        print(f"\nNo CPU time regressions vs. {args.check}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark preprocess_image_bytes: full-resolution decode vs. draft mode.
+
+Generates a synthetic corpus of large camera-sized JPEGs (24 and 48 MP by
+default, cached under --corpus-dir so reruns skip generation), then runs
+each decode path in its own fresh subprocess so peak RSS is measured per
+path rather than accumulated across both. Reports images/sec, peak RSS, and
+the PSNR of the draft output against the full-decode output, so a speedup
+can be checked for not costing visible quality.
+
+Usage:
+    python benchmarks/bench_preprocess.py
+    python benchmarks/bench_preprocess.py --n-images 16 --megapixels 24 48
+"""
+
+import argparse
+import io
+import json
+import math
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image, ImageChops, ImageFilter, ImageStat
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from preprocess import preprocess_image_bytes  # noqa: E402
+
+DEFAULT_CORPUS_DIR = REPO_ROOT / ".cache" / "bench" / "preprocess_corpus"
+
+
+def _synthetic_photo(megapixels: int, seed: int) -> bytes:
+    """A camera-sized JPEG with smooth gradients plus fine noise, so it
+    compresses (and decodes) like a photo rather than a flat test card."""
+    width = int(math.sqrt(megapixels * 1_000_000 * 3 / 2))
+    height = width * 2 // 3
+    small = Image.effect_mandelbrot((width // 16, height // 16), (-2 + seed * 0.01, -1, 1, 1), 60)
+    base = Image.merge(
+        "RGB",
+        (
+            small.resize((width, height), Image.BICUBIC),
+            small.rotate(180).resize((width, height), Image.BICUBIC),
+            Image.linear_gradient("L").resize((width, height)),
+        ),
+    )
+    noise = Image.effect_noise((width, height), 24).convert("RGB")
+    img = ImageChops.add(base, noise, scale=1.0, offset=-64).filter(ImageFilter.SMOOTH)
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=92)
+    return buffer.getvalue()
+
+
+def build_corpus(corpus_dir: Path, n_images: int, megapixels: list[int]) -> list[Path]:
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(n_images):
+        mp = megapixels[i % len(megapixels)]
+        path = corpus_dir / f"synthetic_{mp}mp_{i}.jpg"
+        if not path.exists():
+            path.write_bytes(_synthetic_photo(mp, i))
+        paths.append(path)
+    return paths
+
+
+def _peak_rss_mb() -> float:
+    """This process's peak RSS. Prefers /proc's VmHWM, which starts fresh at
+    exec, over ru_maxrss, which Linux carries over from the parent across
+    fork+exec (and would report the corpus generator's peak)."""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_mode(mode: str, paths: list[Path], out_dir: Path) -> None:
+    """Child-process entry point: process every image, print JSON stats."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    raws = [p.read_bytes() for p in paths]
+    start = time.perf_counter()
+    for path, raw in zip(paths, raws):
+        (out_dir / path.name).write_bytes(preprocess_image_bytes(raw, draft=(mode == "draft")))
+    elapsed = time.perf_counter() - start
+    print(
+        json.dumps(
+            {
+                "mode": mode,
+                "seconds": elapsed,
+                "images_per_sec": len(paths) / elapsed,
+                "peak_rss_mb": _peak_rss_mb(),
+            }
+        )
+    )
+
+
+def _psnr(a: Path, b: Path) -> float:
+    img_a, img_b = Image.open(a).convert("RGB"), Image.open(b).convert("RGB")
+    if img_a.size != img_b.size:
+        return float("nan")
+    mse = sum(v**2 for v in ImageStat.Stat(ImageChops.difference(img_a, img_b)).rms) / 3
+    return float("inf") if mse == 0 else 10 * math.log10(255**2 / mse)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-images", type=int, default=8)
+    parser.add_argument("--megapixels", type=int, nargs="+", default=[24, 48])
+    parser.add_argument("--corpus-dir", type=Path, default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--_child", choices=["full", "draft"], help=argparse.SUPPRESS)
+    parser.add_argument("--_out-dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    paths = build_corpus(args.corpus_dir, args.n_images, args.megapixels)
+    if args._child:
+        _run_mode(args._child, paths, args._out_dir)
+        return
+
+    out_root = args.corpus_dir.parent / "preprocess_out"
+    results = {}
+    for mode in ("full", "draft"):
+        proc = subprocess.run(
+            [
+                sys.executable, __file__,
+                "--n-images", str(args.n_images),
+                "--megapixels", *map(str, args.megapixels),
+                "--corpus-dir", str(args.corpus_dir),
+                "--_child", mode,
+                "--_out-dir", str(out_root / mode),
+            ],
+            check=True, capture_output=True, text=True,
+        )
+        results[mode] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    psnrs = [_psnr(out_root / "full" / p.name, out_root / "draft" / p.name) for p in paths]
+    print(f"{len(paths)} images ({', '.join(f'{mp} MP' for mp in args.megapixels)}) -> max side 1024")
+    print(f"{'mode':<8}{'images/s':>10}{'seconds':>10}{'peak RSS MB':>14}")
+    for mode, r in results.items():
+        print(f"{mode:<8}{r['images_per_sec']:>10.2f}{r['seconds']:>10.2f}{r['peak_rss_mb']:>14.1f}")
+    speedup = results["draft"]["images_per_sec"] / results["full"]["images_per_sec"]
+    print(f"\ndraft speedup: {speedup:.2f}x; PSNR draft vs full: min {min(psnrs):.1f} dB, "
+          f"mean {sum(psnrs) / len(psnrs):.1f} dB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark the OpenAI client's HTTP transport: connection overhead per request.
+
+Sends the same small Responses API request --n-requests times at each
+--concurrency to a local Responses-compatible server (--base-url; e.g.
+``uv run -m vibeai.llm.mock_server --latency fixed:0.01``), through async
+clients built a few ways:
+
+- sdk-default: the SDK's own HTTP client (5s keep-alive, no HTTP/2);
+- no-keepalive: a new connection for every request, the worst case of
+  connection churn;
+- tuned: ``TransportConfig.for_concurrency`` (see vibeai.llm.transport);
+- tuned-http1: the same over HTTP/1.1, when HTTP/2 is available at all.
+
+Reports requests/s and latency percentiles per mode, and each mode's mean
+latency over tuned's: the connection overhead tuning saves per request.
+Against a local server that's mostly pool and handshake cost; against the
+real API, TLS adds to it.
+
+Usage:
+    python benchmarks/bench_transport.py --base-url http://127.0.0.1:8100/v1
+    python benchmarks/bench_transport.py --base-url http://127.0.0.1:8100/v1 --concurrency 30 100
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from openai import AsyncOpenAI
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from vibeai.eval.concurrency import gather_bounded  # noqa: E402
+from vibeai.llm.transport import TransportConfig, http2_available  # noqa: E402
+from vibeai.tracing import LatencyHistogram  # noqa: E402
+
+
+def _client(mode: str, base_url: str, concurrency: int) -> AsyncOpenAI:
+    if mode == "sdk-default":
+        return AsyncOpenAI(base_url=base_url, api_key="bench", max_retries=0)
+    config = TransportConfig.for_concurrency(concurrency)
+    if mode == "no-keepalive":
+        config = replace(config, max_keepalive_connections=0, http2=False)
+    elif mode == "tuned-http1":
+        config = replace(config, http2=False)
+    http_client = config.async_http_client()
+    return AsyncOpenAI(base_url=base_url, api_key="bench", max_retries=0, http_client=http_client)
+
+
+async def _run_mode(mode: str, base_url: str, concurrency: int, n_requests: int, model: str) -> dict:
+    client = _client(mode, base_url, concurrency)
+    latencies = LatencyHistogram()
+
+    async def request():
+        start = time.perf_counter()
+        await client.responses.create(model=model, input="ping")
+        latencies.record(int((time.perf_counter() - start) * 1e6))
+
+    try:
+        await request()  # so every mode starts from one open connection
+        latencies = LatencyHistogram()
+        start = time.perf_counter()
+        await gather_bounded([request() for _ in range(n_requests)], limit=concurrency)
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.close()
+    return {
+        "requests_per_sec": n_requests / elapsed,
+        "p50_ms": latencies.percentile(50) / 1e3,
+        "p95_ms": latencies.percentile(95) / 1e3,
+        "mean_ms": latencies.mean / 1e3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", required=True, help="A Responses-compatible server, e.g. a local mock.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 30, 100])
+    parser.add_argument("--n-requests", type=int, default=500)
+    parser.add_argument("--model", default="bench")
+    args = parser.parse_args()
+
+    modes = ["sdk-default", "no-keepalive", "tuned"] + (["tuned-http1"] if http2_available() else [])
+    http2 = "on" if http2_available() else "unavailable: install h2"
+    print(f"{args.n_requests} requests per mode to {args.base_url} (HTTP/2 {http2})")
+    for concurrency in args.concurrency:
+        results = {
+            mode: asyncio.run(_run_mode(mode, args.base_url, concurrency, args.n_requests, args.model))
+            for mode in modes
+        }
+        tuned = results["tuned"]["mean_ms"]
+        print(f"\nconcurrency {concurrency}")
+        print(f"{'mode':<14}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'mean ms':>9}{'overhead ms':>13}")
+        for mode, r in results.items():
+            print(
+                f"{mode:<14}{r['requests_per_sec']:>9.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}"
+                f"{r['mean_ms']:>9.1f}{r['mean_ms'] - tuned:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
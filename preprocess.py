@@ -1,8 +1,15 @@
+import argparse
+import hashlib
 import io
+import json
+import os
 import re
-import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from PIL import Image, ImageOps, ImageFile
+from PIL import ExifTags, Image, ImageOps, ImageFile
+
+from vibeai.eval.dataset import MANIFEST_NAME
+from vibeai.eval.near_dup import DEFAULT_MAX_DISTANCE, cluster, dhash_bytes
 
 ImageFile.LOAD_TRUNCATED_IMAGES = True
 
@@ -11,6 +18,24 @@ DST_DIR = Path("data/main_processed")
 MAX_SIDE = 1024
 QUALITY = 90
 VALID_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tiff", ".tif", ".gif"}
+# For non-JPEG sources on the draft path: box-reduce (Image.reduce) down to
+# no less than this multiple of the target size before the LANCZOS resize.
+# 3.0 is Pillow's own recommendation for output indistinguishable from a
+# plain LANCZOS resize.
+DRAFT_REDUCING_GAP = 3.0
+
+# One manifest (MANIFEST_NAME) per output directory, replacing the old
+# per-image ".<name>.srchash" sidecars: source file name -> {size, mtime_ns,
+# sha256, output, <OUTPUT_FIELDS>, cluster}. A source whose size and mtime
+# match its entry is skipped without being read at all. The output fields
+# describe the processed file so vibeai.eval.dataset can filter, stratify
+# and split without opening images; dhash/cluster drive near-duplicate
+# detection (vibeai.eval.near_dup).
+OUTPUT_FIELDS = ("width", "height", "bytes", "output_sha256", "dhash")
+
+# Save the manifest every this many processed images, so an interrupted run
+# doesn't redo finished work.
+MANIFEST_SAVE_EVERY = 200
 
 
 def sanitize_stem(stem: str) -> str:
@@ -25,8 +50,42 @@ def short_hash(data: bytes, length: int = 8) -> str:
     return hashlib.sha256(data).hexdigest()[:length]
 
 
-def preprocess_image_bytes(raw: bytes, max_side=MAX_SIDE, quality=QUALITY) -> bytes:
+def _target_size(width: int, height: int, max_side: int) -> tuple[int, int] | None:
+    longer_side = max(width, height)
+    if longer_side <= max_side:
+        return None
+    scale = max_side / longer_side
+    return round(width * scale), round(height * scale)
+
+
+def preprocess_image_bytes(
+    raw: bytes, max_side=MAX_SIDE, quality=QUALITY, draft: bool = True
+) -> bytes:
+    """Normalize one image to an RGB JPEG whose longer side is at most
+    ``max_side``.
+
+    With ``draft`` (the default), a JPEG is decoded straight at the smallest
+    DCT scale (1/2, 1/4 or 1/8) that still covers the target size, instead
+    of at full resolution. For a 24-48 MP camera JPEG going to 1024 px, that
+    skips most of the decode work and memory. Other formats shrink via
+    ``reduce()`` (integer box downscale) down to ``DRAFT_REDUCING_GAP`` x the
+    target. In both cases a final LANCZOS resize to the exact size the
+    full-resolution path would produce does the quality-sensitive part.
+    """
     img = Image.open(io.BytesIO(raw))
+    # Target computed from the full-resolution size before draft() shrinks
+    # img.size, so output dimensions don't depend on the decode path. EXIF
+    # orientations 5-8 swap width/height in exif_transpose() below.
+    full_width, full_height = img.size
+    if img.getexif().get(ExifTags.Base.Orientation) in (5, 6, 7, 8):
+        full_width, full_height = full_height, full_width
+    target = _target_size(full_width, full_height, max_side)
+
+    if draft and target is not None and img.format == "JPEG":
+        # draft() works in stored (pre-rotation) orientation.
+        swapped = img.size != (full_width, full_height)
+        img.draft(None, (target[1], target[0]) if swapped else target)
+
     img = ImageOps.exif_transpose(img)
 
     if getattr(img, "is_animated", False):
@@ -35,66 +94,224 @@ def preprocess_image_bytes(raw: bytes, max_side=MAX_SIDE, quality=QUALITY) -> by
     if img.mode != "RGB":
         img = img.convert("RGB")
 
-    width, height = img.size
-    longer_side = max(width, height)
-    if longer_side > max_side:
-        scale = max_side / longer_side
-        new_size = (round(width * scale), round(height * scale))
-        img = img.resize(new_size, Image.LANCZOS)
+    if target is not None:
+        img = img.resize(target, Image.LANCZOS, reducing_gap=DRAFT_REDUCING_GAP if draft else None)
 
     buffer = io.BytesIO()
     img.save(buffer, format="JPEG", quality=quality, optimize=True)
     return buffer.getvalue()
 
 
-def process_directory(src_dir: Path = SRC_DIR, dst_dir: Path = DST_DIR):
+def load_manifest(dst_dir: Path) -> dict[str, dict]:
+    path = dst_dir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_manifest(dst_dir: Path, manifest: dict[str, dict]) -> None:
+    path = dst_dir / MANIFEST_NAME
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    tmp.replace(path)
+
+
+def _legacy_srchashes(dst_dir: Path) -> dict[str, str]:
+    """short source hash -> output name, from pre-manifest sidecar files, so
+    an existing processed directory is adopted instead of reprocessed."""
+    return {
+        marker.read_text().strip(): marker.name[1:].removesuffix(".srchash")
+        for marker in dst_dir.glob(".*.srchash")
+    }
+
+
+def _hash_file(src_path: Path) -> tuple[str, str | None, str | None]:
+    """(file name, sha256 hex, error) - runs in a worker process."""
+    try:
+        return src_path.name, hashlib.sha256(src_path.read_bytes()).hexdigest(), None
+    except Exception as e:
+        return src_path.name, None, str(e)
+
+
+def describe_output(jpeg_bytes: bytes) -> dict:
+    """The manifest's OUTPUT_FIELDS for one processed image."""
+    with Image.open(io.BytesIO(jpeg_bytes)) as img:
+        width, height = img.size
+    return {
+        "width": width,
+        "height": height,
+        "bytes": len(jpeg_bytes),
+        "output_sha256": hashlib.sha256(jpeg_bytes).hexdigest(),
+        "dhash": f"{dhash_bytes(jpeg_bytes):016x}",
+    }
+
+
+def _process_file(src_path: Path, out_path: Path) -> tuple[str, dict | None, str | None]:
+    """Decode/resize/encode one image, write it, and describe the result -
+    runs in a worker process. Returns (file name, output fields, error)."""
+    try:
+        jpeg_bytes = preprocess_image_bytes(src_path.read_bytes())
+        out_path.write_bytes(jpeg_bytes)
+        return src_path.name, describe_output(jpeg_bytes), None
+    except Exception as e:
+        return src_path.name, None, str(e)
+
+
+def _describe_file(name: str, out_path: Path) -> tuple[str, dict | None, str | None]:
+    """Describe an already-processed output (entries written before a field
+    existed) - runs in a worker process."""
+    try:
+        return name, describe_output(out_path.read_bytes()), None
+    except Exception as e:
+        return name, None, str(e)
+
+
+def _map(fn, *iterables, workers: int):
+    if workers <= 1:
+        yield from map(fn, *iterables)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(fn, *iterables, chunksize=8)
+
+
+def process_directory(
+    src_dir: Path = SRC_DIR,
+    dst_dir: Path = DST_DIR,
+    workers: int | None = None,
+    dup_threshold: int = DEFAULT_MAX_DISTANCE,
+):
+    workers = workers or os.cpu_count() or 1
     dst_dir.mkdir(parents=True, exist_ok=True)
 
-    used_names = {p.name for p in dst_dir.glob("*.jpg")}
+    manifest = load_manifest(dst_dir)
+    legacy = _legacy_srchashes(dst_dir) if not manifest else {}
     n_ok, n_skip, n_err = 0, 0, 0
 
+    # 1. stat-only pass: anything whose size + mtime match its manifest entry
+    # (and whose output still exists) is done without opening it.
+    stats: dict[str, os.stat_result] = {}
+    to_hash: list[Path] = []
     for src_path in sorted(src_dir.iterdir()):
         if not src_path.is_file() or src_path.suffix.lower() not in VALID_EXTS:
             continue
+        st = src_path.stat()
+        stats[src_path.name] = st
+        entry = manifest.get(src_path.name)
+        if (
+            entry is not None
+            and entry["size"] == st.st_size
+            and entry["mtime_ns"] == st.st_mtime_ns
+            and (dst_dir / entry["output"]).exists()
+        ):
+            n_skip += 1
+        else:
+            to_hash.append(src_path)
+    # Sources that are gone drop out of the manifest, so nothing downstream
+    # evaluates their outputs (which are left on disk).
+    for name in manifest.keys() - stats.keys():
+        del manifest[name]
 
-        stem = sanitize_stem(src_path.stem)
-        out_name = f"{stem}.jpg"
-        out_path = dst_dir / out_name
-
-        try:
-            raw = src_path.read_bytes()
-        except Exception as e:
-            print(f"[ERROR] could not read {src_path.name}: {e}")
+    # 2. hash new/changed-looking files in parallel; a file that was only
+    # touched (same content) just gets its size/mtime refreshed.
+    used_names = {entry["output"] for entry in manifest.values()}
+    used_names |= {p.name for p in dst_dir.glob("*.jpg")}
+    to_process: list[tuple[Path, Path]] = []
+    for name, digest, error in _map(_hash_file, to_hash, workers=workers):
+        if error is not None:
+            print(f"[ERROR] could not read {name}: {error}")
+            manifest.pop(name, None)
             n_err += 1
             continue
-
-        # If a file with this name already exists, check whether it's the same
-        # source (skip) or a genuine collision (disambiguate with hash).
-        if out_name in used_names:
-            marker_path = dst_dir / f".{out_name}.srchash"
-            src_hash = short_hash(raw)
-            if marker_path.exists() and marker_path.read_text().strip() == src_hash:
-                n_skip += 1
-                continue  # already processed this exact file, skip
-            else:
-                out_name = f"{stem}_{src_hash}.jpg"
-                out_path = dst_dir / out_name
-
-        try:
-            jpeg_bytes = preprocess_image_bytes(raw)
-        except Exception as e:
-            print(f"[ERROR] could not process {src_path.name}: {e}")
-            n_err += 1
+        st = stats[name]
+        entry = manifest.get(name)
+        known_output = None
+        if entry is not None and entry["sha256"] == digest:
+            known_output = entry["output"]
+        elif digest[:8] in legacy:
+            known_output = legacy[digest[:8]]
+        if known_output is not None and (dst_dir / known_output).exists():
+            manifest[name] = {
+                **(entry or {}),
+                "size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest, "output": known_output,
+            }
+            n_skip += 1
             continue
 
-        out_path.write_bytes(jpeg_bytes)
-        (dst_dir / f".{out_name}.srchash").write_text(short_hash(raw))
+        if entry is not None:
+            out_name = entry["output"]  # same source, new content: replace its own output
+        else:
+            stem = sanitize_stem(Path(name).stem)
+            out_name = f"{stem}.jpg"
+            if out_name in used_names:
+                out_name = f"{stem}_{digest[:8]}.jpg"
         used_names.add(out_name)
+        manifest[name] = {
+            "size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest, "output": out_name,
+        }
+        to_process.append((src_dir / name, dst_dir / out_name))
+
+    # 3. decode/resize/encode in parallel; only successfully written outputs
+    # stay in the manifest.
+    pending_entries = {src.name: manifest.pop(src.name) for src, _ in to_process}
+    save_manifest(dst_dir, manifest)
+    srcs = [src for src, _ in to_process]
+    outs = [out for _, out in to_process]
+    for name, fields, error in _map(_process_file, srcs, outs, workers=workers):
+        if error is not None:
+            print(f"[ERROR] could not process {name}: {error}")
+            n_err += 1
+            continue
+        manifest[name] = {**pending_entries[name], **fields}
         n_ok += 1
-        print(f"[OK] {src_path.name} -> {out_name}")
+        print(f"[OK] {name} -> {manifest[name]['output']}")
+        if n_ok % MANIFEST_SAVE_EVERY == 0:
+            save_manifest(dst_dir, manifest)
+
+    # 4. backfill output fields for outputs adopted without being re-encoded
+    # (or described by an older version of this script).
+    stale = [name for name, entry in manifest.items() if not all(f in entry for f in OUTPUT_FIELDS)]
+    stale_outs = [dst_dir / manifest[name]["output"] for name in stale]
+    for name, fields, error in _map(_describe_file, stale, stale_outs, workers=workers):
+        if error is not None:
+            print(f"[ERROR] could not read {manifest[name]['output']}: {error}")
+            continue
+        manifest[name].update(fields)
+
+    # 5. near-duplicate clusters; only images without a cluster yet (new or
+    # re-encoded) are looked up against the index.
+    hashed = {entry["output"]: int(entry["dhash"], 16) for entry in manifest.values() if "dhash" in entry}
+    known = {entry["output"]: entry["cluster"] for entry in manifest.values() if "cluster" in entry}
+    clusters = cluster(hashed, max_distance=dup_threshold, known=known)
+    for entry in manifest.values():
+        if entry["output"] in clusters:
+            entry["cluster"] = clusters[entry["output"]]
+    cluster_sizes: dict[str, int] = {}
+    for rep in clusters.values():
+        cluster_sizes[rep] = cluster_sizes.get(rep, 0) + 1
+    n_dup_clusters = sum(1 for size in cluster_sizes.values() if size > 1)
+    n_dups = sum(size - 1 for size in cluster_sizes.values())
+
+    save_manifest(dst_dir, manifest)
+    for marker in dst_dir.glob(".*.srchash"):
+        marker.unlink()  # superseded by the manifest
 
     print(f"\nDone. Processed: {n_ok}, Skipped (already processed): {n_skip}, Errors: {n_err}")
+    print(
+        f"Near-duplicates (dHash distance <= {dup_threshold}): {n_dups} image(s) in "
+        f"{n_dup_clusters} cluster(s) - load_image_paths(one_per_cluster=True) keeps one of each"
+    )
 
 
 if __name__ == "__main__":
-    process_directory()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Normalize source photos into JPEGs for evaluation.")
+    parser.add_argument("--src", type=Path, default=SRC_DIR)
+    parser.add_argument("--dst", type=Path, default=DST_DIR)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes (default: all cores; 1 = no pool)"
+    )
+    parser.add_argument(
+        "--dup-threshold", type=int, default=DEFAULT_MAX_DISTANCE,
+        help="max dHash Hamming distance (of 64 bits) for two images to count as near-duplicates",
+    )
+    args = parser.parse_args()
+    process_directory(args.src, args.dst, workers=args.workers, dup_threshold=args.dup_threshold)
@@ -1,9 +1,13 @@
 import time
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
+from vibeai import tracing
 from vibeai.eval.results import result_log
+from vibeai.llm import client, hedging, transport, usage_log
+from vibeai.llm.budget import TokenBudget
 
 
 def pytest_addoption(parser):
@@ -17,6 +21,21 @@ def pytest_addoption(parser):
         default=None,
         help="Directory of images to evaluate in batch eval tests. Defaults to data/main_processed.",
     )
+    parser.addoption(
+        "--one-per-cluster",
+        action="store_true",
+        help="Evaluate one image per near-duplicate cluster (from preprocess.py's manifest).",
+    )
+    parser.addoption(
+        "--split",
+        default=None,
+        help="Evaluate only this split of the dataset (e.g. dev, test; see vibeai.eval.dataset.split_of).",
+    )
+    parser.addoption(
+        "--stratify-by",
+        default=None,
+        help="Sample --n-images proportionally across this image attribute (e.g. orientation).",
+    )
     parser.addoption(
         "--representation-prompt-version",
         default="baseline",
@@ -32,6 +51,38 @@ def pytest_addoption(parser):
         default="30",
         help="Max concurrent evaluations in batch eval tests.",
     )
+    parser.addoption(
+        "--repair-atoms",
+        action="store_true",
+        help="Re-judge only malformed atom verdicts instead of retrying whole judge calls.",
+    )
+    parser.addoption(
+        "--atom-cache",
+        action="store_true",
+        help="Plausibility: cache verdicts per atom and judge only atoms not seen with the image before.",
+    )
+    parser.addoption(
+        "--item-deadline",
+        default=None,
+        help="Give up on an image still being evaluated after this many seconds (it's recorded as an error).",
+    )
+    parser.addoption(
+        "--speculate",
+        action="store_true",
+        help="Re-run the slowest images once capacity frees up at the end of a batch, keeping "
+        "whichever copy finishes first (see vibeai.eval.concurrency.map_speculative_as_completed).",
+    )
+    parser.addoption(
+        "--hedge-percentile",
+        default=None,
+        help="Hedge API requests still running past this percentile of their stage's latency "
+        "(e.g. 95; see vibeai.llm.hedging). Off by default.",
+    )
+    parser.addoption(
+        "--trace-out",
+        default=None,
+        help="Write a Chrome-trace/Perfetto JSON of the session's spans here (see vibeai.tracing).",
+    )
     parser.addoption(
         "--eval-model",
         default=None,
@@ -54,6 +105,21 @@ def image_dir(request) -> Path | None:
     return None if raw is None else Path(raw)
 
 
+@pytest.fixture
+def one_per_cluster(request) -> bool:
+    return request.config.getoption("--one-per-cluster")
+
+
+@pytest.fixture
+def split(request) -> str | None:
+    return request.config.getoption("--split")
+
+
+@pytest.fixture
+def stratify_by(request) -> str | None:
+    return request.config.getoption("--stratify-by")
+
+
 @pytest.fixture
 def representation_prompt_version(request) -> str:
     return request.config.getoption("--representation-prompt-version")
@@ -69,12 +135,108 @@ def concurrency(request) -> int:
     return int(request.config.getoption("--concurrency"))
 
 
+@pytest.fixture
+def item_deadline(request) -> float | None:
+    raw = request.config.getoption("--item-deadline")
+    return None if raw is None else float(raw)
+
+
+@pytest.fixture
+def speculate(request) -> bool:
+    return request.config.getoption("--speculate")
+
+
 @pytest.fixture
 def eval_model(request) -> str | None:
     return request.config.getoption("--eval-model")
 
 
+@pytest.fixture
+def repair_atoms(request) -> bool:
+    return request.config.getoption("--repair-atoms")
+
+
+@pytest.fixture
+def atom_cache(request) -> bool:
+    return request.config.getoption("--atom-cache")
+
+
+def _response(text: str):
+    usage = SimpleNamespace(
+        input_tokens=10,
+        output_tokens=5,
+        total_tokens=15,
+        input_tokens_details=SimpleNamespace(cached_tokens=0),
+        output_tokens_details=SimpleNamespace(reasoning_tokens=0),
+    )
+    return SimpleNamespace(output_text=text, usage=usage)
+
+
+class _Stream:
+    """A streamed response: its text in small deltas, then the completed response."""
+
+    def __init__(self, text: str, chunk: int = 8):
+        self.events = [
+            SimpleNamespace(type="response.output_text.delta", delta=text[i : i + chunk])
+            for i in range(0, len(text), chunk)
+        ]
+        self.events.append(SimpleNamespace(type="response.completed", response=_response(text)))
+        self.closed = False
+
+    async def __aiter__(self):
+        for event in self.events:
+            if self.closed:
+                return
+            yield event
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_api(monkeypatch, tmp_path):
+    """Scripted responses.create: (requests made, outcomes to return, usage-log path)."""
+    requests, script = [], []
+
+    async def create(**kwargs):
+        requests.append(kwargs)
+        outcome = script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _Stream(outcome) if kwargs.get("stream") else _response(outcome)
+
+    fake = SimpleNamespace(responses=SimpleNamespace(create=create))
+    monkeypatch.setattr(client, "get_async_client", lambda: fake)
+    monkeypatch.setattr(client, "CACHE_DIR", tmp_path / "cache")
+    budget = TokenBudget(path=tmp_path / "usage.json")
+    monkeypatch.setattr(client, "get_budget", lambda: budget)
+    monkeypatch.setattr(hedging, "get_budget", lambda: budget)
+    monkeypatch.setattr(client, "_retry_delay", lambda attempt: 0)
+    monkeypatch.setattr(client, "_SCHEMA_UNSUPPORTED", set())
+    monkeypatch.setattr(usage_log, "USAGE_LOG_PATH", tmp_path / "calls.jsonl")
+    monkeypatch.setattr(tracing, "tracer", tracing.Tracer(record_events=True))
+    monkeypatch.setattr(hedging, "_hedger", None)
+    return requests, script, tmp_path / "calls.jsonl"
+
+
+def pytest_configure(config):
+    transport.set_transport(transport.TransportConfig.for_concurrency(int(config.getoption("--concurrency"))))
+    if config.getoption("--trace-out"):
+        tracing.tracer.record_events = True
+    if config.getoption("--hedge-percentile"):
+        hedging.set_hedging(hedging.Hedger(percentile=float(config.getoption("--hedge-percentile"))))
+
+
 def pytest_sessionfinish(session, exitstatus):
     if result_log.records:
         path = result_log.save(f"run_{int(time.time())}")
         print(f"\nSaved {len(result_log.records)} result(s) to {path}")
+    if any(name == "evaluate_image" for name, _, _ in tracing.tracer.histograms):
+        print("\n" + tracing.tracer.summary())
+    hedger = hedging.get_hedger()
+    if hedger is not None and hedger.stats:
+        print("\n" + hedger.summary())
+    trace_out = session.config.getoption("--trace-out")
+    if trace_out:
+        path = tracing.tracer.write_chrome_trace(Path(trace_out))
+        print(f"\nWrote {len(tracing.tracer.events)} trace event(s) to {path}")
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from vibeai.eval.active_sampling import ActiveSampler, build_priors, load_score_history
+
+
+def _pool(n=1000, seed=0):
+    """Most images score the same every run; a fifth are noisy and near the
+    0.7 threshold."""
+    rng = np.random.default_rng(seed)
+    noisy = rng.random(n) < 0.2
+    center = np.where(noisy, 0.7, rng.choice([0.2, 0.95], size=n))
+    spread = np.where(noisy, 0.2, 0.01)
+    return center, spread, noisy
+
+
+def _run(center, spread, rng):
+    scores = np.clip(center + rng.normal(0, spread), 0, 1)
+    return scores, scores >= 0.7
+
+
+def test_load_score_history(tmp_path):
+    metric_dir = tmp_path / "plausibility"
+    metric_dir.mkdir()
+    for run, score in (("a", 0.5), ("b", 0.9)):
+        record = {"image_path": "data/main_processed/x.jpg", "score": score, "passed": score > 0.7}
+        (metric_dir / f"{run}.per_image.jsonl").write_text(json.dumps(record) + "\n")
+    assert load_score_history("plausibility", tmp_path) == {"x.jpg": [(0.5, False), (0.9, True)]}
+
+
+def test_estimates_are_unbiased_and_tighter_than_uniform():
+    center, spread, noisy = _pool()
+    rng = np.random.default_rng(1)
+    names = [f"{i}.jpg" for i in range(len(center))]
+    history = {name: [] for name in names}
+    for _ in range(3):
+        scores, passed = _run(center, spread, rng)
+        for name, score, ok in zip(names, scores, passed):
+            history[name].append((float(score), bool(ok)))
+    sampler = ActiveSampler([Path(n) for n in names], build_priors(names, history))
+    assert sampler.probabilities[noisy].mean() > 3 * sampler.probabilities[~noisy].mean()
+
+    errors, ses, pass_errors = [], [], []
+    for trial in range(200):
+        scores, passed = _run(center, spread, rng)  # a new prompt version's run
+        draws = sampler.draw(100, seed=trial)
+        estimate = sampler.estimate(draws, {i: (scores[i], passed[i]) for i in set(draws)})
+        errors.append(estimate.mean_score - scores.mean())
+        pass_errors.append(estimate.pass_rate - passed.mean())
+        ses.append(estimate.mean_score_se)
+
+    assert abs(np.mean(errors)) < 3 * np.std(errors) / np.sqrt(len(errors))
+    assert abs(np.mean(pass_errors)) < 3 * np.std(pass_errors) / np.sqrt(len(pass_errors))
+    uniform_se = scores.std() / np.sqrt(100)
+    assert np.std(errors) < uniform_se / 2
+    assert 0.5 < np.std(errors) / np.mean(ses) < 1.5
@@ -0,0 +1,87 @@
+import json
+
+import numpy as np
+
+from vibeai.eval import agreement
+from vibeai.eval.agreement import fleiss_kappa, krippendorff_alpha, label_counts
+
+# Krippendorff (2011), "Computing Krippendorff's Alpha-Reliability", the
+# 4-coder x 12-unit example with missing values (None). Published results:
+# nominal alpha = 0.743, ordinal alpha = 0.815.
+_KRIPPENDORFF_EXAMPLE = [
+    [1, 2, 3, 3, 2, 1, 4, 1, 2, None, None, None],
+    [1, 2, 3, 3, 2, 2, 4, 1, 2, 5, None, 3],
+    [None, 3, 3, 3, 2, 3, 4, 2, 2, 5, 1, None],
+    [1, 2, 3, 3, 2, 4, 4, 1, 2, 5, 1, None],
+]
+
+
+def _example_counts() -> np.ndarray:
+    codes = np.array(
+        [[agreement.MISSING if v is None else v - 1 for v in coder] for coder in _KRIPPENDORFF_EXAMPLE]
+    ).T
+    return label_counts(codes, 5)
+
+
+def test_krippendorff_alpha_reference_values():
+    counts = _example_counts()
+    assert round(krippendorff_alpha(counts, "nominal"), 3) == 0.743
+    assert round(krippendorff_alpha(counts, "ordinal"), 3) == 0.815
+
+
+def test_fleiss_kappa_perfect_and_chance():
+    assert fleiss_kappa(np.array([[3, 0], [0, 3], [3, 0]])) == 1.0
+    assert fleiss_kappa(np.array([[1, 1], [1, 1]])) < 0
+
+
+def test_load_matrix_pairs_llm_and_annotators(tmp_path, monkeypatch):
+    monkeypatch.setattr(agreement, "RESULTS_ROOT", tmp_path)
+    metric_dir = tmp_path / "plausibility"
+    (metric_dir / "human").mkdir(parents=True)
+    llm_atoms = {"a.jpg": [True, False], "b.jpg": [True]}
+    with (metric_dir / "run.per_image.jsonl").open("w") as f:
+        for image_path, verdicts in llm_atoms.items():
+            atoms = [{"final_verdict": v} for v in verdicts]
+            f.write(json.dumps({"image_path": image_path, "details": {"atoms": atoms}}) + "\n")
+    (metric_dir / "human" / "run__alice.json").write_text(
+        json.dumps({"a.jpg": {"atoms": [{"plausible": True}, {"plausible": True}]}})
+    )
+    # Belongs to a different run whose name extends this one's.
+    (metric_dir / "run__v2.per_image.jsonl").write_text("")
+    (metric_dir / "human" / "run__v2__bob.json").write_text("{}")
+
+    matrix = agreement.load_matrix("plausibility", "run")
+
+    assert matrix.raters == ["llm", "alice"]
+    channel = matrix.channels["plausible"]
+    assert channel.items == ["a.jpg#0", "a.jpg#1", "b.jpg#0"]
+    assert channel.codes.tolist() == [[0, 0], [1, 0], [0, agreement.MISSING]]
+    assert agreement.load_matrix("plausibility", "run") is matrix
+
+
+def _decomposition_record(verdicts: list[str], completeness: int) -> dict:
+    evaluation = {criterion: True for criterion in agreement._CRITERIA}
+    return {
+        "atomic_judgement": [{"verdict": v, "evaluation": evaluation} for v in verdicts],
+        "final_verdict": {"completeness": {"verdict": completeness}},
+    }
+
+
+def test_atom_count_mismatch_keeps_image_level_labels(tmp_path, monkeypatch):
+    monkeypatch.setattr(agreement, "RESULTS_ROOT", tmp_path)
+    metric_dir = tmp_path / "decomposition_quality"
+    (metric_dir / "human").mkdir(parents=True)
+    details = _decomposition_record(["Good", "Bad"], completeness=4)
+    (metric_dir / "run.per_image.jsonl").write_text(
+        json.dumps({"image_path": "a.jpg", "details": details}) + "\n"
+    )
+    (metric_dir / "human" / "run__alice.json").write_text(
+        json.dumps({"a.jpg": _decomposition_record(["Good", "Good", "Bad"], completeness=3)})
+    )
+
+    matrix = agreement.load_matrix("decomposition_quality", "run")
+
+    assert matrix.channels["completeness"].codes.tolist() == [[3, 2]]
+    verdicts = matrix.channels["atom_verdict"]
+    assert verdicts.items == ["a.jpg#0", "a.jpg#1"]
+    assert verdicts.codes.tolist() == [[0, agreement.MISSING], [1, agreement.MISSING]]
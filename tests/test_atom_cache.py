@@ -0,0 +1,71 @@
+import json
+
+import pytest
+from PIL import Image
+
+from vibeai.eval.test_cases import DecompositionTestCase
+from vibeai.metrics import atom_cache
+from vibeai.metrics.plausibility import PlausibilityMetric
+
+
+def _verdict(atom: str) -> dict:
+    return {
+        "atom": atom,
+        "type": "vibe_only",
+        "stated_evidence": None,
+        "stated_vibe": atom.split()[-2],
+        "evidence_presence_check": None,
+        "direct_check": None,
+        "mapping_check": None,
+        "final_verdict": "calm" not in atom,
+    }
+
+
+@pytest.fixture
+def image_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(atom_cache, "ATOM_CACHE_DIR", tmp_path / "atoms")
+    path = tmp_path / "img.jpg"
+    Image.new("RGB", (8, 8)).save(path)
+    return path
+
+
+def _judged_atoms(request: dict) -> list[str]:
+    variable = request["input"][0]["content"][-1]["text"]  # after the static part and image
+    atom_list = variable.removeprefix("## Vibe Atoms").strip().splitlines()
+    return [line.split(". ", 1)[1] for line in atom_list]
+
+
+async def test_only_new_atoms_are_judged(fake_api, image_path):
+    requests, script, _ = fake_api
+    metric = PlausibilityMetric(atom_cache=True)
+    first = ["The vibe is cozy here.", "The vibe is calm here.", "Rain, giving it a moody vibe."]
+    script.append(json.dumps({"atoms": [_verdict(a) for a in first]}))
+    result = await metric.measure_async(DecompositionTestCase(image_path, "r", first))
+    assert result.score == pytest.approx(2 / 3)
+
+    # A new decomposition: one atom reworded, one only re-cased, one new.
+    second = ["the vibe is  COZY here.", "The vibe is calm here.", "Neon, giving it an electric vibe."]
+    script.append(json.dumps({"atoms": [_verdict(second[2])]}))
+    result = await metric.measure_async(DecompositionTestCase(image_path, "r", second))
+
+    assert _judged_atoms(requests[-1]) == [second[2]]
+    assert [a["atom"] for a in result.details["atoms"]] == second
+    assert [a["final_verdict"] for a in result.details["atoms"]] == [True, False, True]
+
+    await metric.measure_async(DecompositionTestCase(image_path, "r", list(reversed(second))))
+    assert len(requests) == 2
+
+
+async def test_verdicts_are_per_image_and_model(fake_api, image_path, tmp_path):
+    requests, script, _ = fake_api
+    other_image = tmp_path / "other.jpg"
+    Image.new("RGB", (8, 8), "white").save(other_image)
+    atoms = ["The vibe is cozy here."]
+    script += [json.dumps({"atoms": [_verdict(atoms[0])]})] * 3
+
+    await PlausibilityMetric(atom_cache=True).measure_async(DecompositionTestCase(image_path, "r", atoms))
+    await PlausibilityMetric(atom_cache=True).measure_async(DecompositionTestCase(other_image, "r", atoms))
+    await PlausibilityMetric(model="other", atom_cache=True).measure_async(
+        DecompositionTestCase(image_path, "r", atoms)
+    )
+    assert len(requests) == 3
@@ -0,0 +1,99 @@
+import json
+
+from PIL import Image
+
+from vibeai.eval.test_cases import DecompositionTestCase
+from vibeai.metrics.decomposition_quality import DecompositionQualityMetric
+from vibeai.metrics.plausibility import PlausibilityMetric
+
+ATOMS = ["Warm light, giving it a cozy vibe.", "The vibe is calm.", "Rain, giving it a moody vibe."]
+
+
+def _verdict(atom: str, ok: bool = True) -> dict:
+    return {
+        "atom": atom,
+        "type": "vibe_only",
+        "stated_evidence": None,
+        "stated_vibe": "cozy" if ok else "",
+        "evidence_presence_check": None,
+        "direct_check": None,
+        "mapping_check": None,
+        "final_verdict": True,
+    }
+
+
+def _judgement_entry(atom: str, verdict: str = "Good") -> dict:
+    evaluation = dict.fromkeys(("affectiveness", "atomicity", "fidelity", "evidence_preservation"), True)
+    return {"atom": atom, "reason": "fine", "evaluation": evaluation, "verdict": verdict}
+
+
+def _judgement(entries: list[dict]) -> str:
+    return json.dumps(
+        {
+            "atomic_judgement": entries,
+            "final_verdict": {
+                "completeness": {"reason": "covers it", "verdict": 4},
+                "atom_quality": {
+                    "good_atom_count": 0,
+                    "total_atom_count": len(entries),
+                    "reason": "mixed",
+                    "verdict": 0,
+                },
+            },
+        }
+    )
+
+
+def _test_case(tmp_path) -> DecompositionTestCase:
+    image_path = tmp_path / "img.jpg"
+    Image.new("RGB", (8, 8)).save(image_path)
+    return DecompositionTestCase(image_path=image_path, representation="A cozy room.", atoms=ATOMS)
+
+
+async def test_plausibility_repairs_only_the_bad_atom(fake_api, tmp_path):
+    requests, script, _ = fake_api
+    first = [_verdict(ATOMS[0]), _verdict(ATOMS[1], ok=False), _verdict(ATOMS[2])]
+    script += [json.dumps({"atoms": first}), json.dumps({"atoms": [_verdict(ATOMS[1])]})]
+    metric = PlausibilityMetric(repair_atoms=True)
+    test_case = _test_case(tmp_path)
+
+    result = await metric.measure_async(test_case)
+
+    repair_prompt = requests[1]["input"][0]["content"][-1]["text"]  # atoms go last
+    assert ATOMS[1] in repair_prompt and ATOMS[0] not in repair_prompt
+    assert result.score == 1.0
+    assert [atom.get("repaired", False) for atom in result.details["atoms"]] == [False, True, False]
+
+    # The repaired output is cached: measuring again makes no call.
+    assert (await metric.measure_async(test_case)).details == result.details
+    assert len(requests) == 2
+
+
+async def test_plausibility_without_repair_retries_the_whole_call(fake_api, tmp_path):
+    requests, script, _ = fake_api
+    first = [_verdict(ATOMS[0]), _verdict(ATOMS[1], ok=False), _verdict(ATOMS[2])]
+    script += [json.dumps({"atoms": first}), json.dumps({"atoms": [_verdict(a) for a in ATOMS]})]
+
+    result = await PlausibilityMetric().measure_async(_test_case(tmp_path))
+
+    assert len(requests) == 2
+    assert requests[0]["input"] == requests[1]["input"]
+    assert result.score == 1.0
+
+
+async def test_decomposition_quality_repair_recomputes_atom_quality(fake_api, tmp_path):
+    requests, script, log_path = fake_api
+    inconsistent = {**_judgement_entry(ATOMS[2]), "verdict": "Bad"}  # all criteria true
+    script += [
+        _judgement([_judgement_entry(ATOMS[0]), _judgement_entry(ATOMS[1]), inconsistent]),
+        _judgement([_judgement_entry(ATOMS[2])]),
+    ]
+
+    result = await DecompositionQualityMetric(repair_atoms=True).measure_async(_test_case(tmp_path))
+
+    quality = result.details["final_verdict"]["atom_quality"]
+    assert (quality["good_atom_count"], quality["verdict"]) == (3, 5.0)
+    assert result.details["final_verdict"]["completeness"]["verdict"] == 4
+    assert result.details["atomic_judgement"][2]["repaired"] is True
+    call_types = [json.loads(line)["call_type"] for line in log_path.read_text().splitlines()]
+    assert call_types == ["judge", "judge_repair"]
@@ -0,0 +1,133 @@
+import asyncio
+import itertools
+import os
+import time
+
+from vibeai.eval.concurrency import StragglerReport, map_bounded_as_completed, map_speculative_as_completed
+from vibeai.eval.dataset import watch_image_paths
+
+
+async def test_map_bounded_pulls_lazily_and_caps_in_flight():
+    pulled = 0
+    in_flight = max_in_flight = 0
+
+    def source():
+        nonlocal pulled
+        for i in itertools.count():  # unbounded
+            pulled += 1
+            yield i
+
+    async def work(i: int) -> int:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.001 * (i % 3))
+        in_flight -= 1
+        if i == 4:
+            raise ValueError("boom")
+        return i * 2
+
+    results = {}
+    async for item, outcome in map_bounded_as_completed(work, source(), limit=3):
+        results[item] = outcome
+        if len(results) == 20:
+            break
+
+    assert max_in_flight <= 3
+    assert pulled <= 20 + 3
+    assert isinstance(results[4], ValueError)
+    assert all(results[i] == i * 2 for i in results if i != 4)
+
+
+async def test_slow_source_does_not_hold_back_results():
+    async def source():
+        yield 1
+        await asyncio.sleep(0.3)
+        yield 2
+
+    async def work(i: int) -> int:
+        return i
+
+    start = time.monotonic()
+    stream = map_bounded_as_completed(work, source(), limit=4)
+    assert await anext(stream) == (1, 1)
+    assert time.monotonic() - start < 0.2
+    assert [x async for x in stream] == [(2, 2)]
+
+
+def _slow_first_attempt(slow: set[int], seconds: float = 1.0):
+    """Work that takes `seconds` on an item in `slow` the first time it runs, 10ms otherwise."""
+    attempts, cancelled = [], []
+
+    async def work(i: int) -> int:
+        first = i not in attempts
+        attempts.append(i)
+        try:
+            await asyncio.sleep(seconds if first and i in slow else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(i)
+            raise
+        return i
+
+    return work, attempts, cancelled
+
+
+async def test_straggler_is_re_run_once_capacity_frees():
+    work, attempts, cancelled = _slow_first_attempt({0})
+    report = StragglerReport()
+
+    start = time.monotonic()
+    stream = map_speculative_as_completed(work, range(10), limit=4, speculate=True, report=report)
+    results = dict([x async for x in stream])
+
+    assert results == {i: i for i in range(10)}
+    assert time.monotonic() - start < 0.5
+    assert attempts.count(0) == 2 and cancelled == [0]
+    assert (report.speculated, report.copies_won) == (1, 1)
+    (straggler,) = report.stragglers
+    assert (straggler.item, straggler.outcome) == (0, "copy won")
+
+
+async def test_deadline_times_out_stragglers_without_speculation():
+    work, attempts, cancelled = _slow_first_attempt({3})
+    report = StragglerReport()
+
+    stream = map_speculative_as_completed(work, range(6), limit=2, deadline=0.2, report=report)
+    results = dict([x async for x in stream])
+
+    assert isinstance(results.pop(3), TimeoutError) and results == {i: i for i in range(6) if i != 3}
+    assert attempts.count(3) == 1 and cancelled == [3]
+    assert report.timed_out == 1 and report.stragglers[0].outcome == "timed out"
+    assert "3: " in report.summary()
+
+
+async def test_failed_copy_falls_back_to_the_original():
+    attempts = []
+
+    async def work(i: int) -> int:
+        attempts.append(i)
+        if i == 0 and attempts.count(0) == 2:
+            raise ConnectionError("copy")
+        await asyncio.sleep(0.3 if i == 0 else 0.01)
+        return i
+
+    results = dict([x async for x in map_speculative_as_completed(work, range(6), limit=2, speculate=True)])
+    assert results == {i: i for i in range(6)} and attempts.count(0) == 2
+
+
+async def test_watch_image_paths_yields_new_files(tmp_path):
+    (tmp_path / "a.jpg").write_bytes(b"a")
+    (tmp_path / "notes.txt").write_text("x")
+    os.utime(tmp_path / "a.jpg", (0, 0))
+
+    seen = []
+
+    async def add_later():
+        await asyncio.sleep(0.05)
+        (tmp_path / "b.jpg").write_bytes(b"b")
+
+    adder = asyncio.create_task(add_later())
+    async for path in watch_image_paths(tmp_path, poll_seconds=0.02, settle_seconds=0.05, idle_timeout=0.3):
+        seen.append(path.name)
+    await adder
+    assert seen == ["a.jpg", "b.jpg"]
@@ -0,0 +1,60 @@
+import hashlib
+import json
+from collections import Counter
+
+from vibeai.eval.dataset import MANIFEST_NAME, load_image_paths, load_index, split_of
+
+
+def _write_pool(root, n: int) -> None:
+    manifest = {}
+    for i in range(n):
+        out = f"img_{i:03d}.jpg"
+        (root / out).write_bytes(b"")
+        width, height = (1024, 768) if i % 4 else (768, 1024)
+        manifest[f"IMG_{i:03d}.JPG"] = {
+            "output": out,
+            "width": width,
+            "height": height,
+            "bytes": 1000 + i,
+            "output_sha256": hashlib.sha256(out.encode()).hexdigest(),
+            # every tenth image is a near-duplicate of the one before it
+            "cluster": f"img_{i - 1:03d}.jpg" if i % 10 == 9 else out,
+        }
+    (root / MANIFEST_NAME).write_text(json.dumps(manifest))
+
+
+def test_manifest_sampling_matches_directory_scan(tmp_path):
+    _write_pool(tmp_path, 50)
+    from_manifest = load_image_paths(n=10, seed=3, data_dir=tmp_path)
+    (tmp_path / MANIFEST_NAME).unlink()
+    assert load_image_paths(n=10, seed=3, data_dir=tmp_path) == from_manifest
+
+
+def test_splits_are_stable_disjoint_and_keep_clusters_together(tmp_path):
+    _write_pool(tmp_path, 200)
+    dev = load_image_paths(data_dir=tmp_path, split="dev")
+    test = load_image_paths(data_dir=tmp_path, split="test")
+    assert not set(dev) & set(test)
+    assert len(dev) + len(test) == 200
+    assert 20 <= len(dev) <= 60  # ~20%
+
+    split_by_cluster = {}
+    for record in load_index(tmp_path):
+        assert split_by_cluster.setdefault(record.cluster, split_of(record)) == split_of(record)
+
+    # adding images doesn't move existing ones
+    _write_pool(tmp_path, 300)
+    assert set(dev) <= set(load_image_paths(data_dir=tmp_path, split="dev"))
+
+
+def test_filter_and_stratified_sample(tmp_path):
+    _write_pool(tmp_path, 200)
+    portrait = load_image_paths(data_dir=tmp_path, where=lambda r: r.orientation == "portrait")
+    assert len(portrait) == 50
+
+    sample = load_image_paths(n=20, seed=0, data_dir=tmp_path, stratify_by="orientation")
+    records = {r.path: r for r in load_index(tmp_path)}
+    assert Counter(records[p].orientation for p in sample) == {"landscape": 15, "portrait": 5}
+
+    deduped = load_image_paths(data_dir=tmp_path, one_per_cluster=True)
+    assert len(deduped) == 180
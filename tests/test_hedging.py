@@ -0,0 +1,74 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from vibeai.llm.hedging import Hedger
+
+
+def _warmed_up(max_token_share: float = 0.5) -> Hedger:
+    """A hedger that has seen 20 requests of 10ms and 100 tokens each."""
+    hedger = Hedger(percentile=90, min_samples=20, max_token_share=max_token_share)
+    latencies, stats = hedger._stage(("judge", "m"))
+    for _ in range(20):
+        latencies.record(10_000)
+    stats.completed, stats.tokens = 20, 2000
+    return hedger
+
+
+def _requests(*delays: float, fail: tuple[int, ...] = ()):
+    """A request factory whose n-th request takes delays[n]; records which were cancelled."""
+    started, cancelled = [], []
+
+    async def request():
+        n = len(started)
+        started.append(n)
+        try:
+            await asyncio.sleep(delays[n])
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+        if n in fail:
+            raise ConnectionError(f"request {n}")
+        return SimpleNamespace(n=n, usage=SimpleNamespace(total_tokens=100))
+
+    return request, started, cancelled
+
+
+async def test_slow_request_is_hedged_and_the_loser_cancelled(fake_api):
+    _, _, log_path = fake_api
+    hedger = _warmed_up()
+    request, started, cancelled = _requests(1.0, 0.0)
+
+    result = await hedger.run("judge", "m", request)
+
+    assert result.n == 1 and cancelled == [0]
+    stats = hedger.stats[("judge", "m")]
+    assert (stats.hedges, stats.hedge_wins, stats.hedge_tokens) == (1, 1, 100)
+    (event,) = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert (event["event"], event["won"]) == ("hedge", True)
+
+
+async def test_fast_request_is_not_hedged(fake_api):
+    hedger = _warmed_up()
+    request, started, _ = _requests(0.0)
+    assert (await hedger.run("judge", "m", request)).n == 0
+    assert started == [0] and hedger.stats[("judge", "m")].hedges == 0
+
+
+async def test_failed_hedge_falls_back_to_the_original(fake_api):
+    hedger = _warmed_up()
+    request, _, cancelled = _requests(0.05, 0.0, fail=(1,))
+    assert (await hedger.run("judge", "m", request)).n == 0
+    assert cancelled == []
+
+    request, _, _ = _requests(0.05, 0.0, fail=(0, 1))
+    with pytest.raises(ConnectionError, match="request 0"):
+        await hedger.run("judge", "m", request)
+
+
+async def test_token_cap_and_cold_start_disable_hedging(fake_api):
+    assert _warmed_up(max_token_share=0.01).delay("judge", "m") is None
+    assert Hedger().delay("judge", "m") is None
+    assert _warmed_up().delay("judge", "m") == pytest.approx(0.01, rel=1 / 32)
@@ -0,0 +1,44 @@
+import io
+
+from PIL import Image
+
+from vibeai.pipeline import image_policy
+from vibeai.pipeline.image_policy import (
+    POLICIES,
+    estimate_image_tokens,
+    load_image,
+    target_size,
+    tile_aligned_size,
+)
+
+
+def test_tile_aligned_size_fills_its_tiles():
+    assert tile_aligned_size(1024, 683, 2) == (767, 512)
+    assert tile_aligned_size(1024, 683, 1) == (512, 341)
+    assert tile_aligned_size(683, 1024, 2) == (512, 767)
+    assert tile_aligned_size(300, 200, 4) == (300, 200)  # never upscales
+    for tiles in (1, 2, 4):
+        assert estimate_image_tokens(*tile_aligned_size(1024, 683, tiles)) <= 85 + 170 * tiles
+
+
+def test_estimate_image_tokens():
+    assert estimate_image_tokens(1024, 683) == 85 + 170 * 4
+    assert estimate_image_tokens(2048, 4096) == 85 + 170 * 6  # -> 768x1536 before tiling
+    assert estimate_image_tokens(4000, 3000, detail="low") == 85
+
+
+def test_load_image_caches_variants(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_policy, "VARIANT_CACHE_DIR", tmp_path / "variants")
+    buffer = io.BytesIO()
+    Image.new("RGB", (1024, 683), (120, 30, 200)).save(buffer, format="JPEG")
+    path = tmp_path / "img.jpg"
+    path.write_bytes(buffer.getvalue())
+
+    full, _ = load_image(path, POLICIES["full"])
+    assert full == buffer.getvalue()
+
+    small, mime = load_image(path, POLICIES["tiles1"])
+    assert mime == "image/jpeg"
+    assert Image.open(io.BytesIO(small)).size == target_size(1024, 683, POLICIES["tiles1"])
+    assert len(list((tmp_path / "variants").iterdir())) == 1
+    assert load_image(path, POLICIES["tiles1"])[0] == small
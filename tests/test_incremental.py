@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from vibeai.llm import client
+from vibeai.llm.errors import StreamAbortedError
+from vibeai.llm.incremental import ItemStream, StreamChecker
+
+
+def _non_empty(index, item):
+    if not item:
+        raise ValueError(f"item {index} is empty")
+
+
+def _feed(checker: StreamChecker, text: str, chunk: int = 3) -> None:
+    for i in range(0, len(text), chunk):
+        checker.feed(text[i : i + chunk])
+
+
+@pytest.mark.parametrize(
+    "spec, structured, text",
+    [
+        (ItemStream(check_item=_non_empty), False, '["a, [b]", "c\\"]"]'),
+        (ItemStream(check_item=_non_empty), False, 'Sure:\n```json\n["a"]\n```'),
+        (ItemStream(check_item=_non_empty), False, '```json\n["a", "b"]\n```'),
+        (ItemStream(check_item=_non_empty, max_items=2), True, '{"atoms": ["a", "b"]}'),
+        (ItemStream(key="items", check_item=_non_empty), False, '{"x": [[]], "items": [{"k": 1}], "y": 2}'),
+    ],
+)
+def test_valid_outputs_stream_through(spec, structured, text):
+    checker = StreamChecker(spec, structured=structured, root_key="atoms")
+    _feed(checker, text)
+
+
+@pytest.mark.parametrize(
+    "spec, structured, text, reason",
+    [
+        (ItemStream(), False, '{"atoms": ["a"]}', "expected a JSON array"),
+        (ItemStream(key="items"), False, '["a"]', "expected a JSON object"),
+        (ItemStream(), True, "I can't help with that.", "isn't JSON"),
+        (ItemStream(), False, "```json\nSorry, no.\n```", "isn't JSON"),
+        (ItemStream(check_item=_non_empty), False, '["a", "", "b", "c"]', "item 1 is empty"),
+        (ItemStream(max_items=1), False, '["a", "b", "c"]', "more than the expected 1"),
+        (ItemStream(), False, '["a", tru, "b"]', "isn't valid JSON"),
+        (ItemStream(), False, '["a"}', "unexpected '}'"),
+    ],
+)
+def test_invalid_outputs_abort_early(spec, structured, text, reason):
+    checker = StreamChecker(spec, structured=structured, root_key="atoms")
+    padded = text + " " * 1000  # the rest of a long completion
+    with pytest.raises(StreamAbortedError, match=reason) as e:
+        _feed(checker, padded)
+    assert e.value.output_chars <= len(text) + 3
+
+
+async def test_aborted_stream_is_retried_at_once(fake_api, monkeypatch):
+    requests, script, log_path = fake_api
+    script += ['["a", "", ' + '"b", ' * 200 + '"c"]', '["a", "b"]']
+    sleeps = []
+    monkeypatch.setattr(client, "_retry_delay", lambda attempt: sleeps.append(attempt) or 0)
+
+    output = await client.call_text_async(
+        "p",
+        call_type="decompose",
+        validate=json.loads,
+        stream_check=ItemStream(check_item=_non_empty),
+    )
+
+    assert output == '["a", "b"]'
+    assert all(r["stream"] for r in requests) and sleeps == []
+    aborted, call = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert aborted["event"] == "stream_aborted" and aborted["output_chars"] < 32
+    assert call["retry_reason"] == "validation: StreamAbortedError"
+    assert call["ttfb_ms"] is not None
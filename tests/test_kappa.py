@@ -0,0 +1,53 @@
+import math
+import random
+
+from vibeai.eval.kappa import bootstrap_kappas, estimate_kappa, kappa
+
+
+def _reference_kappa(y1, y2, labels, weights=None):
+    """The original nested-list implementation, kept as an oracle."""
+    n = len(labels)
+    index = {label: i for i, label in enumerate(labels)}
+    confusion = [[0] * n for _ in labels]
+    for a, b in zip(y1, y2):
+        confusion[index[a]][index[b]] += 1
+    total = sum(sum(row) for row in confusion)
+    row_sums = [sum(row) for row in confusion]
+    col_sums = [sum(confusion[i][j] for i in range(n)) for j in range(n)]
+    expected = [[row_sums[i] * col_sums[j] / total for j in range(n)] for i in range(n)]
+    if weights is None:
+        w = [[0.0 if i == j else 1.0 for j in range(n)] for i in range(n)]
+    elif weights == "linear":
+        w = [[abs(i - j) / (n - 1) for j in range(n)] for i in range(n)]
+    else:
+        w = [[((i - j) ** 2) / ((n - 1) ** 2) for j in range(n)] for i in range(n)]
+    observed = sum(w[i][j] * confusion[i][j] for i in range(n) for j in range(n))
+    expected_val = sum(w[i][j] * expected[i][j] for i in range(n) for j in range(n))
+    return 1 - observed / expected_val
+
+
+def test_kappa_matches_reference():
+    rng = random.Random(0)
+    labels = [1, 2, 3, 4, 5]
+    y1 = [rng.choice(labels) for _ in range(300)]
+    y2 = [v if rng.random() < 0.6 else rng.choice(labels) for v in y1]
+    for weights in (None, "linear", "quadratic"):
+        assert math.isclose(kappa(y1, y2, labels, weights), _reference_kappa(y1, y2, labels, weights))
+
+
+def test_kappa_undefined_is_nan():
+    assert math.isnan(kappa([True, True], [True, True], [True, False]))
+    assert math.isnan(kappa([], [], [True, False]))
+
+
+def test_estimate_kappa_ci_and_p_value():
+    rng = random.Random(1)
+    y1 = [rng.random() < 0.5 for _ in range(400)]
+    y2 = [v if rng.random() < 0.8 else not v for v in y1]
+    groups = [i // 10 for i in range(400)]
+
+    est = estimate_kappa(y1, y2, [True, False], n_resamples=500, n_permutations=500, groups=groups)
+
+    assert est.ci_low < est.kappa < est.ci_high
+    assert est.p_value < 0.01
+    assert len(bootstrap_kappas(y1, y2, [True, False], n_resamples=1234)) == 1234
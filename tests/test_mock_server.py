@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from vibeai.eval.test_cases import DecompositionTestCase
+from vibeai.llm import client
+from vibeai.llm.mock_server import CACHE_MIN_TOKENS, LatencyModel, MockConfig, MockResponses, fake_output
+from vibeai.llm.prompt_layout import Prompt
+from vibeai.metrics import decomposition_quality, plausibility
+from vibeai.pipeline import decompose, represent
+from vibeai.prompts import decomposition as decomposition_prompts
+
+ATOMS = ["The light is warm, giving it a calm vibe.", "The vibe is nostalgic.", "The street feels quiet."]
+
+
+def _body(prompt, schema=None, image: bool = False) -> dict:
+    if image:
+        (message,) = client._image_input(prompt, b"jpeg", "image/jpeg", "low")
+    else:
+        (message,) = client._text_input(prompt)
+    body = {"model": "m", "input": [message]}
+    if schema is not None:
+        body["text"] = schema.text_format
+    return body
+
+
+def _test_case() -> DecompositionTestCase:
+    return DecompositionTestCase(image_path="a.jpg", representation="A calm evening.", atoms=ATOMS)
+
+
+def test_outputs_pass_the_stage_validators():
+    rng = random.Random(0)
+    schema = decompose.OUTPUT_SCHEMA
+    prompt = Prompt(decomposition_prompts.PROMPTS["baseline"], {"representation": "A calm evening."})
+    body = _body(prompt, schema)
+    assert decompose._extract_and_validate_atoms(schema.unwrap(fake_output(body, rng)))
+
+    schema = plausibility.OUTPUT_SCHEMA
+    body = _body(plausibility._build_prompt(_test_case()), schema, image=True)
+    verdicts = plausibility._extract_and_validate_atoms(schema.unwrap(fake_output(body, rng)), len(ATOMS))
+    assert [v["atom"] for v in verdicts] == ATOMS
+
+    body = _body(decomposition_quality._build_prompt(_test_case()), decomposition_quality.OUTPUT_SCHEMA)
+    decomposition_quality._validate_judgement(fake_output(body, rng), len(ATOMS))
+
+    schema = represent.OUTPUT_SCHEMAS["v2"]
+    body = _body("Describe it.", schema, image=True)
+    assert decompose.decompose_direct(fake_output(body, rng))
+
+
+def test_faults_and_usage_are_accounted():
+    mock = MockResponses(MockConfig(latency=LatencyModel.parse("fixed:0.1"), rate_limit_share=1.0))
+    assert mock.reply(_body("p")).status == 429
+
+    mock = MockResponses(MockConfig(malformed_share=1.0))
+    body = _body(plausibility._build_prompt(_test_case()), plausibility.OUTPUT_SCHEMA)
+    with pytest.raises(ValueError):
+        plausibility._extract_and_validate_atoms(plausibility.OUTPUT_SCHEMA.unwrap(mock.reply(body).text))
+    assert (mock.usage.requests, mock.usage.malformed, mock.usage.rate_limited) == (1, 1, 0)
+
+
+def test_a_repeated_long_static_prefix_is_billed_as_cached():
+    mock = MockResponses()
+    long_static = "rubric " * (CACHE_MIN_TOKENS * 2)
+    content = [{"type": "input_text", "text": long_static}, {"type": "input_text", "text": "1. An atom."}]
+    body = {"model": "m", "input": [{"role": "user", "content": content}]}
+    first, second = mock.reply(body).response["usage"], mock.reply(body).response["usage"]
+    assert first["input_tokens_details"]["cached_tokens"] == 0
+    assert CACHE_MIN_TOKENS <= second["input_tokens_details"]["cached_tokens"] <= second["input_tokens"]
+    assert mock.usage.cached_tokens == second["input_tokens_details"]["cached_tokens"]
+    assert mock.reply(body).text == mock.reply(body).text  # seeded by the request
+
+
+def test_latency_specs():
+    rng = random.Random(0)
+    assert LatencyModel.parse("fixed:0.25").sample(rng) == 0.25
+    assert 0.1 <= LatencyModel.parse("uniform:0.1,0.2").sample(rng) <= 0.2
+    assert LatencyModel.parse("fixed:1", tail_share=1.0, tail_factor=5).sample(rng) == 5
+    with pytest.raises(ValueError, match="Bad latency spec"):
+        LatencyModel.parse("gamma:1")
@@ -0,0 +1,55 @@
+import json
+import random
+
+from vibeai.eval.dataset import MANIFEST_NAME, load_image_paths
+from vibeai.eval.near_dup import HammingIndex, cluster, hamming
+
+
+def _random_hashes(n: int, seed: int) -> dict[str, int]:
+    rng = random.Random(seed)
+    hashes = {}
+    for i in range(n):
+        if i and rng.random() < 0.5:
+            # a near copy of an earlier hash
+            base = hashes[f"img_{rng.randrange(i):03d}"]
+            for bit in rng.sample(range(64), rng.randrange(9)):
+                base ^= 1 << bit
+            hashes[f"img_{i:03d}"] = base
+        else:
+            hashes[f"img_{i:03d}"] = rng.getrandbits(64)
+    return hashes
+
+
+def test_index_query_matches_brute_force():
+    hashes = _random_hashes(300, seed=1)
+    index = HammingIndex(max_distance=6)
+    for key, h in hashes.items():
+        index.add(key, h)
+    for h in list(hashes.values())[:50]:
+        expected = {key for key, other in hashes.items() if hamming(h, other) <= 6}
+        assert {key for key, _ in index.query(h)} == expected
+
+
+def test_incremental_cluster_equals_full_cluster():
+    hashes = _random_hashes(300, seed=2)
+    full = cluster(hashes, max_distance=6)
+    assert len(set(full.values())) < len(hashes)  # the fixture does contain near-dups
+    assert all(rep == min(k for k, r in full.items() if r == rep) for rep in full.values())
+
+    first = dict(list(hashes.items())[:200])
+    incremental = cluster(hashes, max_distance=6, known=cluster(first, max_distance=6))
+    assert incremental == full
+
+
+def test_load_image_paths_one_per_cluster(tmp_path):
+    for name in ["a.jpg", "a_burst.jpg", "b.jpg", "c.jpg", "c_copy.jpg"]:
+        (tmp_path / name).write_bytes(b"")
+    clusters = {
+        "a.jpg": "a.jpg", "a_burst.jpg": "a.jpg", "b.jpg": "b.jpg", "c.jpg": "c.jpg", "c_copy.jpg": "c.jpg",
+    }
+    manifest = {f"src_{out}": {"output": out, "cluster": rep} for out, rep in clusters.items()}
+    (tmp_path / MANIFEST_NAME).write_text(json.dumps(manifest))
+
+    paths = load_image_paths(data_dir=tmp_path, one_per_cluster=True)
+    assert [p.name for p in paths] == ["a.jpg", "b.jpg", "c.jpg"]
+    assert len(load_image_paths(data_dir=tmp_path)) == 5
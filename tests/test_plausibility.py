@@ -2,60 +2,86 @@
 using the plausibility judge (per-atom evidence/vibe-inference checks),
 across many images concurrently."""
 
-from vibeai.eval.concurrency import gather_bounded_as_completed
+import time
+
+from vibeai.eval.concurrency import StragglerReport
 from vibeai.eval.dataset import load_image_paths
 from vibeai.eval.prompt_results import ImageError, ImageResult, aggregate_prompt_results
+from vibeai.eval.run_status import RunStatusReporter
 from vibeai.metrics.plausibility import PlausibilityMetric
-from vibeai.pipeline.evaluate import evaluate_image
+from vibeai.pipeline.evaluate import evaluate_images
 
 async def test_plausibility_batch(
     n_images, image_dir, representation_prompt_version, decomposition_prompt_version, concurrency,
-    eval_model,
+    eval_model, one_per_cluster, split, stratify_by, repair_atoms, atom_cache, item_deadline, speculate,
 ):
-    IMAGES = load_image_paths(n=n_images, seed=0, data_dir=image_dir)
-    metric = PlausibilityMetric() if eval_model is None else PlausibilityMetric(model=eval_model)
+    IMAGES = load_image_paths(
+        n=n_images, seed=0, data_dir=image_dir,
+        one_per_cluster=one_per_cluster, split=split, stratify_by=stratify_by,
+    )
+    metric = (
+        PlausibilityMetric(repair_atoms=repair_atoms, atom_cache=atom_cache) if eval_model is None
+        else PlausibilityMetric(model=eval_model, repair_atoms=repair_atoms, atom_cache=atom_cache)
+    )
 
-    coros = [
-        evaluate_image(
-            image_path,
-            metric,
-            representation_prompt_version=representation_prompt_version,
-            decomposition_prompt_version=decomposition_prompt_version,
-        )
-        for image_path in IMAGES
-    ]
+    status = RunStatusReporter(
+        f"{metric.name}__{representation_prompt_version}__{decomposition_prompt_version}"
+        f"_{int(time.time())}",
+        metric_name=metric.name,
+        total=len(IMAGES),
+        representation_prompt_version=representation_prompt_version,
+        decomposition_prompt_version=decomposition_prompt_version,
+        model=metric.model,
+        concurrency=concurrency,
+    )
     failures = []
     image_results = []
     image_errors = []
-    async for index, outcome in gather_bounded_as_completed(coros, limit=concurrency):
-        image_path = IMAGES[index]
-        if isinstance(outcome, BaseException):
-            failures.append(f"{image_path.name}: {type(outcome).__name__}: {outcome}")
-            image_errors.append(
-                ImageError(
-                    image_path=image_path.name,
-                    error_type=type(outcome).__name__,
-                    error_message=str(outcome),
+    stragglers = StragglerReport()
+    outcomes = evaluate_images(
+        IMAGES,
+        metric,
+        representation_prompt_version=representation_prompt_version,
+        decomposition_prompt_version=decomposition_prompt_version,
+        limit=concurrency,
+        deadline=item_deadline,
+        speculate=speculate,
+        stragglers=stragglers,
+    )
+    try:
+        async for image_path, outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                failures.append(f"{image_path.name}: {type(outcome).__name__}: {outcome}")
+                image_errors.append(
+                    ImageError(
+                        image_path=image_path.name,
+                        error_type=type(outcome).__name__,
+                        error_message=str(outcome),
+                    )
                 )
-            )
-            continue
+                status.record_error()
+                continue
 
-        test_case, result = outcome
-        passed = metric.is_successful(result)
-        image_results.append(
-            ImageResult(
-                image_path=test_case.image_path,
-                result=result,
-                details={
-                    "representation": test_case.representation,
-                    "atoms": test_case.atoms,
-                    **result.details,
-                },
+            test_case, result = outcome
+            passed = metric.is_successful(result)
+            status.record_result(passed)
+            image_results.append(
+                ImageResult(
+                    image_path=test_case.image_path,
+                    result=result,
+                    details={
+                        "representation": test_case.representation,
+                        "atoms": test_case.atoms,
+                        **result.details,
+                    },
+                )
             )
-        )
-        print(f"{test_case.image_path.name}: {result.score:.2f}")
-        if not passed:
-            failures.append(f"{test_case.image_path.name}: score={result.score:.2f}")
+            print(f"{test_case.image_path.name}: {result.score:.2f}")
+            if not passed:
+                failures.append(f"{test_case.image_path.name}: score={result.score:.2f}")
+    finally:
+        status.finish()
+    print("\n" + stragglers.summary())
 
     if image_results or image_errors:
         _, summary_path, per_image_path = aggregate_prompt_results(
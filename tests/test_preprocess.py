@@ -0,0 +1,97 @@
+import json
+import os
+
+from PIL import Image
+
+import preprocess
+from vibeai.eval.dataset import MANIFEST_NAME
+
+
+def _photo(path, seed: int) -> None:
+    Image.effect_noise((64, 48), 20 + seed).convert("RGB").save(path, format="JPEG")
+
+
+def _run(src, dst) -> dict[str, dict]:
+    preprocess.process_directory(src, dst, workers=1)
+    return json.loads((dst / MANIFEST_NAME).read_text())
+
+
+def _fail(*args):
+    raise AssertionError(f"unexpected call with {args}")
+
+
+def test_unchanged_sources_are_skipped_from_the_manifest_alone(tmp_path, monkeypatch, capsys):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    _photo(src / "a.jpg", 1)
+    _photo(src / "b.jpg", 2)
+    first = _run(src, dst)
+    assert {entry["output"] for entry in first.values()} == {"a.jpg", "b.jpg"}
+
+    monkeypatch.setattr(preprocess, "_hash_file", _fail)
+    monkeypatch.setattr(preprocess, "_process_file", _fail)
+    capsys.readouterr()
+    assert _run(src, dst) == first
+    assert "Processed: 0, Skipped (already processed): 2, Errors: 0" in capsys.readouterr().out
+
+
+def test_touched_but_identical_source_is_adopted(tmp_path, monkeypatch):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    _photo(src / "a.jpg", 1)
+    first = _run(src, dst)["a.jpg"]
+    output = (dst / "a.jpg").read_bytes()
+
+    st = (src / "a.jpg").stat()
+    os.utime(src / "a.jpg", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    monkeypatch.setattr(preprocess, "_process_file", _fail)
+    entry = _run(src, dst)["a.jpg"]
+    assert entry == {**first, "mtime_ns": st.st_mtime_ns + 10**9}
+    assert (dst / "a.jpg").read_bytes() == output
+
+
+def test_colliding_output_names_get_a_hash_suffix(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    _photo(src / "A Photo.jpg", 1)
+    Image.effect_noise((64, 48), 40).convert("RGB").save(src / "a_photo.png")
+    manifest = _run(src, dst)
+
+    outputs = {name: entry["output"] for name, entry in manifest.items()}
+    assert outputs["A Photo.jpg"] == "a_photo.jpg"
+    assert outputs["a_photo.png"] == f"a_photo_{manifest['a_photo.png']['sha256'][:8]}.jpg"
+    assert all((dst / output).exists() for output in outputs.values())
+
+
+def test_legacy_srchash_sidecars_are_migrated(tmp_path, monkeypatch):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    _photo(src / "a.jpg", 1)
+    (dst / "old_name.jpg").write_bytes(preprocess.preprocess_image_bytes((src / "a.jpg").read_bytes()))
+    (dst / ".old_name.jpg.srchash").write_text(preprocess.short_hash((src / "a.jpg").read_bytes()))
+
+    monkeypatch.setattr(preprocess, "_process_file", _fail)
+    manifest = _run(src, dst)
+    assert manifest["a.jpg"]["output"] == "old_name.jpg"
+    assert all(field in manifest["a.jpg"] for field in preprocess.OUTPUT_FIELDS)
+    assert not list(dst.glob(".*.srchash"))
+
+
+def test_entries_are_removed_when_their_source_fails_or_disappears(tmp_path, monkeypatch):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    for i, name in enumerate(["broken.jpg", "gone.jpg", "unreadable.jpg", "kept.jpg"]):
+        _photo(src / name, i)
+    assert len(_run(src, dst)) == 4
+
+    (src / "broken.jpg").write_bytes(b"not a jpeg")
+    (src / "gone.jpg").unlink()
+    os.utime(src / "unreadable.jpg", ns=(0, 10**9))
+    hash_file = preprocess._hash_file
+
+    def _unreadable(path):
+        return (path.name, None, "permission denied") if path.name == "unreadable.jpg" else hash_file(path)
+
+    monkeypatch.setattr(preprocess, "_hash_file", _unreadable)
+    assert set(_run(src, dst)) == {"kept.jpg"}
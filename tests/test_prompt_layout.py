@@ -0,0 +1,36 @@
+import pytest
+
+from vibeai.llm import client
+from vibeai.llm.prompt_layout import Prompt
+from vibeai.prompts.decomposition import PROMPTS as DECOMPOSITION_PROMPTS
+from vibeai.prompts.decomposition_eval import DECOMPOSITION_EVAL_PROMPT
+from vibeai.prompts.plausibility_eval import PLAUSIBILITY_EVAL_PROMPT
+
+TEMPLATES = [
+    *((t, {"representation": "REPRESENTATION"}) for t in DECOMPOSITION_PROMPTS.values()),
+    (DECOMPOSITION_EVAL_PROMPT, {"representation": "REPRESENTATION", "atoms": "1. ATOM"}),
+    (PLAUSIBILITY_EVAL_PROMPT, {"atom_list": "1. ATOM"}),
+]
+
+
+@pytest.mark.parametrize("template, fields", TEMPLATES)
+def test_variable_content_moves_last(template, fields):
+    prompt = Prompt(template, fields)
+    static, variable = prompt.parts
+    assert "REPRESENTATION" not in static and "ATOM" not in static
+    for value in fields.values():
+        assert value in variable
+    assert "{{" not in static
+    # The static part, and so the cache key, doesn't depend on the fields.
+    other = Prompt(template, {name: "other" for name in fields})
+    assert other.parts[0] == static and other.cache_key == prompt.cache_key
+
+
+def test_inline_fields_are_rejected():
+    with pytest.raises(ValueError):
+        Prompt("Describe {thing} briefly.", {"thing": "x"}).parts
+
+
+def test_llm_cache_key_is_the_inline_prompt():
+    prompt = Prompt(PLAUSIBILITY_EVAL_PROMPT, {"atom_list": "1. ATOM"})
+    assert client._cache_path("m", prompt, b"img") == client._cache_path("m", prompt.inline, b"img")
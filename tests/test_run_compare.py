@@ -0,0 +1,67 @@
+import json
+import os
+
+from vibeai.eval import run_compare
+
+
+def _judgement(completeness: int, atom_quality: float) -> dict:
+    return {
+        "final_verdict": {
+            "completeness": {"verdict": completeness, "reason": "r"},
+            "atom_quality": {"verdict": atom_quality, "reason": "r"},
+        }
+    }
+
+
+def _write_run(root, run: str, rows: list[tuple[str, int, float]]) -> None:
+    metric_dir = root / "decomposition_quality"
+    metric_dir.mkdir(parents=True, exist_ok=True)
+    with (metric_dir / f"{run}.per_image.jsonl").open("w") as f:
+        for image_path, completeness, atom_quality in rows:
+            score = (completeness + atom_quality) / 2 / 5
+            f.write(
+                json.dumps(
+                    {
+                        "image_path": image_path,
+                        "score": score,
+                        "passed": score >= 0.7,
+                        "details": _judgement(completeness, atom_quality),
+                    }
+                )
+                + "\n"
+            )
+
+
+def test_compare_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_compare, "RESULTS_ROOT", tmp_path)
+    _write_run(tmp_path, "a", [("img_1.jpg", 5, 5), ("img_2.jpg", 2, 2), ("img_3.jpg", 4, 4)])
+    _write_run(tmp_path, "b", [("img_1.jpg", 5, 5), ("img_2.jpg", 4, 5), ("img_4.jpg", 1, 1)])
+
+    cmp = run_compare.compare_runs("decomposition_quality", "a", "b")
+
+    assert cmp["n_shared"] == 2
+    assert cmp["n_only_a"] == 1
+    assert cmp["n_only_b"] == 1
+    assert cmp["n_improved"] == 1
+    assert cmp["n_regressed"] == 0
+    assert [row["image_path"] for row in cmp["images"]] == ["img_2.jpg", "img_1.jpg"]
+    assert round(cmp["images"][0]["delta"], 6) == 0.5
+    assert round(cmp["submetric_mean_deltas"]["completeness"], 6) == 0.2
+    assert round(cmp["submetric_mean_deltas"]["atom_quality"], 6) == 0.3
+    assert cmp["agreement"]["pass_agreement"] == 0.5
+
+
+def test_compare_runs_cache_invalidated_by_rewrite(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_compare, "RESULTS_ROOT", tmp_path)
+    _write_run(tmp_path, "a", [("img_1.jpg", 3, 3)])
+    _write_run(tmp_path, "b", [("img_1.jpg", 3, 3)])
+    assert run_compare.compare_runs("decomposition_quality", "a", "b")["mean_delta"] == 0.0
+    assert run_compare.compare_runs("decomposition_quality", "a", "b")["agreement"]["pass_kappa"] is None
+
+    _write_run(tmp_path, "b", [("img_1.jpg", 5, 5)])
+    path = tmp_path / "decomposition_quality" / "b.per_image.jsonl"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert round(run_compare.compare_runs("decomposition_quality", "a", "b")["mean_delta"], 6) == 0.4
+    assert run_compare.summarize_run("decomposition_quality", "b")["pass_rate"] == 1.0
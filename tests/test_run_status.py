@@ -0,0 +1,62 @@
+import json
+
+from vibeai.eval import run_status
+from vibeai.eval.run_status import RunStatusReporter, read_status
+from vibeai.llm import usage_log
+
+
+def _reporter(live_dir, total: int = 4) -> RunStatusReporter:
+    return RunStatusReporter(
+        "run_1", metric_name="plausibility", total=total, representation_prompt_version="baseline",
+        decomposition_prompt_version="baseline", model="m", concurrency=2, live_dir=live_dir,
+        min_interval=0,
+    )
+
+
+def _log(*records: dict) -> None:
+    with usage_log.USAGE_LOG_PATH.open("a") as f:
+        f.writelines(json.dumps(r) + "\n" for r in records)
+
+
+def test_counts_throughput_and_eta(tmp_path, monkeypatch):
+    monkeypatch.setattr(usage_log, "USAGE_LOG_PATH", tmp_path / "calls.jsonl")
+    clock = iter([1000.0, 1000.0, 1010.0, 1020.0, 1030.0])
+    monkeypatch.setattr(run_status.time, "time", lambda: next(clock))
+    status = _reporter(tmp_path)
+    assert read_status(status.path)["eta_seconds"] is None
+
+    status.record_result(passed=True)
+    status.record_error()
+    written = read_status(status.path)
+    assert (written["completed"], written["errored"], written["passed"]) == (1, 1, 1)
+    assert written["images_per_sec"] == 0.1
+    assert written["eta_seconds"] == 20.0
+
+    status.finish()
+    written = read_status(status.path)
+    assert written["finished"] and written["eta_seconds"] == 0.0
+
+
+def test_tokens_come_from_calls_logged_during_the_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(usage_log, "USAGE_LOG_PATH", tmp_path / "calls.jsonl")
+    _log({"event": "call", "total_tokens": 1000})  # before the run
+    status = _reporter(tmp_path)
+
+    # Across midnight, where the budget's daily counter starts over.
+    _log(
+        {"timestamp": "2026-01-01T23:59:59+00:00", "event": "call", "total_tokens": 30},
+        {"timestamp": "2026-01-02T00:00:01+00:00", "event": "call", "total_tokens": 20},
+        {"event": "cache_hit"},
+        {"event": "hedge", "outcome": "hedge won"},
+    )
+    status.record_result(passed=True)
+    assert read_status(status.path)["tokens_used"] == 50
+
+    with usage_log.USAGE_LOG_PATH.open("a") as f:
+        f.write('{"event": "call", "total_to')  # still being written
+    status.record_result(passed=True)
+    assert read_status(status.path)["tokens_used"] == 50
+    with usage_log.USAGE_LOG_PATH.open("a") as f:
+        f.write('kens": 5}\n')
+    status.finish()
+    assert read_status(status.path)["tokens_used"] == 55
@@ -0,0 +1,99 @@
+import asyncio
+import itertools
+import random
+from pathlib import Path
+from types import SimpleNamespace
+
+from vibeai.eval import sequential
+from vibeai.eval.sequential import Candidate, Comparison, mixture_rho2, run_sequential
+from vibeai.metrics.base import MetricResult
+
+
+def _comparison(alpha=0.05, margin=0.02, min_n=30):
+    return Comparison("challenger", alpha, margin, min_n, mixture_rho2(alpha))
+
+
+def test_clear_difference_stops_early():
+    rng = random.Random(0)
+    comparison = _comparison()
+    for _ in range(2000):
+        comparison.update(0.15 + rng.gauss(0, 0.1))
+        if comparison.decision:
+            break
+    assert comparison.decision == "better"
+    assert comparison.decided_at < 100
+
+
+def test_negligible_difference_is_called_equivalent():
+    rng = random.Random(1)
+    comparison = _comparison(margin=0.05)
+    for _ in range(5000):
+        comparison.update(rng.gauss(0, 0.05))
+        if comparison.decision:
+            break
+    assert comparison.decision == "equivalent"
+
+
+def test_false_positive_rate_holds_under_continuous_monitoring():
+    rng = random.Random(2)
+    false_positives = 0
+    for _ in range(200):
+        comparison = _comparison(margin=0.0)  # never stop for equivalence
+        for _ in range(500):
+            comparison.update(rng.gauss(0, 0.2))
+            if comparison.decision:
+                false_positives += 1
+                break
+    assert false_positives / 200 <= 0.05
+
+
+async def test_runner_pairs_images_and_stops_once_decided(monkeypatch):
+    async def fake_evaluate_image(
+        image_path, metric, representation_prompt_version, decomposition_prompt_version
+    ):
+        score = {"baseline": 0.5, "better": 0.8}.get(representation_prompt_version, 0.5)
+        test_case = SimpleNamespace(representation="r", atoms=["a"])
+        return test_case, MetricResult(score=score + 0.01 * (int(image_path.stem) % 3), reason="")
+
+    monkeypatch.setattr(sequential, "evaluate_image", fake_evaluate_image)
+    images = (Path(f"{i}.jpg") for i in itertools.count())
+    candidates = [Candidate("baseline", "baseline"), Candidate("better", "baseline")]
+    run = await run_sequential(SimpleNamespace(), candidates, images, min_n=10, limit=2)
+
+    comparison = run.comparisons["better__baseline"]
+    assert comparison.decision == "better"
+    assert run.done
+    assert len(run.results["better__baseline"]) == len(run.results["baseline__baseline"])
+    assert run.images_started < 20
+
+
+async def test_runner_feeds_comparisons_in_launch_order_and_cancels_on_return(monkeypatch):
+    started, completed, cancelled = set(), set(), set()
+
+    async def fake_evaluate_image(
+        image_path, metric, representation_prompt_version, decomposition_prompt_version
+    ):
+        i = int(image_path.stem)
+        started.add(i)
+        try:
+            # Even images are slow, so they finish after the odd ones launched later.
+            await asyncio.sleep(0.02 if i % 2 == 0 else 0.001)
+        except asyncio.CancelledError:
+            cancelled.add(i)
+            raise
+        completed.add(i)
+        score = 0.8 if representation_prompt_version == "better" else 0.5
+        return SimpleNamespace(representation="r", atoms=["a"]), MetricResult(score=score, reason="")
+
+    monkeypatch.setattr(sequential, "evaluate_image", fake_evaluate_image)
+    images = (Path(f"{i}.jpg") for i in itertools.count())
+    candidates = [Candidate("baseline", "baseline"), Candidate("better", "baseline")]
+    run = await run_sequential(SimpleNamespace(), candidates, images, min_n=10, limit=4)
+
+    recorded = [int(r.image_path.stem) for r in run.results["baseline__baseline"]]
+    assert recorded == list(range(len(recorded)))
+    assert run.comparisons["better__baseline"].n == len(recorded)
+    # Whatever was still running when the decision came was cancelled
+    # before run_sequential returned, not left to the garbage collector.
+    assert cancelled
+    assert started == completed | cancelled
@@ -0,0 +1,48 @@
+import json
+import os
+import tarfile
+
+from vibeai.eval.dataset import MANIFEST_NAME, load_image_paths
+from vibeai.eval.shards import pack, read_image, verify
+
+
+def _write_images(src, n: int) -> dict[str, bytes]:
+    src.mkdir()
+    images = {f"img_{i:02d}.jpg": os.urandom(700 + 300 * i) for i in range(n)}
+    for name, data in images.items():
+        (src / name).write_bytes(data)
+    manifest = {f"IMG_{name}": {"output": name} for name in images}
+    (src / MANIFEST_NAME).write_text(json.dumps(manifest))
+    return images
+
+
+def test_pack_roundtrip_across_shards(tmp_path):
+    images = _write_images(tmp_path / "processed", 12)
+    packed = tmp_path / "packed"
+    index = pack(tmp_path / "processed", packed, shard_bytes=4096)
+
+    assert len(index["shards"]) > 1
+    assert verify(packed) == 0
+    for name, data in images.items():
+        assert bytes(read_image(packed / name)) == data
+
+    # plain tars: readable without the index
+    with tarfile.open(packed / index["shards"][0]) as tar:
+        member = tar.getmembers()[0]
+        assert tar.extractfile(member).read() == images[member.name]
+
+
+def test_load_image_paths_reads_packed_dir(tmp_path):
+    _write_images(tmp_path / "processed", 5)
+    packed = tmp_path / "packed"
+    pack(tmp_path / "processed", packed, shard_bytes=4096)
+
+    paths = load_image_paths(n=3, seed=1, data_dir=packed)
+    unpacked = load_image_paths(n=3, seed=1, data_dir=tmp_path / "processed")
+    assert [p.name for p in paths] == [p.name for p in unpacked]
+    assert all(not p.exists() and read_image(p) for p in paths)
+
+
+def test_read_image_plain_directory(tmp_path):
+    (tmp_path / "a.jpg").write_bytes(b"jpeg")
+    assert read_image(tmp_path / "a.jpg") == b"jpeg"
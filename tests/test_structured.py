@@ -0,0 +1,55 @@
+import json
+
+import pytest
+from openai import BadRequestError
+
+from vibeai.llm import client
+from vibeai.llm.structured import STRING_LIST, OutputSchema
+
+ATOMS = OutputSchema("vibe_atoms", STRING_LIST, root_key="atoms")
+
+
+def _schema_rejection() -> BadRequestError:
+    error = BadRequestError.__new__(BadRequestError)
+    Exception.__init__(error, "Invalid schema for response_format")
+    error.param = "text.format.schema"
+    return error
+
+
+def test_text_format_wraps_arrays_in_a_strict_object():
+    fmt = ATOMS.text_format["format"]
+    assert fmt["strict"] is True
+    assert fmt["schema"]["required"] == ["atoms"]
+    assert fmt["schema"]["additionalProperties"] is False
+    assert ATOMS.unwrap('{"atoms": ["a", "b"]}') == '["a", "b"]'
+    with pytest.raises(ValueError):
+        ATOMS.unwrap('{"atoms": ["a"')
+
+
+async def test_structured_call_unwraps_and_logs_validation_retries(fake_api):
+    requests, script, log_path = fake_api
+    script += ['{"atoms": []}', '{"atoms": ["a"]}']
+
+    def validate(text):
+        if not json.loads(text):
+            raise ValueError("empty")
+
+    output = await client.call_text_async("p", call_type="decompose", validate=validate, schema=ATOMS)
+
+    assert output == '["a"]'
+    assert all(r["text"] == ATOMS.text_format for r in requests)
+    records = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [r["attempt"] for r in records] == [1, 2]
+    assert all(r["structured"] for r in records)
+    assert records[0]["validation_error"] == "ValueError: empty"
+    assert records[1]["validation_error"] is None
+
+
+async def test_schema_rejection_falls_back_to_plain_prompting(fake_api):
+    requests, script, _ = fake_api
+    script += [_schema_rejection(), '```json\n["a"]\n```', '["b"]']
+
+    assert await client.call_text_async("p1", schema=ATOMS) == '```json\n["a"]\n```'
+    assert await client.call_text_async("p2", schema=ATOMS) == '["b"]'
+    assert "text" in requests[0]
+    assert "text" not in requests[1] and "text" not in requests[2]
@@ -0,0 +1,73 @@
+import json
+import random
+
+import pytest
+
+from vibeai import tracing
+from vibeai.llm import client
+from vibeai.tracing import LatencyHistogram, span
+
+
+def test_histogram_percentiles_are_within_bucket_error():
+    rng = random.Random(0)
+    values = sorted(int(rng.lognormvariate(12, 1.5)) for _ in range(20_000))
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    assert (histogram.count, histogram.min, histogram.max) == (len(values), values[0], values[-1])
+    for q in (50, 90, 99, 99.9):
+        exact = values[int(q / 100 * len(values)) - 1]
+        assert histogram.percentile(q) == pytest.approx(exact, rel=1 / 32)
+    assert len(histogram.counts) < 1000  # vs ~20000 distinct values
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for value in (0, 3, 17, 31):
+        histogram.record(value)
+    assert [histogram.percentile(q) for q in (25, 50, 75, 100)] == [0, 3, 17, 31]
+
+
+def test_nested_spans_inherit_stage_and_model(fake_api, tmp_path):
+    with span("llm_call", stage="judge", model="m"):
+        with span("retry_sleep"):
+            pass
+    with pytest.raises(KeyError):
+        with span("cache_lookup"):
+            raise KeyError("boom")
+
+    tracer = tracing.tracer
+    assert set(tracer.histograms) == {
+        ("llm_call", "judge", "m"),
+        ("retry_sleep", "judge", "m"),
+        ("cache_lookup", "-", "-"),
+    }
+    trace = json.loads(tracer.write_chrome_trace(tmp_path / "trace.json").read_text())
+    events = {e["name"]: e for e in trace["traceEvents"]}
+    assert events["cache_lookup"]["args"]["error"] == "KeyError"
+    outer, inner = events["llm_call"], events["retry_sleep"]
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+
+async def test_call_spans_cover_retries_and_cache(fake_api):
+    _, script, _ = fake_api
+    script += ["not json", '{"ok": true}']
+
+    def validate(text):
+        json.loads(text)
+
+    for _ in range(2):  # the second call is a cache hit
+        await client.call_text_async("p", model="m", call_type="judge", validate=validate)
+
+    counts = {key: h.count for key, h in tracing.tracer.histograms.items()}
+    assert counts == {
+        ("llm_call", "judge", "m"): 2,
+        ("cache_lookup", "judge", "m"): 2,
+        ("api_call", "judge", "m"): 2,
+        ("validation", "judge", "m"): 2,
+        ("retry_sleep", "judge", "m"): 1,
+        ("cache_write", "judge", "m"): 1,
+    }
+    lookups = [e["args"]["hit"] for e in tracing.tracer.events if e["name"] == "cache_lookup"]
+    assert lookups == [False, True]
@@ -0,0 +1,38 @@
+import json
+
+from vibeai.llm import client
+from vibeai.llm.incremental import ItemStream
+from vibeai.llm.transport import TransportConfig, set_transport
+
+
+def test_pool_is_sized_for_concurrency_and_timeouts_are_per_stage():
+    config = TransportConfig.for_concurrency(30)
+    limits = config.limits()
+    assert (limits.max_connections, limits.max_keepalive_connections) == (60, 60)
+    assert limits.keepalive_expiry == config.keepalive_expiry
+    assert config.timeout("decompose", streamed=True).read == 120.0
+    assert config.timeout("unknown", streamed=True).read == config.read_timeout
+    # A non-streamed response's first byte is its last: no stage gets less.
+    assert config.timeout("judge").read == config.read_timeout == 600.0
+    assert config.timeout("judge").connect == config.connect_timeout
+
+
+async def test_each_streamed_call_gets_its_stage_timeout(fake_api, monkeypatch):
+    requests, script, _ = fake_api
+    script += ['["a"]', '["a"]']
+    config = TransportConfig(read_timeouts=(("decompose", 7.0),))
+    monkeypatch.setattr("vibeai.llm.transport._transport", config)
+
+    await client.call_text_async("p", call_type="decompose", validate=json.loads, stream_check=ItemStream())
+    await client.call_text_async("q", call_type="decompose", validate=json.loads)
+
+    assert [r["timeout"].read for r in requests] == [7.0, config.read_timeout]
+
+
+def test_clients_share_a_pool_per_config(monkeypatch):
+    monkeypatch.setattr("vibeai.llm.transport._transport", TransportConfig())
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    first = client.get_async_client()
+    assert client.get_async_client() is first
+    set_transport(TransportConfig(http2=False))
+    assert client.get_async_client() is not first
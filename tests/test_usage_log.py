@@ -0,0 +1,71 @@
+import json
+
+from openai import RateLimitError
+
+from vibeai.llm import client, usage_log, usage_report
+
+
+def _rate_limited() -> RateLimitError:
+    error = RateLimitError.__new__(RateLimitError)
+    Exception.__init__(error, "Rate limit reached")
+    error.status_code, error.body = 429, None
+    return error
+
+
+def _records(log_path) -> list[dict]:
+    return [json.loads(line) for line in log_path.read_text().splitlines()]
+
+
+async def test_attempts_retry_reasons_and_cache_hits_are_logged(fake_api):
+    _, script, log_path = fake_api
+    script += [_rate_limited(), "not json", '{"ok": true}']
+
+    for _ in range(2):  # the second call is a cache hit
+        await client.call_text_async("p", model="m", call_type="judge", validate=json.loads)
+
+    records = _records(log_path)
+    assert [(r["event"], r["attempt"] if "attempt" in r else None) for r in records] == [
+        ("api_error", 1),
+        ("call", 2),
+        ("call", 3),
+        ("cache_hit", None),
+    ]
+    assert records[0]["status_code"] == 429 and records[0]["retry_reason"] is None
+    assert records[1]["retry_reason"] == "RateLimitError 429"
+    assert records[2]["retry_reason"] == "validation: JSONDecodeError"
+    assert all(r["latency_ms"] >= 0 for r in records[:3])
+    assert records[1]["ttfb_ms"] is None  # not streamed
+
+
+async def test_report_breaks_down_latency_overhead_and_hits(fake_api, monkeypatch, capsys):
+    _, script, log_path = fake_api
+    script += ["not json", '{"ok": true}']
+    await client.call_text_async("p", model="m", call_type="judge", validate=json.loads)
+    await client.call_text_async("p", model="m", call_type="judge", validate=json.loads)
+    monkeypatch.setattr(usage_report, "read_records", lambda: _records(log_path))
+    monkeypatch.setattr("sys.argv", ["usage_report"])
+
+    usage_report.main()
+
+    out = capsys.readouterr().out
+    latency_table = out.split("\nLatency (s)")[1]
+    row = next(line for line in latency_table.splitlines() if line.startswith("judge / m"))
+    calls, *_, retry_tokens, retry_share, api_errors, _, hit_rate = row[32:].split()
+    assert (calls, retry_tokens, retry_share, api_errors, hit_rate) == ("2", "15", "50.0%", "0", "50%")
+    assert "validation: JSONDecodeError" in out
+
+
+async def test_report_skips_hedge_events_in_the_latency_table(fake_api, monkeypatch, capsys):
+    _, script, log_path = fake_api
+    script += ['{"ok": true}']
+    await client.call_text_async("p", model="m", call_type="judge", validate=json.loads)
+    usage_log.log_event("m", "judge", "hedge", won=True, latency=0.5)
+    monkeypatch.setattr(usage_report, "read_records", lambda: _records(log_path))
+    monkeypatch.setattr("sys.argv", ["usage_report"])
+
+    usage_report.main()
+
+    latency_table = capsys.readouterr().out.split("\nLatency (s)")[1]
+    row = next(line for line in latency_table.splitlines() if line.startswith("judge / m"))
+    calls, *_, hit_rate = row[32:].split()
+    assert (calls, hit_rate) == ("1", "0%")
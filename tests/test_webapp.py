@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+from vibeai.eval.run_status import RunStatusReporter
+from vibeai.webapp import server
+
+N_SAVES = 40
+
+
+async def _request(method: str, path: str, body: dict | None = None) -> tuple[int, bytes]:
+    """Send one request to the app in-process, over plain ASGI; returns the
+    status and the whole (possibly streamed) response body."""
+    payload = b"" if body is None else json.dumps(body).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+        "client": ("test", 0), "server": ("test", 80),
+    }
+    messages = [{"type": "http.request", "body": payload, "more_body": False}]
+    status, chunks = [], []
+    disconnected = asyncio.Event()
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                disconnected.set()
+
+    await server.app(scope, receive, send)
+    return status[0], b"".join(chunks)
+
+
+async def test_concurrent_saves_to_one_file_all_land(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "RESULTS_ROOT", tmp_path)
+    monkeypatch.setattr(server, "_writers", {})
+    images = [f"img_{i:02d}.jpg" for i in range(N_SAVES)]
+    run_file = tmp_path / "plausibility" / "run.per_image.jsonl"
+    run_file.parent.mkdir(parents=True)
+    run_file.write_text("".join(json.dumps({"image_path": p, "details": {}}) + "\n" for p in images))
+    human_file = tmp_path / "plausibility" / "human" / "run__ann.json"
+
+    # Every version of the file anyone could read must be complete JSON.
+    written = []
+    write_human_file = server._write_human_file
+
+    def _write_and_check(path, data):
+        write_human_file(path, data)
+        written.append(json.loads(path.read_text()))
+
+    monkeypatch.setattr(server, "_write_human_file", _write_and_check)
+    saving = True
+
+    async def _read_while_saving():
+        while saving:
+            if human_file.exists():
+                json.loads(human_file.read_text())
+            await asyncio.sleep(0)
+
+    reader = asyncio.ensure_future(_read_while_saving())
+    statuses = await asyncio.gather(*(
+        _request("POST", "/api/plausibility/annotations", {
+            "run": "run", "annotator": "ann", "image_path": image,
+            "atoms": [{"atom": "calm", "type": "vibe_only", "plausible": i % 2 == 0}],
+        })
+        for i, image in enumerate(images)
+    ))
+    saving = False
+    await reader
+
+    assert [status for status, _ in statuses] == [200] * N_SAVES
+    saved = json.loads(human_file.read_text())
+    assert sorted(saved) == images
+    assert all(saved[image]["score"] == (1.0 if i % 2 == 0 else 0.0) for i, image in enumerate(images))
+    # No write ever dropped a record an earlier one had.
+    assert written[-1] == saved
+    assert all(earlier.keys() <= later.keys() for earlier, later in zip(written, written[1:]))
+    assert server._load_human("plausibility", "run", "ann") == saved
+
+
+async def test_live_status_streams_each_version_until_finished(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "LIVE_DIR", tmp_path)
+    monkeypatch.setattr(server, "LIVE_POLL_SECONDS", 0.01)
+    status = RunStatusReporter(
+        "run_1", metric_name="plausibility", total=3, representation_prompt_version="baseline",
+        decomposition_prompt_version="baseline", model="m", concurrency=2, live_dir=tmp_path,
+        min_interval=0,
+    )
+
+    async def _run():
+        for passed in (True, False):
+            await asyncio.sleep(0.05)
+            status.record_result(passed)
+        await asyncio.sleep(0.05)
+        status.record_error()
+        status.finish()
+
+    runner = asyncio.ensure_future(_run())
+    code, body = await asyncio.wait_for(_request("GET", "/api/live/status/run_1/events"), timeout=5)
+    await runner
+
+    assert code == 200
+    chunks = body.decode().split("\n\n")
+    events = [json.loads(chunk.removeprefix("data: ")) for chunk in chunks if chunk.startswith("data: ")]
+    assert len(events) > 1 and events[0]["completed"] == 0
+    done = [e["completed"] + e["errored"] for e in events]
+    assert done == sorted(done)
+    final = events[-1]
+    assert (final["completed"], final["errored"], final["passed"], final["finished"]) == (2, 1, 1, True)
+    assert not any(e["finished"] for e in events[:-1])
+
+    code, body = await _request("GET", "/api/live/status")
+    assert code == 200 and [r["run_id"] for r in json.loads(body)["runs"]] == ["run_1"]
+    code, _ = await _request("GET", "/api/live/status/missing/events")
+    assert code == 404
@@ -0,0 +1,298 @@
+"""Active sampling: spend judge calls on the images whose scores are uncertain.
+
+Many images score the same under every prompt version, so drawing
+``load_image_paths`` uniformly spends most calls re-confirming them. Past
+runs (``results/<metric>/*.per_image.jsonl``) say which images those are.
+Each image gets a prediction of its score and pass/fail outcome, its mean
+over past runs, plus how much a new run is expected to deviate from that:
+the score variance across runs, and p(1-p) of its past pass rate, which
+peaks for images that sit on the threshold. Images are drawn, with
+replacement, with probability proportional to those expected deviations'
+standard deviations (Neyman allocation). A fixed share of the
+probability is spread uniformly, so every image can be drawn and images
+without history still count.
+
+Estimates stay unbiased for any priors, good or bad: they are difference
+estimators (predicted pool mean, plus a Hansen-Hurwitz importance-weighted
+estimate of how far actual scores fall from the predictions). Good priors
+only make the standard error smaller. A draw that repeats an image costs
+nothing extra, since the LLM cache answers it.
+
+Usage:
+    python -m vibeai.eval.active_sampling --metric plausibility \\
+        --representation-prompt-version v2 --draws 100
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+from vibeai.eval.dataset import load_image_paths
+from vibeai.eval.prompt_results import RESULTS_DIR, ImageError, ImageResult, aggregate_prompt_results
+from vibeai.metrics.decomposition_quality import DecompositionQualityMetric
+from vibeai.metrics.plausibility import PlausibilityMetric
+from vibeai.pipeline.evaluate import evaluate_images
+
+EXPERIMENTS_DIR = Path("results/_experiments/active_sampling")
+# Share of the sampling probability spread uniformly over the pool. It bounds
+# every weight 1/(N p) at 1/share, so a bad prior can't blow up the variance.
+DEFAULT_UNIFORM_SHARE = 0.2
+
+METRICS = {"decomposition_quality": DecompositionQualityMetric, "plausibility": PlausibilityMetric}
+
+
+@dataclass(frozen=True)
+class ImagePrior:
+    runs: int  # past runs that scored the image
+    score: float  # predicted score: mean over past runs
+    score_var: float  # expected squared deviation of a new score from it
+    pass_prob: float  # predicted pass probability
+    pass_var: float
+
+
+@dataclass
+class Estimate:
+    mean_score: float
+    mean_score_se: float
+    pass_rate: float
+    pass_rate_se: float
+    draws: int
+    unique_images: int
+    # Uniform-sample size that would give the same mean-score standard error.
+    uniform_equivalent_n: float
+
+
+def load_score_history(
+    metric_name: str, results_dir: Path = RESULTS_DIR
+) -> dict[str, list[tuple[float, bool]]]:
+    """(score, passed) per image name across all past runs of ``metric_name``."""
+    history: dict[str, list[tuple[float, bool]]] = {}
+    for path in sorted((results_dir / metric_name).glob("*.per_image.jsonl")):
+        with path.open() as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                name = Path(record["image_path"]).name
+                history.setdefault(name, []).append((record["score"], record["passed"]))
+    return history
+
+
+def build_priors(names: list[str], history: dict[str, list[tuple[float, bool]]]) -> list[ImagePrior]:
+    """One prior per name. Images scored once borrow the pool's typical
+    per-image variance; images never scored get the pool-wide moments."""
+    all_scores = [score for runs in history.values() for score, _ in runs]
+    all_passes = [passed for runs in history.values() for _, passed in runs]
+    pool_mean = float(np.mean(all_scores)) if all_scores else 0.5
+    pool_var = float(np.var(all_scores)) if len(all_scores) > 1 else 0.25
+    pool_pass = float(np.mean(all_passes)) if all_passes else 0.5
+    repeated = [np.var([s for s, _ in runs], ddof=1) for runs in history.values() if len(runs) > 1]
+    typical_var = float(np.median(repeated)) if repeated else pool_var
+
+    priors = []
+    for name in names:
+        runs = history.get(name)
+        if not runs:
+            priors.append(ImagePrior(0, pool_mean, pool_var, pool_pass, pool_pass * (1 - pool_pass)))
+            continue
+        k = len(runs)
+        scores = [score for score, _ in runs]
+        var = float(np.var(scores, ddof=1)) if k > 1 else typical_var
+        # Smoothed pass rate: one unanimous run shouldn't make an image certain.
+        pass_prob = (sum(passed for _, passed in runs) + 0.5) / (k + 1)
+        priors.append(
+            ImagePrior(
+                runs=k,
+                score=float(np.mean(scores)),
+                score_var=var * (1 + 1 / k),  # a new draw's variance plus the mean's
+                pass_prob=pass_prob,
+                pass_var=pass_prob * (1 - pass_prob),
+            )
+        )
+    return priors
+
+
+def sampling_probabilities(
+    priors: list[ImagePrior], uniform_share: float = DEFAULT_UNIFORM_SHARE
+) -> np.ndarray:
+    """Draw probability per image: half Neyman-allocated for the score, half
+    for pass/fail, mixed with ``uniform_share`` of a uniform draw."""
+    n = len(priors)
+    uniform = np.full(n, 1 / n)
+    parts = []
+    for values in (
+        np.sqrt([p.score_var for p in priors]),
+        np.sqrt([p.pass_var for p in priors]),
+    ):
+        total = values.sum()
+        parts.append(values / total if total > 0 else uniform)
+    return uniform_share * uniform + (1 - uniform_share) * (parts[0] + parts[1]) / 2
+
+
+class ActiveSampler:
+    def __init__(
+        self,
+        paths: list[Path],
+        priors: list[ImagePrior],
+        uniform_share: float = DEFAULT_UNIFORM_SHARE,
+    ):
+        if len(paths) != len(priors):
+            raise ValueError("need one prior per path")
+        self.paths = paths
+        self.priors = priors
+        self.probabilities = sampling_probabilities(priors, uniform_share)
+
+    @classmethod
+    def from_history(
+        cls,
+        paths: list[Path],
+        metric_name: str,
+        results_dir: Path = RESULTS_DIR,
+        uniform_share: float = DEFAULT_UNIFORM_SHARE,
+    ) -> "ActiveSampler":
+        history = load_score_history(metric_name, results_dir)
+        return cls(paths, build_priors([p.name for p in paths], history), uniform_share)
+
+    def draw(self, n: int, seed: int = 0) -> list[int]:
+        """``n`` pool indices drawn with replacement."""
+        rng = np.random.default_rng(seed)
+        return rng.choice(len(self.paths), size=n, p=self.probabilities).tolist()
+
+    def estimate(self, draws: list[int], outcomes: dict[int, tuple[float, bool]]) -> Estimate:
+        """Pool mean score and pass rate from the scored draws. ``outcomes``
+        maps pool index to (score, passed); draws of images missing from it
+        (errors) are dropped."""
+        draws = [i for i in draws if i in outcomes]
+        if not draws:
+            raise ValueError("no scored draws to estimate from")
+        n_pool = len(self.paths)
+        index = np.array(draws)
+        weight = 1 / (n_pool * self.probabilities[index])
+        scores = np.array([outcomes[i][0] for i in draws])
+        passes = np.array([float(outcomes[i][1]) for i in draws])
+        predicted_score = np.array([p.score for p in self.priors])
+        predicted_pass = np.array([p.pass_prob for p in self.priors])
+
+        def difference_estimate(values: np.ndarray, predicted: np.ndarray) -> tuple[float, float]:
+            z = predicted.mean() + weight * (values - predicted[index])
+            se = float(z.std(ddof=1) / np.sqrt(len(z))) if len(z) > 1 else float("inf")
+            return float(z.mean()), se
+
+        mean_score, mean_se = difference_estimate(scores, predicted_score)
+        pass_rate, pass_se = difference_estimate(passes, predicted_pass)
+        # Importance-weighted pool variance of the score: what a uniform
+        # sample's per-image variance would be.
+        pool_var = float(np.sum(weight * (scores - mean_score) ** 2) / np.sum(weight))
+        return Estimate(
+            mean_score=mean_score,
+            mean_score_se=mean_se,
+            pass_rate=pass_rate,
+            pass_rate_se=pass_se,
+            draws=len(draws),
+            unique_images=len(set(draws)),
+            uniform_equivalent_n=pool_var / mean_se**2 if mean_se > 0 else float("inf"),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--metric", choices=sorted(METRICS), default="plausibility")
+    parser.add_argument("--representation-prompt-version", default="baseline")
+    parser.add_argument("--decomposition-prompt-version", default="baseline")
+    parser.add_argument("--draws", type=int, default=100)
+    parser.add_argument("--uniform-share", type=float, default=DEFAULT_UNIFORM_SHARE)
+    parser.add_argument("--image-dir", type=Path, default=None)
+    parser.add_argument("--split", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    metric = METRICS[args.metric]()
+    paths = load_image_paths(data_dir=args.image_dir, split=args.split)
+    sampler = ActiveSampler.from_history(paths, metric.name, uniform_share=args.uniform_share)
+    draws = sampler.draw(args.draws, seed=args.seed)
+    unique = list(dict.fromkeys(draws))
+    print(
+        f"{len(unique)} unique of {args.draws} draws from {len(paths)} images "
+        f"({sum(p.runs > 0 for p in sampler.priors)} with history)"
+    )
+
+    async def run():
+        items, errors, outcomes = [], [], {}
+        position = {paths[i]: i for i in unique}
+        async for path, outcome in evaluate_images(
+            [paths[i] for i in unique],
+            metric,
+            representation_prompt_version=args.representation_prompt_version,
+            decomposition_prompt_version=args.decomposition_prompt_version,
+            limit=args.concurrency,
+        ):
+            if isinstance(outcome, BaseException):
+                errors.append(ImageError(path.name, type(outcome).__name__, str(outcome)))
+                continue
+            test_case, result = outcome
+            passed = metric.is_successful(result)
+            outcomes[position[path]] = (result.score, passed)
+            items.append(
+                ImageResult(
+                    image_path=path,
+                    result=result,
+                    details={
+                        "representation": test_case.representation,
+                        "atoms": test_case.atoms,
+                        "draw_probability": float(sampler.probabilities[position[path]]),
+                        **result.details,
+                    },
+                )
+            )
+        return items, errors, outcomes
+
+    items, errors, outcomes = asyncio.run(run())
+    estimate = sampler.estimate(draws, outcomes)
+    print(
+        f"mean score {estimate.mean_score:.3f} ± {1.96 * estimate.mean_score_se:.3f}, "
+        f"pass rate {estimate.pass_rate:.1%} ± {1.96 * estimate.pass_rate_se:.1%} "
+        f"(95% CI; {len(errors)} errors)"
+    )
+    print(f"a uniform sample would need ~{estimate.uniform_equivalent_n:.0f} images for the same score SE")
+
+    stamp = int(time.time())
+    # The per-run summary's plain mean is over a non-uniform sample; the
+    # unbiased estimates are in the experiment record below.
+    versions = f"{args.representation_prompt_version}__{args.decomposition_prompt_version}"
+    run_name = f"{versions}_active{stamp}"
+    if items or errors:
+        aggregate_prompt_results(
+            metric,
+            items,
+            representation_prompt_version=args.representation_prompt_version,
+            decomposition_prompt_version=args.decomposition_prompt_version,
+            model=metric.model,
+            errors=errors,
+            run_name=run_name,
+        )
+    EXPERIMENTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = EXPERIMENTS_DIR / f"{metric.name}__{run_name}.json"
+    path.write_text(
+        json.dumps(
+            {
+                "metric": metric.name,
+                "run_name": run_name,
+                "pool_size": len(paths),
+                "uniform_share": args.uniform_share,
+                "draws": [paths[i].name for i in draws],
+                "estimate": asdict(estimate),
+            },
+            indent=2,
+        )
+    )
+    print(f"Saved run {run_name} under results/{metric.name}/ and the estimate to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""Multi-rater agreement (Fleiss' kappa, Krippendorff's alpha) over every
+stored human annotation of a run, with the LLM judge as one more rater.
+
+``vibeai.eval.human_alignment`` scores the LLM against one human at a time.
+This module instead loads every ``results/<metric>/human/<run>__*.json``
+(plus the LLM run) once into one item x rater label matrix per rated
+quantity ("channel", e.g. each atom's plausibility or each decomposition
+criterion), and measures reliability over the whole matrix. Items a rater
+didn't label are missing, not dropped, so annotators who covered different
+subsets of the run still count wherever they overlap.
+
+Matrices are cached by the mtimes of the files they were built from, so
+repeated queries (per channel, with/without the LLM rater, ...) don't
+re-read anything until an annotation file changes.
+
+Usage:
+    python -m vibeai.eval.agreement <run>
+    python -m vibeai.eval.agreement <run> --metric plausibility --no-llm
+"""
+
+import argparse
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from vibeai.eval.human_alignment import RESULTS_ROOT
+from vibeai.eval.kappa import encode
+
+LLM_RATER = "llm"
+MISSING = -1
+
+_CRITERIA = ["affectiveness", "atomicity", "fidelity", "evidence_preservation"]
+
+
+@dataclass
+class Channel:
+    """One rated quantity. ``codes[i, r]`` is the index into ``labels`` that
+    rater ``r`` gave item ``i``, or MISSING."""
+
+    labels: list
+    level: str  # "nominal" or "ordinal" - the natural Krippendorff metric
+    items: list[str]
+    codes: np.ndarray
+
+
+@dataclass
+class AnnotationMatrix:
+    metric: str
+    run: str
+    raters: list[str]
+    channels: dict[str, Channel]
+
+
+def _human_files(metric: str, run: str) -> dict[str, Path]:
+    """Annotator id -> file. A longer run name sharing this run's prefix
+    (e.g. ``<run>__v2``) would also match the glob, so its files are
+    excluded explicitly."""
+    metric_dir = RESULTS_ROOT / metric
+    human_dir = metric_dir / "human"
+    if not human_dir.exists():
+        return {}
+    longer_runs = [
+        p.name.removesuffix(".per_image.jsonl")
+        for p in metric_dir.glob(f"{run}__*.per_image.jsonl")
+    ]
+    files = {}
+    for path in sorted(human_dir.glob(f"{run}__*.json")):
+        if any(path.name.startswith(f"{other}__") for other in longer_runs):
+            continue
+        files[path.name.removeprefix(f"{run}__").removesuffix(".json")] = path
+    return files
+
+
+def _atom_labels(metric: str, record: dict, is_llm: bool) -> dict[str, list]:
+    """Per-channel labels (one per atom, or one per image) from a single
+    rater's record for one image."""
+    if metric == "plausibility":
+        key = "final_verdict" if is_llm else "plausible"
+        return {"plausible": [atom[key] for atom in record["atoms"]]}
+
+    atoms = record["atomic_judgement"]
+    labels = {
+        "atom_verdict": [atom["verdict"] for atom in atoms],
+        "completeness": [record["final_verdict"]["completeness"]["verdict"]],
+    }
+    for criterion in _CRITERIA:
+        labels[criterion] = [atom["evaluation"][criterion] for atom in atoms]
+    return labels
+
+
+_CHANNEL_SPECS = {
+    "plausibility": {"plausible": ([True, False], "nominal")},
+    "decomposition_quality": {
+        "atom_verdict": (["Good", "Bad"], "nominal"),
+        **{criterion: ([True, False], "nominal") for criterion in _CRITERIA},
+        "completeness": ([1, 2, 3, 4, 5], "ordinal"),
+    },
+}
+# Channels with one label per image rather than one per atom.
+_IMAGE_CHANNELS = frozenset({"completeness"})
+
+
+@lru_cache(maxsize=16)
+def _build_matrix(
+    metric: str, run: str, sources: tuple[tuple[str, Path, int], ...]
+) -> AnnotationMatrix:
+    """``sources`` is (rater, path, mtime_ns) per input file; the mtimes are
+    only there to key the cache."""
+    by_rater: dict[str, dict[str, dict]] = {}
+    for rater, path, _ in sources:
+        if rater == LLM_RATER:
+            records = {}
+            with path.open() as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        rec = json.loads(line)
+                        records[rec["image_path"]] = rec["details"]
+            by_rater[rater] = records
+        else:
+            by_rater[rater] = json.loads(path.read_text())
+    raters = list(by_rater)
+
+    # Atom count per image, fixed by the first rater that labelled it (the
+    # LLM run, when included). Atoms are paired by index, so a record with a
+    # different atom count only keeps its image-level labels for that image,
+    # as in human_alignment.
+    n_atoms: dict[str, int] = {}
+    per_rater_labels: dict[str, dict[str, dict[str, list]]] = {}
+    for rater in raters:
+        per_rater_labels[rater] = {}
+        for image_path, record in by_rater[rater].items():
+            labels = _atom_labels(metric, record, rater == LLM_RATER)
+            count = next(len(values) for name, values in labels.items() if name not in _IMAGE_CHANNELS)
+            if n_atoms.setdefault(image_path, count) != count:
+                labels = {name: values for name, values in labels.items() if name in _IMAGE_CHANNELS}
+            per_rater_labels[rater][image_path] = labels
+
+    channels = {}
+    images = sorted(n_atoms)
+    for name, (labels, level) in _CHANNEL_SPECS[metric].items():
+        per_image = name in _IMAGE_CHANNELS
+        items = [
+            image_path if per_image else f"{image_path}#{i}"
+            for image_path in images
+            for i in range(1 if per_image else n_atoms[image_path])
+        ]
+        index = {item: row for row, item in enumerate(items)}
+        codes = np.full((len(items), len(raters)), MISSING, dtype=np.int8)
+        for col, rater in enumerate(raters):
+            for image_path, rater_labels in per_rater_labels[rater].items():
+                if name not in rater_labels:
+                    continue
+                values = rater_labels[name]
+                rows = [
+                    index[image_path if per_image else f"{image_path}#{i}"] for i in range(len(values))
+                ]
+                codes[rows, col] = encode(values, labels)
+        channels[name] = Channel(labels=labels, level=level, items=items, codes=codes)
+
+    return AnnotationMatrix(metric=metric, run=run, raters=raters, channels=channels)
+
+
+def load_matrix(metric: str, run: str, include_llm: bool = True) -> AnnotationMatrix:
+    """Item x rater matrices for every channel of ``metric``, built once per
+    set of input-file mtimes. Treat the result as read-only (it's shared
+    across cache hits)."""
+    sources = []
+    if include_llm:
+        llm_path = RESULTS_ROOT / metric / f"{run}.per_image.jsonl"
+        if not llm_path.exists():
+            raise FileNotFoundError(llm_path)
+        sources.append((LLM_RATER, llm_path, llm_path.stat().st_mtime_ns))
+    for annotator, path in _human_files(metric, run).items():
+        sources.append((annotator, path, path.stat().st_mtime_ns))
+    return _build_matrix(metric, run, tuple(sources))
+
+
+def label_counts(codes: np.ndarray, n_labels: int) -> np.ndarray:
+    """(items, raters) codes -> (items, n_labels) count of raters per label."""
+    n_items = codes.shape[0]
+    rows, cols = np.nonzero(codes != MISSING)
+    flat = rows * n_labels + codes[rows, cols]
+    return np.bincount(flat, minlength=n_items * n_labels).reshape(n_items, n_labels)
+
+
+def fleiss_kappa(counts: np.ndarray) -> float:
+    """Fleiss' kappa from (items, labels) rater counts. Items may have
+    different numbers of raters: per-item agreement is computed over that
+    item's own rater pairs, and items with fewer than 2 raters are ignored."""
+    counts = counts[counts.sum(axis=1) >= 2].astype(float)
+    if not len(counts):
+        return float("nan")
+    m = counts.sum(axis=1)
+    p_item = (counts * (counts - 1)).sum(axis=1) / (m * (m - 1))
+    p_label = counts.sum(axis=0) / m.sum()
+    p_e = float((p_label**2).sum())
+    if p_e == 1:
+        return float("nan")
+    return (float(p_item.mean()) - p_e) / (1 - p_e)
+
+
+def _distance_matrix(n_c: np.ndarray, level: str, values: np.ndarray | None) -> np.ndarray:
+    k = len(n_c)
+    i, j = np.indices((k, k))
+    if level == "nominal":
+        return (i != j).astype(float)
+    if level == "ordinal":
+        cum = np.concatenate([[0.0], np.cumsum(n_c)])
+        lo, hi = np.minimum(i, j), np.maximum(i, j)
+        return (cum[hi + 1] - cum[lo] - (n_c[i] + n_c[j]) / 2) ** 2
+    if level == "interval":
+        v = np.arange(k, dtype=float) if values is None else values.astype(float)
+        return (v[i] - v[j]) ** 2
+    raise ValueError(f"unknown level: {level}")
+
+
+def krippendorff_alpha(
+    counts: np.ndarray, level: str = "nominal", values: list | None = None
+) -> float:
+    """Krippendorff's alpha from (items, labels) rater counts. ``level`` is
+    'nominal', 'ordinal' (labels in rank order), or 'interval' (``values``
+    gives each label's numeric value; defaults to its rank)."""
+    counts = counts[counts.sum(axis=1) >= 2].astype(float)
+    if not len(counts):
+        return float("nan")
+    m = counts.sum(axis=1)
+    # Coincidence matrix: every ordered pair of labels within an item,
+    # weighted 1/(m_u - 1) so each item contributes m_u pairable values.
+    weighted = counts / (m - 1)[:, None]
+    coincidence = weighted.T @ counts - np.diag(weighted.sum(axis=0))
+    n_c = coincidence.sum(axis=1)
+    n = n_c.sum()
+    delta = _distance_matrix(n_c, level, None if values is None else np.asarray(values))
+    d_expected = (np.outer(n_c, n_c) * delta).sum()
+    if d_expected == 0:
+        return float("nan")
+    return 1 - (n - 1) * (coincidence * delta).sum() / d_expected
+
+
+def channel_agreement(channel: Channel, rater_mask: np.ndarray | None = None) -> dict:
+    codes = channel.codes if rater_mask is None else channel.codes[:, rater_mask]
+    counts = label_counts(codes, len(channel.labels))
+    n_raters_per_item = counts.sum(axis=1)
+    result = {
+        "n_items": int((n_raters_per_item >= 2).sum()),
+        "mean_raters_per_item": float(n_raters_per_item[n_raters_per_item >= 2].mean())
+        if (n_raters_per_item >= 2).any()
+        else 0.0,
+        "fleiss_kappa": fleiss_kappa(counts),
+        "alpha_nominal": krippendorff_alpha(counts, "nominal"),
+    }
+    if channel.level == "ordinal":
+        result["alpha_ordinal"] = krippendorff_alpha(counts, "ordinal")
+    return result
+
+
+def report(metric: str, run: str, include_llm: bool = True) -> None:
+    matrix = load_matrix(metric, run, include_llm)
+    humans = [r for r in matrix.raters if r != LLM_RATER]
+    print(f"=== {metric} / {run}: raters = {', '.join(matrix.raters) or '(none)'} ===")
+    if not humans:
+        print("  no human annotation files found")
+        return
+
+    human_mask = np.array([r != LLM_RATER for r in matrix.raters])
+    scopes = [("humans only", human_mask)]
+    if include_llm:
+        scopes.append(("humans + llm", None))
+    for name, channel in matrix.channels.items():
+        print(f"\n  {name} ({channel.level})")
+        for scope, mask in scopes:
+            stats = channel_agreement(channel, mask)
+            line = (
+                f"    {scope:<13} n={stats['n_items']:<6} "
+                f"raters/item={stats['mean_raters_per_item']:.2f}  "
+                f"fleiss={stats['fleiss_kappa']:.3f}  alpha_nominal={stats['alpha_nominal']:.3f}"
+            )
+            if "alpha_ordinal" in stats:
+                line += f"  alpha_ordinal={stats['alpha_ordinal']:.3f}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("run", help="run name, e.g. baseline__baseline_1785814420")
+    parser.add_argument(
+        "--metric", choices=sorted(_CHANNEL_SPECS), default="decomposition_quality",
+    )
+    parser.add_argument(
+        "--no-llm", action="store_true", help="leave the LLM judge out of the rater set",
+    )
+    args = parser.parse_args()
+    report(args.metric, args.run, include_llm=not args.no_llm)
+
+
+if __name__ == "__main__":
+    main()
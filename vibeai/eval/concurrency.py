@@ -1,10 +1,16 @@
 """Bounded concurrency helper for running many async LLM calls at once."""
 
 import asyncio
-from collections.abc import AsyncIterator, Awaitable, Coroutine
-from typing import TypeVar
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Coroutine, Iterable
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+from vibeai.tracing import LatencyHistogram, span
 
 T = TypeVar("T")
+R = TypeVar("R")
 
 
 async def gather_bounded(
@@ -21,8 +27,12 @@ async def gather_bounded(
     semaphore = asyncio.Semaphore(limit)
 
     async def _run(coro: Awaitable[T]) -> T:
-        async with semaphore:
+        with span("queue_wait"):
+            await semaphore.acquire()
+        try:
             return await coro
+        finally:
+            semaphore.release()
 
     return await asyncio.gather(
         *(_run(c) for c in coros), return_exceptions=return_exceptions
@@ -43,11 +53,216 @@ async def gather_bounded_as_completed(
     semaphore = asyncio.Semaphore(limit)
 
     async def _run(index: int, coro: Awaitable[T]) -> tuple[int, T | BaseException]:
-        async with semaphore:
-            try:
-                return index, await coro
-            except BaseException as exc:
-                return index, exc
+        with span("queue_wait"):
+            await semaphore.acquire()
+        try:
+            return index, await coro
+        except BaseException as exc:
+            return index, exc
+        finally:
+            semaphore.release()
 
     for task in asyncio.as_completed([_run(i, c) for i, c in enumerate(coros)]):
         yield await task
+
+
+async def map_bounded_as_completed(
+    fn: Callable[[T], Awaitable[R]],
+    items: Iterable[T] | AsyncIterable[T],
+    limit: int = 10,
+) -> AsyncIterator[tuple[T, R | BaseException]]:
+    """Streaming counterpart of `gather_bounded_as_completed`: calls
+    `fn(item)` for items pulled lazily from `items` (a plain or async
+    iterable - e.g. a directory watcher that never ends), with at most
+    `limit` in flight, and yields (item, outcome) pairs as they finish.
+
+    Only `limit` items and their tasks exist at any time, so memory doesn't
+    grow with the size of the source. Waiting on a slow source and on
+    in-flight work happens together, so results aren't held back while the
+    next item is pending. Exceptions are yielded in place of a result, as in
+    `gather_bounded_as_completed`. Leaving the loop early cancels whatever
+    is still in flight.
+
+    This is `map_speculative_as_completed` with no deadline and no
+    speculation.
+    """
+    async with aclosing(map_speculative_as_completed(fn, items, limit)) as outcomes:
+        async for pair in outcomes:
+            yield pair
+
+
+@dataclass
+class Straggler(Generic[T]):
+    item: T
+    seconds: float
+    median_seconds: float | None  # of the items completed before it; None if too few
+    copies: int  # 2 if it was speculatively re-run
+    outcome: str  # "ok", "copy won", "failed" or "timed out"
+
+
+@dataclass
+class StragglerReport:
+    """What ``map_speculative_as_completed`` saw of a batch's stragglers:
+    items that ran over ``factor`` times the median item, were re-run or
+    timed out."""
+
+    factor: float = 3.0
+    stragglers: list[Straggler] = field(default_factory=list)
+    speculated: int = 0
+    copies_won: int = 0
+    timed_out: int = 0
+
+    def summary(self) -> str:
+        lines = [
+            f"Stragglers (> {self.factor:g}x median): {len(self.stragglers)}, "
+            f"{self.speculated} re-run ({self.copies_won} won by the copy), {self.timed_out} timed out"
+        ]
+        for s in sorted(self.stragglers, key=lambda s: -s.seconds):
+            name = getattr(s.item, "name", s.item)
+            ratio = f" ({s.seconds / s.median_seconds:.1f}x median)" if s.median_seconds else ""
+            lines.append(f"  {name}: {s.seconds:.1f}s{ratio}, {s.outcome}")
+        return "\n".join(lines)
+
+
+@dataclass
+class _Run(Generic[T]):
+    item: T
+    start: float
+    tasks: list[asyncio.Task] = field(default_factory=list)  # the original, then any copy
+
+
+async def map_speculative_as_completed(
+    fn: Callable[[T], Awaitable[R]],
+    items: Iterable[T] | AsyncIterable[T],
+    limit: int = 10,
+    deadline: float | None = None,
+    speculate: bool = False,
+    report: StragglerReport | None = None,
+    min_samples: int = 5,
+) -> AsyncIterator[tuple[T, R | BaseException]]:
+    """`map_bounded_as_completed`, aware of stragglers: the few items that
+    run 5-10x the median and hold up the end of a batch while the rest of
+    its capacity sits idle.
+
+    - ``deadline``: an item still running this many seconds after it
+      started is cancelled, and yields a TimeoutError in place of a result.
+    - ``speculate``: while fewer than `limit` calls are in flight (the
+      source has run dry or is slow), the longest-running item past
+      ``report.factor`` times the median gets a second `fn(item)`. The
+      first of the two to succeed wins, and the other is cancelled. `fn`
+      must be safe to run twice; ``evaluate_image`` is, and a copy gets the
+      stages the original already finished from the LLM cache.
+    - ``report`` collects which items were stragglers.
+
+    The median is over the items completed so far, once there are
+    ``min_samples`` of them; before that nothing is speculated. A copy
+    counts towards `limit` like any other call.
+    """
+    report = report if report is not None else StragglerReport()
+    # A plain iterable is pulled synchronously; an async one through a
+    # pending anext() task that's waited on alongside the work.
+    source = aiter(items) if isinstance(items, AsyncIterable) else None
+    sync_source = iter(items) if source is None else None
+    durations = LatencyHistogram()
+
+    async def _run(item: T) -> R | BaseException:
+        try:
+            return await fn(item)
+        except BaseException as exc:
+            return exc
+
+    runs: dict[asyncio.Task, _Run] = {}  # every in-flight task, original or copy
+    next_item: asyncio.Task | None = None
+    exhausted = False
+
+    def launch(run: _Run) -> None:
+        task = asyncio.ensure_future(_run(run.item))
+        run.tasks.append(task)
+        runs[task] = run
+
+    def live() -> list[_Run]:
+        return list({id(r): r for r in runs.values()}.values())
+
+    def median() -> float | None:
+        return durations.percentile(50) / 1e6 if durations.count >= min_samples else None
+
+    async def finish(run: _Run, now: float, outcome: str) -> None:
+        for task in run.tasks:
+            runs.pop(task, None)
+            task.cancel()
+        await asyncio.gather(*run.tasks, return_exceptions=True)
+        seconds, typical = now - run.start, median()
+        if outcome in ("ok", "copy won"):
+            durations.record(int(seconds * 1e6))
+        if len(run.tasks) > 1 or outcome == "timed out" or (typical and seconds > report.factor * typical):
+            report.stragglers.append(Straggler(run.item, seconds, typical, len(run.tasks), outcome))
+
+    def next_timeout(now: float) -> float | None:
+        """Seconds until the next deadline or speculation is due."""
+        due = [r.start + deadline - now for r in live()] if deadline is not None else []
+        typical = median()
+        if speculate and typical is not None and len(runs) < limit:
+            due += [r.start + report.factor * typical - now for r in live() if len(r.tasks) == 1]
+        return max(min(due), 0) if due else None
+
+    try:
+        while True:
+            while sync_source is not None and not exhausted and len(runs) < limit:
+                try:
+                    item = next(sync_source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                launch(_Run(item, time.monotonic()))
+            if source is not None and next_item is None and not exhausted and len(runs) < limit:
+                next_item = asyncio.ensure_future(anext(source))
+
+            now, typical = time.monotonic(), median()
+            if speculate and typical is not None:
+                for run in sorted((r for r in live() if len(r.tasks) == 1), key=lambda r: r.start):
+                    if len(runs) >= limit or now - run.start <= report.factor * typical:
+                        break
+                    launch(run)
+                    report.speculated += 1
+
+            waiting = set(runs) | ({next_item} if next_item is not None else set())
+            if not waiting:
+                return
+            done, _ = await asyncio.wait(
+                waiting, timeout=next_timeout(now), return_when=asyncio.FIRST_COMPLETED
+            )
+            now = time.monotonic()
+
+            if next_item in done:
+                try:
+                    launch(_Run(next_item.result(), now))
+                except StopAsyncIteration:
+                    exhausted = True
+                next_item = None
+            for task in done & runs.keys():
+                run = runs.get(task)
+                if run is None:  # both copies finished at once; the other was handled
+                    continue
+                outcome = task.result()
+                if isinstance(outcome, BaseException):
+                    if any(not t.done() for t in run.tasks):
+                        runs.pop(task)  # the other copy may still succeed
+                        continue
+                    outcome = run.tasks[0].result()  # both failed: report the original's error
+                    await finish(run, now, "failed")
+                else:
+                    copy_won = task is not run.tasks[0]
+                    report.copies_won += copy_won
+                    await finish(run, now, "copy won" if copy_won else "ok")
+                yield run.item, outcome
+            if deadline is not None:
+                for run in live():
+                    if now - run.start >= deadline:
+                        report.timed_out += 1
+                        await finish(run, now, "timed out")
+                        yield run.item, TimeoutError(f"Still running after the {deadline:g}s deadline")
+    finally:
+        pending = [*runs, *([next_item] if next_item is not None else [])]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -1,19 +1,241 @@
-"""Golden dataset loader: currently just the preprocessed image pool."""
+"""Golden dataset loader over the preprocessed image pool.
 
+preprocess.py writes a manifest next to the processed images, recording
+each output's dimensions, size, content hash and near-duplicate cluster.
+``load_image_paths`` reads that instead of listing the directory, so it
+doesn't stat or open anything per image. It can also filter on that
+metadata, stratify a sample, and pick a stable dev/test split. Without a
+manifest (a hand-assembled ``--image-dir``) it falls back to a directory
+scan, which supports plain sampling only.
+
+The manifest is trusted as-is. After deleting processed files by hand,
+rerun preprocess.py, which reprocesses any source whose output is missing.
+"""
+
+import asyncio
+import json
+import os
 import random
+import time
+from collections.abc import AsyncIterator, Callable, Hashable
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 DATA_DIR = Path("data/main_processed")
 VALID_EXTS = {".jpg", ".jpeg", ".png", ".webp"}
+# Written by preprocess.py into the processed directory: source file name ->
+# {"output": <processed file name>, "width", "height", "bytes",
+# "output_sha256", "cluster": <representative output name of its
+# near-duplicate cluster>, ...}.
+MANIFEST_NAME = "manifest.json"
+# Fractions of the pool per split; see split_of.
+DEFAULT_SPLITS = {"dev": 0.2, "test": 0.8}
+
+
+@dataclass(frozen=True, slots=True)
+class ImageRecord:
+    name: str  # processed file name
+    data_dir: Path
+    source: str  # original file name under data/main
+    width: int | None  # None for entries preprocess.py hasn't backfilled yet
+    height: int | None
+    bytes: int | None
+    sha256: str | None  # of the processed file
+    cluster: str  # output name of its near-duplicate cluster's representative
+    # Position in [0, 1) from the smallest sha256 in its cluster; see split_of.
+    split_point: float | None
+
+    @property
+    def path(self) -> Path:
+        # Built on demand: constructing (and comparing) 100k Paths up front
+        # costs seconds, most of it for images that then aren't sampled.
+        return self.data_dir / self.name
+
+    @property
+    def orientation(self) -> str:
+        if not self.width or not self.height:
+            return "unknown"
+        if self.width == self.height:
+            return "square"
+        return "landscape" if self.width > self.height else "portrait"
+
+
+@lru_cache(maxsize=4)
+def _load_index(manifest_path: Path, mtime_ns: int) -> tuple[ImageRecord, ...]:
+    """``mtime_ns`` is only there to key the cache."""
+    entries = json.loads(manifest_path.read_text())
+    cluster_of = {e["output"]: e.get("cluster", e["output"]) for e in entries.values()}
+    split_keys: dict[str, str] = {}
+    for e in entries.values():
+        if "output_sha256" in e:
+            rep = cluster_of[e["output"]]
+            split_keys[rep] = min(split_keys.get(rep, e["output_sha256"]), e["output_sha256"])
+    split_points = {rep: int(key[:15], 16) / 16**15 for rep, key in split_keys.items()}
+    data_dir = manifest_path.parent
+    records = [
+        ImageRecord(
+            name=e["output"],
+            data_dir=data_dir,
+            source=source,
+            width=e.get("width"),
+            height=e.get("height"),
+            bytes=e.get("bytes"),
+            sha256=e.get("output_sha256"),
+            cluster=cluster_of[e["output"]],
+            split_point=split_points.get(cluster_of[e["output"]]),
+        )
+        for source, e in entries.items()
+    ]
+    return tuple(sorted(records, key=lambda r: r.name))
+
+
+def load_index(data_dir: Path | None = None) -> tuple[ImageRecord, ...]:
+    """Every processed image's manifest record, sorted by name. Cached
+    until the manifest changes; raises FileNotFoundError without one."""
+    manifest_path = (data_dir or DATA_DIR) / MANIFEST_NAME
+    try:
+        mtime_ns = manifest_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"{manifest_path} not found - run preprocess.py to build the dataset manifest"
+        ) from None
+    return _load_index(manifest_path, mtime_ns)
+
+
+def split_of(record: ImageRecord, splits: dict[str, float] | None = None) -> str:
+    """Deterministic split assignment from the record's content hash, so it
+    doesn't move when images are added, renamed, or sampled differently.
+    The hash is shared across a near-duplicate cluster, so a scene never
+    straddles dev and test. An image only changes split if a new
+    near-duplicate with a smaller hash joins its cluster."""
+    splits = splits or DEFAULT_SPLITS
+    if record.split_point is None:
+        raise ValueError(f"{record.path} has no content hash yet - rerun preprocess.py")
+    position = record.split_point * sum(splits.values())
+    for name, fraction in splits.items():
+        if position < fraction:
+            return name
+        position -= fraction
+    return name
+
+
+def _one_per_cluster(records: list[ImageRecord]) -> list[ImageRecord]:
+    """Keep each near-duplicate cluster's representative, or, if that's been
+    filtered out, its first remaining member. ``records`` must be sorted."""
+    first: dict[str, ImageRecord] = {}
+    for record in records:
+        first.setdefault(record.cluster, record)
+    return sorted(first.values(), key=lambda r: r.name)
+
+
+def _stratified_sample(
+    records: list[ImageRecord], n: int, key: Callable[[ImageRecord], Hashable], rng: random.Random
+) -> list[ImageRecord]:
+    """n records with each stratum represented in proportion to its size
+    (largest-remainder rounding)."""
+    strata: dict[Hashable, list[ImageRecord]] = {}
+    for record in records:
+        strata.setdefault(key(record), []).append(record)
+    quotas = {s: n * len(members) / len(records) for s, members in strata.items()}
+    counts = {s: int(q) for s, q in quotas.items()}
+    by_remainder = sorted(strata, key=lambda s: (-(quotas[s] - counts[s]), str(s)))
+    for s in by_remainder[: n - sum(counts.values())]:
+        counts[s] += 1
+    sample = []
+    for s in sorted(strata, key=str):
+        sample.extend(rng.sample(strata[s], counts[s]))
+    return sorted(sample, key=lambda r: r.name)
 
 
 def load_image_paths(
-    n: int | None = None, seed: int = 0, data_dir: Path | None = None
+    n: int | None = None,
+    seed: int = 0,
+    data_dir: Path | None = None,
+    one_per_cluster: bool = False,
+    where: Callable[[ImageRecord], bool] | None = None,
+    stratify_by: str | Callable[[ImageRecord], Hashable] | None = None,
+    split: str | None = None,
+    splits: dict[str, float] | None = None,
 ) -> list[Path]:
+    """Image paths to evaluate, optionally ``n`` of them sampled with ``seed``.
+
+    - ``one_per_cluster`` collapses near-duplicates (burst shots, re-exports)
+      to one image each before sampling; see ``vibeai.eval.near_dup``.
+    - ``where`` keeps only records it returns True for.
+    - ``split`` keeps one split of ``splits`` (default DEFAULT_SPLITS); see
+      ``split_of``.
+    - ``stratify_by`` (an ImageRecord attribute name such as "orientation",
+      or a function of the record) samples each group in proportion to its
+      share of the pool.
+
+    Unfiltered, unstratified sampling picks the same images whether the
+    pool was listed from the manifest or by a directory scan.
+    """
+    data_dir = data_dir or DATA_DIR
+    if not (data_dir / MANIFEST_NAME).exists():
+        if one_per_cluster or where or stratify_by or split:
+            load_index(data_dir)  # raises with a pointer to preprocess.py
+        paths = sorted(
+            p for p in data_dir.iterdir() if p.is_file() and p.suffix.lower() in VALID_EXTS
+        )
+        if n is not None and n < len(paths):
+            paths = random.Random(seed).sample(paths, n)
+        return paths
+
+    records = list(load_index(data_dir))
+    if split is not None:
+        splits = splits or DEFAULT_SPLITS
+        if split not in splits:
+            raise ValueError(f"unknown split {split!r}; expected one of {sorted(splits)}")
+        records = [r for r in records if split_of(r, splits) == split]
+    if where is not None:
+        records = [r for r in records if where(r)]
+    if one_per_cluster:
+        records = _one_per_cluster(records)
+    if n is not None and n < len(records):
+        rng = random.Random(seed)
+        if stratify_by is None:
+            records = rng.sample(records, n)
+        else:
+            key = stratify_by if callable(stratify_by) else (lambda r: getattr(r, stratify_by))
+            records = _stratified_sample(records, n, key, rng)
+    return [r.path for r in records]
+
+
+async def watch_image_paths(
+    data_dir: Path | None = None,
+    poll_seconds: float = 2.0,
+    settle_seconds: float = 1.0,
+    idle_timeout: float | None = None,
+) -> AsyncIterator[Path]:
+    """Image files in ``data_dir`` as they turn up: what's already there
+    first (in directory order, not sorted), then new arrivals, e.g. while
+    preprocess.py is still filling the pool. Polls every ``poll_seconds``.
+    A file is only yielded once it's gone ``settle_seconds`` without being
+    modified, so a half-written JPEG isn't picked up. Stops after
+    ``idle_timeout`` seconds with nothing new (None: never).
+
+    The directory is scanned lazily and nothing is sorted. The set of names
+    already yielded is the only state that grows with the directory.
+    Intended as the source for ``vibeai.pipeline.evaluate.evaluate_images``.
+    """
     data_dir = data_dir or DATA_DIR
-    paths = sorted(
-        p for p in data_dir.iterdir() if p.is_file() and p.suffix.lower() in VALID_EXTS
-    )
-    if n is not None and n < len(paths):
-        paths = random.Random(seed).sample(paths, n)
-    return paths
+    seen: set[str] = set()
+    last_new = time.monotonic()
+    while True:
+        found_new = False
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                if entry.name in seen or os.path.splitext(entry.name)[1].lower() not in VALID_EXTS:
+                    continue
+                if not entry.is_file() or time.time() - entry.stat().st_mtime < settle_seconds:
+                    continue  # not a file, or still being written - next poll
+                seen.add(entry.name)
+                found_new = True
+                yield data_dir / entry.name
+        if found_new:
+            last_new = time.monotonic()
+        elif idle_timeout is not None and time.monotonic() - last_new >= idle_timeout:
+            return
+        await asyncio.sleep(poll_seconds)
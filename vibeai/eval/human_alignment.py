@@ -7,54 +7,41 @@ Pairs records by ``image_path`` (the same key used in
 ``results/<metric>/human/<run>__<annotator>.json``), so only images a given
 human actually annotated are scored.
 
+Every kappa is reported with a percentile bootstrap CI (``--n-bootstrap``,
+computed in batches by ``vibeai.eval.kappa``). Atom-level CIs resample whole
+images rather than individual atoms, since atoms of one image aren't
+independent. ``--n-permutations`` adds a permutation-test p-value.
+
 Usage:
     python -m vibeai.eval.human_alignment baseline__baseline_1785814420 --annotator mingeon
     python -m vibeai.eval.human_alignment <run> --annotator alice --annotator bob
     python -m vibeai.eval.human_alignment baseline__v1_1786409728 --metric plausibility --annotator mingeon
+    python -m vibeai.eval.human_alignment <run> --annotator alice --n-bootstrap 5000 --n-permutations 2000
 """
 
 import argparse
 import json
+import math
 from pathlib import Path
 
+from vibeai.eval.kappa import DEFAULT_N_RESAMPLES, KappaEstimate, estimate_kappa, kappa
+
 REPO_ROOT = Path(__file__).resolve().parents[2]
 RESULTS_ROOT = REPO_ROOT / "results"
 
 
-def _confusion(y1: list, y2: list, labels: list) -> list[list[int]]:
-    index = {label: i for i, label in enumerate(labels)}
-    matrix = [[0] * len(labels) for _ in labels]
-    for a, b in zip(y1, y2):
-        matrix[index[a]][index[b]] += 1
-    return matrix
-
-
 def cohen_kappa(y1: list, y2: list, labels: list, weights: str | None = None) -> float:
     """Cohen's kappa; weights is None (unweighted), 'linear', or 'quadratic'."""
-    n = len(labels)
-    confusion = _confusion(y1, y2, labels)
-    total = sum(sum(row) for row in confusion)
-    if total == 0:
-        return float("nan")
-
-    row_sums = [sum(row) for row in confusion]
-    col_sums = [sum(confusion[i][j] for i in range(n)) for j in range(n)]
-    expected = [[row_sums[i] * col_sums[j] / total for j in range(n)] for i in range(n)]
-
-    if weights is None:
-        w = [[0.0 if i == j else 1.0 for j in range(n)] for i in range(n)]
-    elif weights == "linear":
-        w = [[abs(i - j) / (n - 1) for j in range(n)] for i in range(n)]
-    elif weights == "quadratic":
-        w = [[((i - j) ** 2) / ((n - 1) ** 2) for j in range(n)] for i in range(n)]
-    else:
-        raise ValueError(f"unknown weights: {weights}")
+    return kappa(y1, y2, labels, weights)
+
 
-    observed = sum(w[i][j] * confusion[i][j] for i in range(n) for j in range(n))
-    expected_val = sum(w[i][j] * expected[i][j] for i in range(n) for j in range(n))
-    if expected_val == 0:
-        return float("nan")
-    return 1 - observed / expected_val
+def _fmt_estimate(est: KappaEstimate) -> str:
+    out = f"{est.kappa:.3f}"
+    if not math.isnan(est.ci_low):
+        out += f" [{est.confidence:.0%} CI {est.ci_low:.3f}, {est.ci_high:.3f}]"
+    if not math.isnan(est.p_value):
+        out += f" (p={est.p_value:.4f})"
+    return out
 
 
 def load_llm(metric: str, run: str) -> dict[str, dict]:
@@ -77,7 +64,12 @@ def load_human(metric: str, run: str, annotator: str) -> dict[str, dict]:
     return json.loads(src.read_text())
 
 
-def align_and_report_plausibility(run: str, annotators: list[str]) -> None:
+def align_and_report_plausibility(
+    run: str,
+    annotators: list[str],
+    n_resamples: int = DEFAULT_N_RESAMPLES,
+    n_permutations: int = 0,
+) -> None:
     """Atom-level plausible/implausible agreement. The LLM judge's per-atom
     ``final_verdict`` is directly comparable to the human's boolean
     ``plausible`` field."""
@@ -90,9 +82,10 @@ def align_and_report_plausibility(run: str, annotators: list[str]) -> None:
         if not shared:
             continue
 
-        verdict_llm, verdict_human = [], []
+        verdict_llm, verdict_human, verdict_images = [], [], []
         by_type_llm = {"vibe_only": [], "evidence_backed": []}
         by_type_human = {"vibe_only": [], "evidence_backed": []}
+        by_type_images = {"vibe_only": [], "evidence_backed": []}
 
         for image_path in shared:
             l_atoms = llm[image_path]["atoms"]
@@ -104,22 +97,36 @@ def align_and_report_plausibility(run: str, annotators: list[str]) -> None:
                 l_plausible = la["final_verdict"]
                 verdict_llm.append(l_plausible)
                 verdict_human.append(ha["plausible"])
+                verdict_images.append(image_path)
                 by_type_llm[ha["type"]].append(l_plausible)
                 by_type_human[ha["type"]].append(ha["plausible"])
+                by_type_images[ha["type"]].append(image_path)
 
         if verdict_llm:
             n_atoms = len(verdict_llm)
             agreement = sum(a == b for a, b in zip(verdict_llm, verdict_human)) / n_atoms
+            est = estimate_kappa(
+                verdict_llm, verdict_human, [True, False], n_resamples=n_resamples,
+                n_permutations=n_permutations, groups=verdict_images,
+            )
             print(f"  Atom plausibility (unweighted kappa, n={n_atoms} atoms): "
-                  f"{cohen_kappa(verdict_llm, verdict_human, [True, False]):.3f} "
-                  f"(raw agreement: {agreement:.3f})")
+                  f"{_fmt_estimate(est)} (raw agreement: {agreement:.3f})")
             for atom_type in by_type_llm:
                 if by_type_llm[atom_type]:
-                    kappa = cohen_kappa(by_type_llm[atom_type], by_type_human[atom_type], [True, False])
-                    print(f"    - {atom_type:<16} (n={len(by_type_llm[atom_type])}) kappa: {kappa:.3f}")
-
-
-def align_and_report(run: str, annotators: list[str]) -> None:
+                    est = estimate_kappa(
+                        by_type_llm[atom_type], by_type_human[atom_type], [True, False],
+                        n_resamples=n_resamples, n_permutations=n_permutations,
+                        groups=by_type_images[atom_type],
+                    )
+                    print(f"    - {atom_type:<16} (n={len(by_type_llm[atom_type])}) kappa: {_fmt_estimate(est)}")
+
+
+def align_and_report(
+    run: str,
+    annotators: list[str],
+    n_resamples: int = DEFAULT_N_RESAMPLES,
+    n_permutations: int = 0,
+) -> None:
     llm = load_llm("decomposition_quality", run)
 
     for annotator in annotators:
@@ -130,7 +137,7 @@ def align_and_report(run: str, annotators: list[str]) -> None:
             continue
 
         completeness_llm, completeness_human = [], []
-        atom_verdict_llm, atom_verdict_human = [], []
+        atom_verdict_llm, atom_verdict_human, atom_images = [], [], []
         criteria_llm = {k: [] for k in ["affectiveness", "atomicity", "fidelity", "evidence_preservation"]}
         criteria_human = {k: [] for k in criteria_llm}
         atom_quality_diffs = []
@@ -154,23 +161,33 @@ def align_and_report(run: str, annotators: list[str]) -> None:
             for la, ha in zip(l_atoms, h_atoms):
                 atom_verdict_llm.append(la["verdict"])
                 atom_verdict_human.append(ha["verdict"])
+                atom_images.append(image_path)
                 for k in criteria_llm:
                     criteria_llm[k].append(la["evaluation"][k])
                     criteria_human[k].append(ha["evaluation"][k])
 
         labels_1_5 = [1, 2, 3, 4, 5]
-        print(f"  Completeness        (linear-weighted kappa, n={len(shared)}): "
-              f"{cohen_kappa(completeness_llm, completeness_human, labels_1_5, 'linear'):.3f}")
+        est = estimate_kappa(
+            completeness_llm, completeness_human, labels_1_5, "linear",
+            n_resamples=n_resamples, n_permutations=n_permutations,
+        )
+        print(f"  Completeness        (linear-weighted kappa, n={len(shared)}): {_fmt_estimate(est)}")
         print(f"  Atom quality        (mean |Δ| on 0-5 scale, n={len(shared)}): "
               f"{sum(atom_quality_diffs) / len(atom_quality_diffs):.3f}")
 
         if atom_verdict_llm:
             n_atoms = len(atom_verdict_llm)
-            print(f"  Atom verdict Good/Bad (unweighted kappa, n={n_atoms} atoms): "
-                  f"{cohen_kappa(atom_verdict_llm, atom_verdict_human, ['Good', 'Bad']):.3f}")
+            est = estimate_kappa(
+                atom_verdict_llm, atom_verdict_human, ["Good", "Bad"], n_resamples=n_resamples,
+                n_permutations=n_permutations, groups=atom_images,
+            )
+            print(f"  Atom verdict Good/Bad (unweighted kappa, n={n_atoms} atoms): {_fmt_estimate(est)}")
             for k in criteria_llm:
-                kappa = cohen_kappa(criteria_llm[k], criteria_human[k], [True, False])
-                print(f"    - {k:<22} kappa: {kappa:.3f}")
+                est = estimate_kappa(
+                    criteria_llm[k], criteria_human[k], [True, False], n_resamples=n_resamples,
+                    n_permutations=n_permutations, groups=atom_images,
+                )
+                print(f"    - {k:<22} kappa: {_fmt_estimate(est)}")
 
 
 def main():
@@ -184,11 +201,19 @@ def main():
         "--annotator", action="append", required=True,
         help="human annotator id (repeatable for multiple annotators)",
     )
+    parser.add_argument(
+        "--n-bootstrap", type=int, default=DEFAULT_N_RESAMPLES,
+        help="bootstrap resamples per kappa CI (0 disables CIs)",
+    )
+    parser.add_argument(
+        "--n-permutations", type=int, default=0,
+        help="permutation-test resamples per kappa (0, the default, skips the p-value)",
+    )
     args = parser.parse_args()
     if args.metric == "plausibility":
-        align_and_report_plausibility(args.run, args.annotator)
+        align_and_report_plausibility(args.run, args.annotator, args.n_bootstrap, args.n_permutations)
     else:
-        align_and_report(args.run, args.annotator)
+        align_and_report(args.run, args.annotator, args.n_bootstrap, args.n_permutations)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,278 @@
+"""Experiment harness: token cost and latency vs. score drift per image policy.
+
+Runs one pipeline stage over the same images under several
+``vibeai.pipeline.image_policy`` policies and reports per policy:
+
+- predicted image tokens per call, and measured input/total tokens per
+  call of that stage (from the usage log);
+- p50/p95 latency;
+- mean score, and drift against the first policy listed (the baseline):
+  mean |score delta| and pass/fail agreement.
+
+``--stage judge`` (plausibility only - the decomposition-quality judge
+never sees the image) builds each image's test case once with default
+settings and re-judges it under every policy, so drift isolates the
+judge's view of the image. ``--stage represent`` reruns the whole
+pipeline per policy, since a different representation changes everything
+downstream; latency is then per image end to end.
+
+Cached calls are free and instant, so they don't measure anything. By
+default only calls that actually reached the API count towards token
+numbers. ``--cold`` gives every policy its own empty LLM cache, so every
+call is real. Listing a policy twice (``full full``) then measures the
+noise floor: how much scores drift between two identical runs.
+
+Usage:
+    python -m vibeai.eval.image_policy_experiment --metric plausibility --stage judge \\
+        --policies full tiles2 tiles1 low --n-images 30
+    python -m vibeai.eval.image_policy_experiment --metric decomposition_quality \\
+        --stage represent --policies full full tiles2 --cold
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import tempfile
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from vibeai.eval.concurrency import gather_bounded_as_completed
+from vibeai.eval.dataset import load_image_paths
+from vibeai.eval.test_cases import DecompositionTestCase
+from vibeai.llm import client
+from vibeai.llm.usage_log import USAGE_LOG_PATH, is_call
+from vibeai.metrics.base import Metric
+from vibeai.metrics.decomposition_quality import DecompositionQualityMetric
+from vibeai.metrics.plausibility import PlausibilityMetric
+from vibeai.pipeline.evaluate import evaluate_image
+from vibeai.pipeline.image_policy import POLICIES, ImagePolicy, estimate_image_tokens, load_image
+
+EXPERIMENTS_DIR = Path("results/_experiments/image_policy")
+# Pipeline stages whose image policy can vary; each matches its LLM call_type.
+STAGES = ("represent", "judge")
+
+
+@dataclass
+class PolicyOutcome:
+    label: str
+    policy: dict
+    scores: dict[str, float] = field(default_factory=dict)
+    passed: dict[str, bool] = field(default_factory=dict)
+    latencies: list[float] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+    predicted_image_tokens: list[int] = field(default_factory=list)
+    calls: list[dict] = field(default_factory=list)  # usage-log records for the stage
+
+
+def _make_metric(metric_name: str, policy: ImagePolicy | None = None) -> Metric:
+    if metric_name == "plausibility":
+        return PlausibilityMetric() if policy is None else PlausibilityMetric(image_policy=policy)
+    return DecompositionQualityMetric()
+
+
+def _predicted_tokens(image_path: Path, policy: ImagePolicy) -> int:
+    data, _ = load_image(image_path, policy)
+    with Image.open(io.BytesIO(data)) as img:
+        return estimate_image_tokens(*img.size, detail=policy.detail)
+
+
+def _log_offset() -> int:
+    return USAGE_LOG_PATH.stat().st_size if USAGE_LOG_PATH.exists() else 0
+
+
+def _calls_since(offset: int, call_type: str) -> list[dict]:
+    if not USAGE_LOG_PATH.exists():
+        return []
+    with USAGE_LOG_PATH.open("rb") as f:
+        f.seek(offset)
+        records = [json.loads(line) for line in f if line.strip()]
+    return [r for r in records if r["call_type"] == call_type and is_call(r)]
+
+
+async def _build_test_cases(
+    images: list[Path], metric_name: str, concurrency: int
+) -> dict[Path, DecompositionTestCase]:
+    """Baseline (representation, atoms) per image for the judge stage."""
+    metric = _make_metric(metric_name)
+    coros = [evaluate_image(path, metric) for path in images]
+    test_cases = {}
+    async for index, outcome in gather_bounded_as_completed(coros, limit=concurrency):
+        if isinstance(outcome, BaseException):
+            print(f"[skip] {images[index].name}: {type(outcome).__name__}: {outcome}")
+            continue
+        test_cases[images[index]] = outcome[0]
+    return test_cases
+
+
+async def _run_policy(
+    label: str,
+    policy: ImagePolicy,
+    metric_name: str,
+    stage: str,
+    images: list[Path],
+    test_cases: dict[Path, DecompositionTestCase],
+    concurrency: int,
+) -> PolicyOutcome:
+    outcome = PolicyOutcome(label=label, policy=asdict(policy))
+    if stage == "judge":
+        metric = _make_metric(metric_name, policy)
+        images = [path for path in images if path in test_cases]
+
+        async def run(path: Path):
+            return await metric.measure_async(test_cases[path])
+    else:
+        metric = _make_metric(metric_name)
+
+        async def run(path: Path):
+            _, result = await evaluate_image(path, metric, representation_image_policy=policy)
+            return result
+
+    async def timed(path: Path):
+        start = time.perf_counter()
+        result = await run(path)
+        return result, time.perf_counter() - start
+
+    offset = _log_offset()
+    coros = [timed(path) for path in images]
+    async for index, result in gather_bounded_as_completed(coros, limit=concurrency):
+        name = images[index].name
+        if isinstance(result, BaseException):
+            outcome.errors[name] = f"{type(result).__name__}: {result}"
+            continue
+        metric_result, latency = result
+        outcome.scores[name] = metric_result.score
+        outcome.passed[name] = metric.is_successful(metric_result)
+        outcome.latencies.append(latency)
+    outcome.calls = _calls_since(offset, call_type=stage)
+    outcome.predicted_image_tokens = [_predicted_tokens(path, policy) for path in images]
+    return outcome
+
+
+def _summarize(outcome: PolicyOutcome, baseline: PolicyOutcome) -> dict:
+    shared = sorted(outcome.scores.keys() & baseline.scores.keys())
+    deltas = np.array([outcome.scores[k] - baseline.scores[k] for k in shared])
+    latencies = np.array(outcome.latencies)
+    calls = outcome.calls
+    return {
+        "policy": outcome.label,
+        "n": len(outcome.scores),
+        "errors": len(outcome.errors),
+        "predicted_image_tokens": float(np.mean(outcome.predicted_image_tokens))
+        if outcome.predicted_image_tokens
+        else None,
+        "api_calls": len(calls),
+        "input_tokens_per_call": float(np.mean([c["input_tokens"] for c in calls])) if calls else None,
+        "total_tokens_per_call": float(np.mean([c["total_tokens"] for c in calls])) if calls else None,
+        "latency_p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+        "latency_p95": float(np.percentile(latencies, 95)) if len(latencies) else None,
+        "mean_score": float(np.mean(list(outcome.scores.values()))) if outcome.scores else None,
+        "mean_abs_drift": float(np.abs(deltas).mean()) if len(deltas) else None,
+        "mean_drift": float(deltas.mean()) if len(deltas) else None,
+        "pass_agreement": float(np.mean([outcome.passed[k] == baseline.passed[k] for k in shared]))
+        if shared
+        else None,
+    }
+
+
+def _fmt(value, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def _print_table(rows: list[dict]) -> None:
+    header = (
+        f"{'policy':<10}{'n':>5}{'err':>5}{'pred img tok':>14}{'api calls':>11}"
+        f"{'in tok/call':>13}{'tot tok/call':>14}{'p50 s':>8}{'p95 s':>8}"
+        f"{'score':>8}{'|drift|':>9}{'drift':>8}{'pass agr':>10}"
+    )
+    print(header)
+    for r in rows:
+        print(
+            f"{r['policy']:<10}{r['n']:>5}{r['errors']:>5}{_fmt(r['predicted_image_tokens'], '.0f'):>14}"
+            f"{r['api_calls']:>11}{_fmt(r['input_tokens_per_call'], '.0f'):>13}"
+            f"{_fmt(r['total_tokens_per_call'], '.0f'):>14}{_fmt(r['latency_p50'], '.2f'):>8}"
+            f"{_fmt(r['latency_p95'], '.2f'):>8}{_fmt(r['mean_score'], '.3f'):>8}"
+            f"{_fmt(r['mean_abs_drift'], '.3f'):>9}{_fmt(r['mean_drift'], '+.3f'):>8}"
+            f"{_fmt(r['pass_agreement'], '.2%'):>10}"
+        )
+
+
+async def run_experiment(
+    metric_name: str,
+    stage: str,
+    policy_names: list[str],
+    images: list[Path],
+    concurrency: int = 10,
+    cold: bool = False,
+) -> dict:
+    # A cold run's caches only live as long as the run.
+    cold_caches = tempfile.TemporaryDirectory(prefix="image_policy_cache_") if cold else nullcontext()
+    default_cache_dir = client.CACHE_DIR
+    test_cases: dict[Path, DecompositionTestCase] = {}
+    outcomes: list[PolicyOutcome] = []
+    with cold_caches as cold_root:
+        try:
+            if stage == "judge":
+                test_cases = await _build_test_cases(images, metric_name, concurrency)
+            for i, name in enumerate(policy_names):
+                repeat = policy_names[: i + 1].count(name)
+                label = name if repeat == 1 else f"{name}#{repeat}"
+                if cold_root is not None:
+                    client.CACHE_DIR = Path(cold_root) / label
+                print(f"--- {label} ---")
+                outcomes.append(
+                    await _run_policy(
+                        label, POLICIES[name], metric_name, stage, images, test_cases, concurrency
+                    )
+                )
+        finally:
+            client.CACHE_DIR = default_cache_dir
+
+    rows = [_summarize(outcome, outcomes[0]) for outcome in outcomes]
+    return {
+        "metric": metric_name,
+        "stage": stage,
+        "cold": cold,
+        "images": [path.name for path in images],
+        "summary": rows,
+        "per_policy": [asdict(outcome) for outcome in outcomes],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--metric", choices=["plausibility", "decomposition_quality"], default="plausibility")
+    parser.add_argument("--stage", choices=STAGES, default="judge")
+    parser.add_argument(
+        "--policies", nargs="+", choices=sorted(POLICIES), default=["full", "tiles2", "tiles1", "low"],
+        help="first one is the drift baseline",
+    )
+    parser.add_argument("--n-images", type=int, default=20)
+    parser.add_argument("--image-dir", type=Path, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--cold", action="store_true", help="fresh LLM cache per policy: every call is real")
+    args = parser.parse_args()
+    if args.stage == "judge" and args.metric != "plausibility":
+        parser.error("--stage judge only applies to plausibility; its judge is the one that sees the image")
+
+    images = load_image_paths(n=args.n_images, seed=args.seed, data_dir=args.image_dir)
+    report = asyncio.run(
+        run_experiment(args.metric, args.stage, args.policies, images, args.concurrency, args.cold)
+    )
+    print()
+    _print_table(report["summary"])
+
+    EXPERIMENTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = EXPERIMENTS_DIR / f"{args.metric}__{args.stage}__{int(time.time())}.json"
+    path.write_text(json.dumps(report, indent=2))
+    print(f"\nSaved full results to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,7 @@ from statistics import pstdev
 from typing import Any
 
 from vibeai.metrics.base import Metric, MetricResult
+from vibeai.tracing import span
 
 RESULTS_DIR = Path("results")
 
@@ -83,6 +84,7 @@ class PromptEvalResult:
     errors: list[ImageError] = field(default_factory=list)
 
 
+@span("aggregation")
 def aggregate_prompt_results(
     metric: Metric,
     items: list[ImageResult],
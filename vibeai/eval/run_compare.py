@@ -0,0 +1,217 @@
+"""Server-side run summaries and cross-run comparison for one metric.
+
+Joins two runs' ``results/<metric>/<run>.per_image.jsonl`` files on
+``image_path`` and reports per-image score deltas, submetric deltas, and
+pass/fail agreement (raw + Cohen's kappa) - so two prompt versions can be
+compared side by side without shipping both full datasets to a browser.
+
+Each run is parsed once into an ``image_path``-indexed dict and cached by
+file mtime, and each comparison is cached by ``(run_a, run_b, mtimes)``, so
+repeat requests (e.g. from the webapp) are dict lookups rather than
+re-reads; a rewritten results file invalidates its entries automatically.
+
+Usage:
+    python -m vibeai.eval.run_compare <run_a> <run_b>
+    python -m vibeai.eval.run_compare <run_a> <run_b> --metric plausibility
+"""
+
+import argparse
+import json
+import math
+from functools import lru_cache
+from pathlib import Path
+from statistics import mean, pstdev
+
+from vibeai.eval.human_alignment import RESULTS_ROOT, cohen_kappa
+from vibeai.metrics.base import Metric, MetricResult
+from vibeai.metrics.decomposition_quality import DecompositionQualityMetric
+from vibeai.metrics.plausibility import PlausibilityMetric
+
+# Only used for extract_submetrics(), which is a pure function of
+# result.details - no model calls are made.
+METRICS: dict[str, Metric] = {
+    "decomposition_quality": DecompositionQualityMetric(),
+    "plausibility": PlausibilityMetric(),
+}
+
+
+def _per_image_path(metric: str, run: str) -> Path:
+    return RESULTS_ROOT / metric / f"{run}.per_image.jsonl"
+
+
+def _mtime_ns(path: Path) -> int:
+    if not path.exists():
+        raise FileNotFoundError(path)
+    return path.stat().st_mtime_ns
+
+
+@lru_cache(maxsize=8)
+def _load_indexed(path: Path, mtime_ns: int) -> dict[str, dict]:
+    """``mtime_ns`` is unused in the body - it's part of the cache key, so a
+    rewritten file misses the cache instead of serving stale records."""
+    records = {}
+    with path.open() as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                rec = json.loads(line)
+                records[rec["image_path"]] = rec
+    return records
+
+
+def load_run(metric: str, run: str) -> dict[str, dict]:
+    """Per-image records for ``run``, keyed by ``image_path``. Callers must
+    treat the result as read-only: it's shared across cache hits."""
+    path = _per_image_path(metric, run)
+    return _load_indexed(path, _mtime_ns(path))
+
+
+def _submetrics(metric: str, rec: dict) -> dict[str, float]:
+    result = MetricResult(score=rec["score"], details=rec.get("details", {}))
+    return METRICS[metric].extract_submetrics(result)
+
+
+def _pearson(xs: list[float], ys: list[float]) -> float:
+    if len(xs) < 2:
+        return float("nan")
+    mx, my = mean(xs), mean(ys)
+    cov = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    var_x = sum((x - mx) ** 2 for x in xs)
+    var_y = sum((y - my) ** 2 for y in ys)
+    if var_x == 0 or var_y == 0:
+        return float("nan")
+    return cov / (var_x * var_y) ** 0.5
+
+
+def _finite_or_none(x: float) -> float | None:
+    """Undefined statistics (e.g. kappa when every image passed in both runs)
+    become None rather than NaN, which isn't valid JSON."""
+    return None if math.isnan(x) else x
+
+
+def _fmt(x: float | None) -> str:
+    return "n/a" if x is None else f"{x:.3f}"
+
+
+@lru_cache(maxsize=32)
+def _summarize_cached(metric: str, run: str, mtime_ns: int) -> dict:
+    records = load_run(metric, run)
+    scores = [rec["score"] for rec in records.values()]
+    passed = [rec["passed"] for rec in records.values()]
+
+    submetric_values: dict[str, list[float]] = {}
+    for rec in records.values():
+        for key, value in _submetrics(metric, rec).items():
+            submetric_values.setdefault(key, []).append(value)
+
+    return {
+        "metric": metric,
+        "run": run,
+        "n": len(scores),
+        "mean_score": mean(scores) if scores else 0.0,
+        "std_score": pstdev(scores) if scores else 0.0,
+        "min_score": min(scores) if scores else 0.0,
+        "max_score": max(scores) if scores else 0.0,
+        "pass_rate": sum(passed) / len(passed) if passed else 0.0,
+        "submetric_means": {key: mean(vals) for key, vals in submetric_values.items()},
+    }
+
+
+def summarize_run(metric: str, run: str) -> dict:
+    """Run-level aggregates computed from the per-image file (so they also
+    exist for runs whose summary JSON predates a submetric being added)."""
+    return _summarize_cached(metric, run, _mtime_ns(_per_image_path(metric, run)))
+
+
+@lru_cache(maxsize=32)
+def _compare_cached(metric: str, run_a: str, run_b: str, mtime_a: int, mtime_b: int) -> dict:
+    a, b = load_run(metric, run_a), load_run(metric, run_b)
+    shared = sorted(a.keys() & b.keys())
+
+    rows = []
+    submetric_deltas: dict[str, list[float]] = {}
+    for image_path in shared:
+        ra, rb = a[image_path], b[image_path]
+        sub_a, sub_b = _submetrics(metric, ra), _submetrics(metric, rb)
+        sub_delta = {key: sub_b[key] - sub_a[key] for key in sub_a.keys() & sub_b.keys()}
+        for key, delta in sub_delta.items():
+            submetric_deltas.setdefault(key, []).append(delta)
+        rows.append(
+            {
+                "image_path": image_path,
+                "score_a": ra["score"],
+                "score_b": rb["score"],
+                "delta": rb["score"] - ra["score"],
+                "passed_a": ra["passed"],
+                "passed_b": rb["passed"],
+                "submetric_deltas": sub_delta,
+            }
+        )
+    rows.sort(key=lambda row: (-abs(row["delta"]), row["image_path"]))
+
+    scores_a = [row["score_a"] for row in rows]
+    scores_b = [row["score_b"] for row in rows]
+    passed_a = [row["passed_a"] for row in rows]
+    passed_b = [row["passed_b"] for row in rows]
+    deltas = [row["delta"] for row in rows]
+    n = len(rows)
+
+    return {
+        "metric": metric,
+        "run_a": run_a,
+        "run_b": run_b,
+        "n_shared": n,
+        "n_only_a": len(a.keys() - b.keys()),
+        "n_only_b": len(b.keys() - a.keys()),
+        "mean_delta": mean(deltas) if n else 0.0,
+        "mean_abs_delta": mean(abs(d) for d in deltas) if n else 0.0,
+        "n_improved": sum(d > 0 for d in deltas),
+        "n_regressed": sum(d < 0 for d in deltas),
+        "submetric_mean_deltas": {key: mean(vals) for key, vals in submetric_deltas.items()},
+        "agreement": {
+            "pass_agreement": sum(x == y for x, y in zip(passed_a, passed_b)) / n if n else 0.0,
+            "pass_kappa": _finite_or_none(cohen_kappa(passed_a, passed_b, [True, False])),
+            "score_correlation": _finite_or_none(_pearson(scores_a, scores_b)),
+        },
+        "images": rows,
+    }
+
+
+def compare_runs(metric: str, run_a: str, run_b: str) -> dict:
+    """Compare ``run_b`` against ``run_a`` (deltas are b - a) over the images
+    both runs scored. ``images`` is sorted by largest |delta| first, so the
+    most-changed images lead. Raises FileNotFoundError for an unknown run."""
+    return _compare_cached(
+        metric,
+        run_a,
+        run_b,
+        _mtime_ns(_per_image_path(metric, run_a)),
+        _mtime_ns(_per_image_path(metric, run_b)),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("run_a", help="baseline run name")
+    parser.add_argument("run_b", help="run to compare against run_a")
+    parser.add_argument("--metric", choices=sorted(METRICS), default="decomposition_quality")
+    parser.add_argument("--top", type=int, default=10, help="most-changed images to list")
+    args = parser.parse_args()
+
+    cmp = compare_runs(args.metric, args.run_a, args.run_b)
+    agreement = cmp["agreement"]
+    print(f"{args.run_a} -> {args.run_b} ({args.metric})")
+    print(f"  shared images: {cmp['n_shared']} (only in a: {cmp['n_only_a']}, only in b: {cmp['n_only_b']})")
+    print(f"  mean Δscore: {cmp['mean_delta']:+.3f} (mean |Δ|: {cmp['mean_abs_delta']:.3f}; "
+          f"improved: {cmp['n_improved']}, regressed: {cmp['n_regressed']})")
+    for key, delta in sorted(cmp["submetric_mean_deltas"].items()):
+        print(f"    - {key:<22} mean Δ: {delta:+.3f}")
+    print(f"  pass/fail agreement: {agreement['pass_agreement']:.3f} "
+          f"(kappa: {_fmt(agreement['pass_kappa'])}); "
+          f"score correlation: {_fmt(agreement['score_correlation'])}")
+    for row in cmp["images"][: args.top]:
+        print(f"    {row['delta']:+.3f}  {row['score_a']:.3f} -> {row['score_b']:.3f}  {row['image_path']}")
+
+
+if __name__ == "__main__":
+    main()
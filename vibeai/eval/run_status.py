@@ -0,0 +1,143 @@
+"""Live status for an in-progress batch run, readable from another process.
+
+A batch test otherwise only reports per-image ``print`` lines, and the
+webapp only sees a run once ``aggregate_prompt_results`` writes its final
+files. ``RunStatusReporter`` keeps running counts (completed / errored),
+throughput, token spend and an ETA, and rewrites them atomically to
+``results/_live/<run_id>.json`` at most every ``min_interval`` seconds. The
+webapp streams that file to its live dashboard over Server-Sent Events, so a
+long run can be watched (and stopped early, or re-run at a different
+concurrency) while it's still executing.
+"""
+
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from vibeai.llm import usage_log
+
+LIVE_DIR = Path("results/_live")
+
+
+@dataclass
+class RunStatus:
+    run_id: str
+    metric_name: str
+    representation_prompt_version: str
+    decomposition_prompt_version: str
+    model: str
+    concurrency: int
+    total: int
+    completed: int  # images that produced a score
+    errored: int  # images that raised instead of scoring
+    passed: int
+    tokens_used: int  # tokens of the API calls logged since the run started
+    started_at: float
+    updated_at: float
+    images_per_sec: float
+    eta_seconds: float | None
+    finished: bool = False
+
+
+class RunStatusReporter:
+    def __init__(
+        self,
+        run_id: str,
+        *,
+        metric_name: str,
+        total: int,
+        representation_prompt_version: str,
+        decomposition_prompt_version: str,
+        model: str,
+        concurrency: int,
+        live_dir: Path = LIVE_DIR,
+        min_interval: float = 1.0,
+    ):
+        self.path = live_dir / f"{run_id}.json"
+        self.min_interval = min_interval
+        # Tokens are summed from the usage log rather than taken as a
+        # difference of the budget's daily counter, which resets at midnight.
+        self._log_path = usage_log.USAGE_LOG_PATH
+        self._log_offset = self._log_path.stat().st_size if self._log_path.exists() else 0
+        self._last_write = 0.0
+        now = time.time()
+        self.status = RunStatus(
+            run_id=run_id,
+            metric_name=metric_name,
+            representation_prompt_version=representation_prompt_version,
+            decomposition_prompt_version=decomposition_prompt_version,
+            model=model,
+            concurrency=concurrency,
+            total=total,
+            completed=0,
+            errored=0,
+            passed=0,
+            tokens_used=0,
+            started_at=now,
+            updated_at=now,
+            images_per_sec=0.0,
+            eta_seconds=None,
+        )
+        self._write()
+
+    def record_result(self, passed: bool) -> None:
+        self.status.completed += 1
+        self.status.passed += int(passed)
+        self._maybe_write()
+
+    def record_error(self) -> None:
+        self.status.errored += 1
+        self._maybe_write()
+
+    def finish(self) -> None:
+        self.status.finished = True
+        self._write()
+
+    def _refresh(self) -> None:
+        s = self.status
+        s.updated_at = time.time()
+        s.tokens_used += self._new_tokens()
+        done = s.completed + s.errored
+        elapsed = s.updated_at - s.started_at
+        s.images_per_sec = done / elapsed if elapsed > 0 else 0.0
+        if s.finished:
+            s.eta_seconds = 0.0
+        elif s.images_per_sec > 0:
+            s.eta_seconds = (s.total - done) / s.images_per_sec
+        else:
+            s.eta_seconds = None
+
+    def _new_tokens(self) -> int:
+        """Tokens of the calls logged since the last look."""
+        try:
+            with self._log_path.open("rb") as f:
+                f.seek(self._log_offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return 0
+        chunk = chunk[: chunk.rfind(b"\n") + 1]  # a line still being written waits
+        self._log_offset += len(chunk)
+        records = (json.loads(line) for line in chunk.splitlines() if line.strip())
+        return sum(r["total_tokens"] for r in records if usage_log.is_call(r))
+
+    def _maybe_write(self) -> None:
+        if time.monotonic() - self._last_write >= self.min_interval:
+            self._write()
+
+    def _write(self) -> None:
+        self._refresh()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(asdict(self.status)))
+        tmp.replace(self.path)
+        self._last_write = time.monotonic()
+
+
+def read_status(path: Path) -> dict | None:
+    """Latest status written to ``path``, or None if it's missing/unreadable
+    (e.g. deleted between listing and reading)."""
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
@@ -0,0 +1,373 @@
+"""Sequential (early-stopping) comparison of prompt configurations.
+
+Comparing two prompt versions usually doesn't need the full sample: a clear
+winner shows within a few hundred images. This runner evaluates images in
+random order under every candidate configuration, so scores are paired per
+image. Several images are in flight at once, but their scores are taken in
+that random order rather than the order they finish in. It tracks the mean
+paired score difference of each challenger against the baseline (the first
+candidate) and stops a comparison as soon as one of these holds:
+
+- "better" / "worse": the confidence interval excludes 0;
+- "equivalent": the interval lies inside ±``margin``, so any difference
+  is provably negligible;
+
+or the images run out ("inconclusive"). Once every challenger is decided,
+the run stops.
+
+Checking after every image would break a fixed-n t-test's error rate (with
+enough peeks, something always looks significant). The intervals here are
+confidence sequences instead: a normal-mixture boundary (Robbins; the
+asymptotic form of Waudby-Smith et al. 2021) that holds simultaneously for
+every n. Stopping whenever it first excludes 0 keeps the false-positive
+rate at ``alpha``, split Bonferroni-style across challengers. The price is
+intervals somewhat wider than a fixed-n CI at any single n.
+
+Each candidate's scored images are saved through the usual prompt-level
+aggregator, so early-stopped runs show up in the webapp and in run_compare
+like any other.
+
+Usage:
+    python -m vibeai.eval.sequential --metric plausibility \\
+        --candidates baseline:baseline v2:direct --margin 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
+from contextlib import aclosing
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from vibeai.eval.concurrency import map_bounded_as_completed
+from vibeai.eval.dataset import load_image_paths
+from vibeai.eval.prompt_results import ImageError, ImageResult, aggregate_prompt_results
+from vibeai.metrics.base import Metric
+from vibeai.metrics.decomposition_quality import DecompositionQualityMetric
+from vibeai.metrics.plausibility import PlausibilityMetric
+from vibeai.pipeline.evaluate import evaluate_image
+
+EXPERIMENTS_DIR = Path("results/_experiments/sequential")
+# No decision before this many paired images: the boundary uses the
+# running variance, which needs some samples to be trustworthy.
+DEFAULT_MIN_N = 30
+# The mixture boundary is tightest around this many paired images, with
+# this planning variance of the per-image score difference. It stays valid
+# everywhere; a mismatch only costs width.
+DEFAULT_PLAN_N = 200
+PLANNING_VARIANCE = 0.04
+
+METRICS = {"decomposition_quality": DecompositionQualityMetric, "plausibility": PlausibilityMetric}
+
+
+@dataclass(frozen=True)
+class Candidate:
+    representation_prompt_version: str
+    decomposition_prompt_version: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.representation_prompt_version}__{self.decomposition_prompt_version}"
+
+    @classmethod
+    def parse(cls, spec: str) -> "Candidate":
+        """Parse ``<representation version>:<decomposition version>``; the
+        decomposition version defaults to baseline."""
+        representation, _, decomposition = spec.partition(":")
+        return cls(representation, decomposition or "baseline")
+
+
+def mixture_rho2(alpha: float, plan_n: int = DEFAULT_PLAN_N) -> float:
+    """Mixing variance that makes the boundary tightest at ``plan_n``."""
+    log_term = -2 * math.log(alpha)
+    return (log_term + math.log(log_term + 1)) / (plan_n * PLANNING_VARIANCE)
+
+
+def confidence_radius(n: int, variance: float, alpha: float, rho2: float) -> float:
+    """Half-width of the two-sided normal-mixture confidence sequence for a
+    mean after ``n`` observations with running ``variance``."""
+    intrinsic = n * variance * rho2 + 1
+    return math.sqrt(2 * intrinsic / (n * n * rho2) * math.log(math.sqrt(intrinsic) / alpha))
+
+
+@dataclass
+class Comparison:
+    """Running paired-difference statistics for one challenger vs. the
+    baseline (Welford's algorithm), plus its decision once made."""
+
+    challenger: str
+    alpha: float
+    margin: float
+    min_n: int
+    rho2: float
+    n: int = 0
+    mean: float = 0.0
+    _m2: float = 0.0
+    decision: str | None = None
+    decided_at: int | None = None
+
+    def update(self, difference: float) -> None:
+        self.n += 1
+        delta = difference - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (difference - self.mean)
+        if self.decision is None and self.n >= self.min_n:
+            lo, hi = self.interval
+            if lo > 0:
+                self.decision = "better"
+            elif hi < 0:
+                self.decision = "worse"
+            elif -self.margin < lo and hi < self.margin:
+                self.decision = "equivalent"
+            if self.decision is not None:
+                self.decided_at = self.n
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.n - 1) if self.n > 1 else float("nan")
+
+    @property
+    def interval(self) -> tuple[float, float]:
+        if self.n < 2:
+            return -math.inf, math.inf
+        radius = confidence_radius(self.n, self.variance, self.alpha, self.rho2)
+        return self.mean - radius, self.mean + radius
+
+    @property
+    def effect_size(self) -> float:
+        """Cohen's d_z: mean paired difference over its standard deviation."""
+        sd = math.sqrt(self.variance) if self.n > 1 else 0.0
+        return self.mean / sd if sd > 0 else float("nan")
+
+    def summary(self) -> dict:
+        lo, hi = self.interval
+        return {
+            "challenger": self.challenger,
+            "decision": self.decision or "inconclusive",
+            "n": self.n,
+            "decided_at": self.decided_at,
+            "mean_difference": self.mean,
+            "interval": [lo, hi],
+            "effect_size_dz": self.effect_size,
+        }
+
+
+@dataclass
+class SequentialRun:
+    baseline: str
+    comparisons: dict[str, Comparison]
+    results: dict[str, list[ImageResult]] = field(default_factory=dict)
+    errors: dict[str, list[ImageError]] = field(default_factory=dict)
+    images_started: int = 0
+
+    @property
+    def done(self) -> bool:
+        return all(c.decision is not None for c in self.comparisons.values())
+
+
+async def _numbered(items: Iterable[Path] | AsyncIterable[Path]) -> AsyncIterator[tuple[int, Path]]:
+    if isinstance(items, AsyncIterable):
+        index = 0
+        async for item in items:
+            yield index, item
+            index += 1
+    else:
+        for pair in enumerate(items):
+            yield pair
+
+
+async def run_sequential(
+    metric: Metric,
+    candidates: list[Candidate],
+    images: Iterable[Path] | AsyncIterable[Path],
+    *,
+    alpha: float = 0.05,
+    margin: float = 0.02,
+    min_n: int = DEFAULT_MIN_N,
+    plan_n: int = DEFAULT_PLAN_N,
+    limit: int = 10,
+    on_update: Callable[[SequentialRun], None] | None = None,
+) -> SequentialRun:
+    """Evaluate ``images`` under every candidate until each challenger's
+    comparison with ``candidates[0]`` is decided, or the images run out.
+
+    A decided challenger stops being evaluated on later images; the
+    baseline keeps going while any comparison is open. Leaving early
+    cancels images still in flight.
+    """
+    if len(candidates) < 2:
+        raise ValueError("need a baseline and at least one challenger")
+    baseline, challengers = candidates[0], candidates[1:]
+    per_test_alpha = alpha / len(challengers)
+    rho2 = mixture_rho2(per_test_alpha, plan_n)
+    run = SequentialRun(
+        baseline=baseline.name,
+        comparisons={
+            c.name: Comparison(c.name, per_test_alpha, margin, min_n, rho2) for c in challengers
+        },
+        results={c.name: [] for c in candidates},
+        errors={c.name: [] for c in candidates},
+    )
+
+    async def evaluate_all(numbered: tuple[int, Path]):
+        _, image_path = numbered
+        active = [baseline] + [c for c in challengers if run.comparisons[c.name].decision is None]
+        run.images_started += 1
+        outcomes = await asyncio.gather(
+            *(
+                evaluate_image(
+                    image_path,
+                    metric,
+                    representation_prompt_version=c.representation_prompt_version,
+                    decomposition_prompt_version=c.decomposition_prompt_version,
+                )
+                for c in active
+            ),
+            return_exceptions=True,
+        )
+        return dict(zip((c.name for c in active), outcomes))
+
+    def record(image_path: Path, outcomes: dict) -> None:
+        scores = {}
+        for name, outcome in outcomes.items():
+            if isinstance(outcome, BaseException):
+                run.errors[name].append(
+                    ImageError(
+                        image_path=image_path.name,
+                        error_type=type(outcome).__name__,
+                        error_message=str(outcome),
+                    )
+                )
+                continue
+            test_case, result = outcome
+            scores[name] = result.score
+            run.results[name].append(
+                ImageResult(
+                    image_path=image_path,
+                    result=result,
+                    details={
+                        "representation": test_case.representation,
+                        "atoms": test_case.atoms,
+                        **result.details,
+                    },
+                )
+            )
+        if baseline.name in scores:
+            for name, comparison in run.comparisons.items():
+                if name in scores and comparison.decision is None:
+                    comparison.update(scores[name] - scores[baseline.name])
+        if on_update is not None:
+            on_update(run)
+
+    # Images finish out of order (more atoms, longer judge outputs), so the
+    # comparisons are fed in launch order: an image is only recorded once
+    # every image launched before it has been. Otherwise fast images would
+    # be over-represented in whatever a run stops on.
+    finished: dict[int, tuple[Path, dict]] = {}
+    next_index = 0
+    async with aclosing(map_bounded_as_completed(evaluate_all, _numbered(images), limit=limit)) as done:
+        async for (index, image_path), outcomes in done:
+            if isinstance(outcomes, BaseException):
+                raise outcomes
+            finished[index] = (image_path, outcomes)
+            while next_index in finished and not run.done:
+                record(*finished.pop(next_index))
+                next_index += 1
+            if run.done:
+                break
+    return run
+
+
+def _print_progress(run: SequentialRun) -> None:
+    parts = []
+    for c in run.comparisons.values():
+        lo, hi = c.interval
+        state = c.decision or "…"
+        parts.append(f"{c.challenger}: n={c.n} Δ={c.mean:+.3f} [{lo:+.3f}, {hi:+.3f}] {state}")
+    print(" | ".join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--metric", choices=sorted(METRICS), default="plausibility")
+    parser.add_argument(
+        "--candidates", nargs="+", type=Candidate.parse, required=True,
+        help="<representation>:<decomposition> prompt versions; the first is the baseline",
+    )
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument(
+        "--margin", type=float, default=0.02,
+        help="score differences within ±margin count as negligible",
+    )
+    parser.add_argument("--min-n", type=int, default=DEFAULT_MIN_N)
+    parser.add_argument("--plan-n", type=int, default=DEFAULT_PLAN_N)
+    parser.add_argument("--max-images", type=int, default=None, help="default: the whole pool")
+    parser.add_argument("--image-dir", type=Path, default=None)
+    parser.add_argument("--split", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    # Random order, so the images seen before stopping are a fair sample.
+    images = load_image_paths(data_dir=args.image_dir, split=args.split)
+    random.Random(args.seed).shuffle(images)
+    if args.max_images is not None:
+        images = images[: args.max_images]
+
+    metric = METRICS[args.metric]()
+    run = asyncio.run(
+        run_sequential(
+            metric, args.candidates, images,
+            alpha=args.alpha, margin=args.margin, min_n=args.min_n, plan_n=args.plan_n,
+            limit=args.concurrency, on_update=_print_progress,
+        )
+    )
+
+    stamp = int(time.time())
+    print()
+    for comparison in run.comparisons.values():
+        s = comparison.summary()
+        print(
+            f"{s['challenger']} vs {run.baseline}: {s['decision']} after {s['n']} paired images "
+            f"(Δ={s['mean_difference']:+.3f}, CI [{s['interval'][0]:+.3f}, {s['interval'][1]:+.3f}], "
+            f"d_z={s['effect_size_dz']:.2f})"
+        )
+    print(f"{run.images_started} of {len(images)} images started")
+    for candidate in args.candidates:
+        if run.results[candidate.name] or run.errors[candidate.name]:
+            aggregate_prompt_results(
+                metric,
+                run.results[candidate.name],
+                representation_prompt_version=candidate.representation_prompt_version,
+                decomposition_prompt_version=candidate.decomposition_prompt_version,
+                model=metric.model,
+                errors=run.errors[candidate.name],
+                run_name=f"{candidate.name}_seq{stamp}",
+            )
+
+    EXPERIMENTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = EXPERIMENTS_DIR / f"{args.metric}__{stamp}.json"
+    path.write_text(
+        json.dumps(
+            {
+                "metric": args.metric,
+                "baseline": run.baseline,
+                "candidates": [asdict(c) for c in args.candidates],
+                "alpha": args.alpha,
+                "margin": args.margin,
+                "images_available": len(images),
+                "images_started": run.images_started,
+                "comparisons": [c.summary() for c in run.comparisons.values()],
+            },
+            indent=2,
+        )
+    )
+    print(f"Saved per-candidate runs under results/{metric.name}/ (*_seq{stamp}) and summary to {path}")
+
+
+if __name__ == "__main__":
+    main()
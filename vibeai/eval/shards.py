@@ -0,0 +1,188 @@
+"""Packed shard format for the processed image pool.
+
+A processed directory is tens of thousands of small JPEGs, which is slow to
+copy between machines, slow to list, and hard on the filesystem when many
+workers read at once. ``pack`` turns it into a few large ``shard-NNNNN.tar``
+files: plain POSIX tars, one ``<name>.jpg`` member per image, so tar and
+webdataset loaders can read them too. Alongside go an offset index
+(``shards.json``: name -> [shard, data offset, size]) and a copy of the
+dataset manifest.
+
+Reading goes through ``read_image(path)``. Paths into a packed directory
+(``data/main_packed/foo.jpg``) are virtual: no such file exists. They are
+resolved through the index to a ``memoryview`` slice of the mmapped shard,
+so an image is never copied out of the page cache before it's
+base64-encoded or served. Paths into a plain directory are read as files.
+``load_image_paths(data_dir=<packed dir>)`` works unchanged because the
+manifest travels with the shards.
+
+Usage:
+    python -m vibeai.eval.shards pack --src data/main_processed --dst data/main_packed
+    python -m vibeai.eval.shards verify data/main_packed
+"""
+
+import argparse
+import io
+import json
+import mmap
+import tarfile
+from functools import lru_cache
+from pathlib import Path
+
+from vibeai.eval.dataset import MANIFEST_NAME, VALID_EXTS
+
+SHARD_INDEX_NAME = "shards.json"
+SHARD_PATTERN = "shard-{:05d}.tar"
+# Large enough to make per-file overhead negligible, small enough to copy or
+# re-pack one shard at a time.
+DEFAULT_SHARD_BYTES = 256 * 1024 * 1024
+
+
+class ShardReader:
+    """Zero-copy access to one packed directory's images."""
+
+    def __init__(self, shard_dir: Path):
+        self.shard_dir = shard_dir
+        index = json.loads((shard_dir / SHARD_INDEX_NAME).read_text())
+        self.shards: list[str] = index["shards"]
+        self.entries: dict[str, tuple[int, int, int]] = {
+            name: tuple(entry) for name, entry in index["images"].items()
+        }
+        self._maps: list[mmap.mmap | None] = [None] * len(self.shards)
+
+    def _map(self, shard: int) -> mmap.mmap:
+        # Mapped on first use and kept for the process lifetime: slices
+        # handed out by read() keep referencing it.
+        if self._maps[shard] is None:
+            with (self.shard_dir / self.shards[shard]).open("rb") as f:
+                self._maps[shard] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._maps[shard]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def read(self, name: str) -> memoryview:
+        shard, offset, size = self.entries[name]
+        return memoryview(self._map(shard))[offset : offset + size]
+
+
+@lru_cache(maxsize=8)
+def _open_reader(shard_dir: Path, index_mtime_ns: int) -> ShardReader:
+    """``index_mtime_ns`` is only there to key the cache, so a re-pack is
+    picked up without restarting."""
+    return ShardReader(shard_dir)
+
+
+def open_shards(shard_dir: Path) -> ShardReader | None:
+    """The reader for ``shard_dir``, or None if it isn't a packed directory."""
+    try:
+        mtime_ns = (shard_dir / SHARD_INDEX_NAME).stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _open_reader(shard_dir, mtime_ns)
+
+
+def read_image(path: Path) -> bytes | memoryview:
+    """An image's bytes, from its packed shard if its directory is packed,
+    otherwise from the file itself."""
+    path = Path(path)
+    reader = open_shards(path.parent)
+    if reader is None:
+        return path.read_bytes()
+    if path.name not in reader:
+        raise FileNotFoundError(f"{path.name} is not in {path.parent / SHARD_INDEX_NAME}")
+    return reader.read(path.name)
+
+
+def _tarinfo(name: str, size: int) -> tarfile.TarInfo:
+    # Fixed metadata so packing the same images gives byte-identical shards.
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mode = 0o644
+    info.mtime = 0
+    return info
+
+
+def pack(src_dir: Path, dst_dir: Path, shard_bytes: int = DEFAULT_SHARD_BYTES) -> dict:
+    """Pack every image of ``src_dir`` (its manifest's outputs, or every
+    image file if it has none) into shards under ``dst_dir``, replacing any
+    previous pack there. Returns the index."""
+    manifest_path = src_dir / MANIFEST_NAME
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        names = sorted(e["output"] for e in manifest.values() if (src_dir / e["output"]).is_file())
+    else:
+        names = sorted(
+            p.name for p in src_dir.iterdir() if p.is_file() and p.suffix.lower() in VALID_EXTS
+        )
+        manifest = {name: {"output": name} for name in names}
+
+    dst_dir.mkdir(parents=True, exist_ok=True)
+    (dst_dir / SHARD_INDEX_NAME).unlink(missing_ok=True)
+    for old in dst_dir.glob("shard-*.tar"):
+        old.unlink()
+
+    shards: list[str] = []
+    images: dict[str, list[int]] = {}
+    tar = None
+    for name in names:
+        if tar is None or tar.offset >= shard_bytes:
+            if tar is not None:
+                tar.close()
+            shards.append(SHARD_PATTERN.format(len(shards)))
+            tar = tarfile.open(dst_dir / shards[-1], "w", format=tarfile.PAX_FORMAT)
+        data = (src_dir / name).read_bytes()
+        tar.addfile(_tarinfo(name, len(data)), io.BytesIO(data))
+        padded = -(-len(data) // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+        images[name] = [len(shards) - 1, tar.offset - padded, len(data)]
+    if tar is not None:
+        tar.close()
+
+    index = {"shards": shards, "images": images}
+    # Manifest first, index last: a directory is only treated as packed once
+    # its index exists, and by then everything it points at is in place.
+    packed = {source: e for source, e in manifest.items() if e["output"] in images}
+    (dst_dir / MANIFEST_NAME).write_text(json.dumps(packed, indent=1, sort_keys=True))
+    tmp = dst_dir / f"{SHARD_INDEX_NAME}.tmp"
+    tmp.write_text(json.dumps(index))
+    tmp.replace(dst_dir / SHARD_INDEX_NAME)
+    return index
+
+
+def verify(shard_dir: Path) -> int:
+    """Check every index entry against the tar headers; returns the number
+    of mismatches."""
+    reader = ShardReader(shard_dir)
+    bad = 0
+    for shard_no, shard in enumerate(reader.shards):
+        with tarfile.open(shard_dir / shard) as tar:
+            for member in tar:
+                entry = reader.entries.get(member.name)
+                if entry != (shard_no, member.offset_data, member.size):
+                    print(f"[MISMATCH] {shard}:{member.name} index={entry}")
+                    bad += 1
+    return bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    pack_parser = sub.add_parser("pack", help="pack a processed directory into shards")
+    pack_parser.add_argument("--src", type=Path, default=Path("data/main_processed"))
+    pack_parser.add_argument("--dst", type=Path, default=Path("data/main_packed"))
+    pack_parser.add_argument("--shard-mb", type=int, default=DEFAULT_SHARD_BYTES // (1024 * 1024))
+    verify_parser = sub.add_parser("verify", help="check a packed directory's index")
+    verify_parser.add_argument("shard_dir", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        index = pack(args.src, args.dst, shard_bytes=args.shard_mb * 1024 * 1024)
+        print(f"Packed {len(index['images'])} images into {len(index['shards'])} shard(s) under {args.dst}")
+    else:
+        bad = verify(args.shard_dir)
+        print("OK" if not bad else f"{bad} mismatch(es)")
+        raise SystemExit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,16 +10,23 @@ import base64
 import hashlib
 import json
 import time
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Coroutine
+from typing import Awaitable, Callable, Coroutine
 
 from dotenv import load_dotenv
-from openai import APIConnectionError, APIStatusError, AsyncOpenAI, OpenAI
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI, BadRequestError, OpenAI
 
 from vibeai.llm.budget import get_budget
-from vibeai.llm.errors import InsufficientQuotaError
-from vibeai.llm.usage_log import log_call
+from vibeai.llm.errors import InsufficientQuotaError, PartialOutputError, StreamAbortedError
+from vibeai.llm.hedging import get_hedger
+from vibeai.llm.incremental import ItemStream, StreamChecker
+from vibeai.llm.prompt_layout import Prompt
+from vibeai.llm.structured import OutputSchema
+from vibeai.llm.transport import TransportConfig, get_transport
+from vibeai.llm.usage_log import log_call, log_event
+from vibeai.tracing import span
 
 load_dotenv()
 
@@ -41,15 +48,35 @@ RETRY_MAX_DELAY_SECONDS = 30.0
 
 _RETRYABLE_EXCEPTIONS = (APIStatusError, APIConnectionError)
 
+# Models that rejected a structured-output request (see
+# vibeai.llm.structured); they get plain prompting, and the stages' own
+# JSON parsing, for the rest of the process.
+_SCHEMA_UNSUPPORTED: set[str] = set()
+
 
-@lru_cache
 def get_client() -> OpenAI:
-    return OpenAI(max_retries=0)
+    return _client(get_transport())
 
 
-@lru_cache
 def get_async_client() -> AsyncOpenAI:
-    return AsyncOpenAI(max_retries=0)
+    return _async_client(get_transport())
+
+
+# One client, and so one connection pool, per transport config (see
+# vibeai.llm.transport).
+@lru_cache
+def _client(transport: TransportConfig) -> OpenAI:
+    return OpenAI(max_retries=0, http_client=transport.http_client())
+
+
+@lru_cache
+def _async_client(transport: TransportConfig) -> AsyncOpenAI:
+    return AsyncOpenAI(max_retries=0, http_client=transport.async_http_client())
+
+
+def _timeout_kwargs(call_type: str, streamed: bool = False) -> dict:
+    """Per request: a streamed one gets its stage's own read timeout."""
+    return {"timeout": get_transport().timeout(call_type, streamed)}
 
 
 def _is_insufficient_quota(exc: Exception) -> bool:
@@ -61,15 +88,55 @@ def _retry_delay(attempt: int) -> float:
     return min(RETRY_BASE_DELAY_SECONDS * (2 ** (attempt - 1)), RETRY_MAX_DELAY_SECONDS)
 
 
+def _retry_reason(exc: Exception) -> str:
+    """Short, groupable: e.g. "RateLimitError 429", "validation: PartialOutputError"."""
+    if isinstance(exc, APIStatusError):
+        return f"{type(exc).__name__} {exc.status_code}"
+    if isinstance(exc, ValueError):
+        return f"validation: {type(exc).__name__}"
+    return type(exc).__name__
+
+
+@dataclass
+class _CallLog:
+    """One client call, as the usage log sees it across its attempts: the
+    attempt in flight, its timing, and what made the previous one fail."""
+
+    model: str
+    call_type: str
+    attempt: int = 0
+    retry_reason: str | None = None
+    latency: float | None = None
+    ttfb: float | None = None
+
+    def cache_hit(self) -> None:
+        log_event(self.model, self.call_type, "cache_hit")
+
+    def failed(self, event: str, exc: Exception) -> None:
+        """An attempt that ended without a response: "api_error", or
+        "stream_aborted" (see vibeai.llm.incremental)."""
+        log_event(
+            self.model,
+            self.call_type,
+            event,
+            attempt=self.attempt,
+            retry_reason=self.retry_reason,
+            latency=self.latency,
+            error=exc,
+        )
+
+
 def _call_with_retry(
     fn: Callable[[], object],
     max_retries: int = MAX_RETRIES,
     extra_retryable: tuple[type[Exception], ...] = (),
+    call_log: _CallLog | None = None,
 ):
     """Retry ``fn`` on transient API errors and, if ``extra_retryable`` is
     given (e.g. a metric's output-validation ValueError), on those too - all
     sharing one exponential-backoff budget rather than each having its own,
-    so a flaky call can't multiply worst-case latency across retry layers."""
+    so a flaky call can't multiply worst-case latency across retry layers.
+    Each retry's reason is noted on ``call_log``, for the usage log."""
     retryable = _RETRYABLE_EXCEPTIONS + extra_retryable
     attempt = 0
     while True:
@@ -84,13 +151,17 @@ def _call_with_retry(
             attempt += 1
             if attempt > max_retries:
                 raise
-            time.sleep(_retry_delay(attempt))
+            if call_log is not None:
+                call_log.retry_reason = _retry_reason(e)
+            with span("retry_sleep", retry_of=type(e).__name__):
+                time.sleep(_retry_delay(attempt))
 
 
 async def _call_with_retry_async(
     coro_fn: Callable[[], Coroutine[None, None, object]],
     max_retries: int = MAX_RETRIES,
     extra_retryable: tuple[type[Exception], ...] = (),
+    call_log: _CallLog | None = None,
 ):
     retryable = _RETRYABLE_EXCEPTIONS + extra_retryable
     attempt = 0
@@ -106,212 +177,474 @@ async def _call_with_retry_async(
             attempt += 1
             if attempt > max_retries:
                 raise
-            await asyncio.sleep(_retry_delay(attempt))
-
-
-def _cache_path(model: str, prompt: str, image_bytes: bytes | None) -> Path:
+            if call_log is not None:
+                call_log.retry_reason = _retry_reason(e)
+            if isinstance(e, StreamAbortedError):
+                continue  # a bad generation, not an overloaded API: retry at once
+            with span("retry_sleep", retry_of=type(e).__name__):
+                await asyncio.sleep(_retry_delay(attempt))
+
+
+def _cache_path(
+    model: str,
+    prompt: str | Prompt,
+    image_bytes: bytes | memoryview | None,
+    detail: str = "auto",
+    tag: str = "",
+) -> Path:
+    """``tag`` marks outputs that aren't a single plain answer to the prompt
+    (e.g. "repaired"), so they never collide with one."""
+    if isinstance(prompt, Prompt):
+        prompt = prompt.inline  # the layout sent doesn't change the answer
     h = hashlib.sha256()
     h.update(model.encode())
     h.update(prompt.encode())
     if image_bytes is not None:
         h.update(image_bytes)
+    if detail != "auto":  # so entries cached before detail existed still hit
+        h.update(f"detail={detail}".encode())
+    if tag:
+        h.update(f"tag={tag}".encode())
     return CACHE_DIR / f"{h.hexdigest()}.json"
 
 
-def _read_cache(path: Path) -> str | None:
-    if path.exists():
-        return json.loads(path.read_text())["output"]
-    return None
+def _cache_paths(
+    model: str,
+    prompt: str | Prompt,
+    image_bytes: bytes | memoryview | None,
+    detail: str,
+    repairable: bool,
+) -> tuple[Path, Path | None]:
+    """(plain path, repaired path): a call with a ``repair`` callback also
+    hits outputs it repaired before, cached apart from plain answers."""
+    path = _cache_path(model, prompt, image_bytes, detail)
+    return path, _cache_path(model, prompt, image_bytes, detail, tag="repaired") if repairable else None
+
+
+def _read_cache(*paths: Path | None) -> str | None:
+    with span("cache_lookup") as args:
+        for path in paths:
+            if path is not None and path.exists():
+                args["hit"] = True
+                return json.loads(path.read_text())["output"]
+        args["hit"] = False
+        return None
 
 
 def _write_cache(path: Path, output: str) -> None:
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps({"output": output}))
+    with span("cache_write"):
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"output": output}))
 
 
-def _record_usage(response, model: str, call_type: str) -> None:
+def _record_usage(
+    response,
+    call_log: _CallLog,
+    structured: bool = False,
+    validation_error: Exception | None = None,
+) -> None:
     usage = getattr(response, "usage", None)
     if usage is not None:
         get_budget().record(usage.total_tokens)
-        log_call(model, call_type, usage)
+        log_call(
+            call_log.model,
+            call_log.call_type,
+            usage,
+            attempt=call_log.attempt,
+            structured=structured,
+            validation_error=validation_error,
+            latency=call_log.latency,
+            ttfb=call_log.ttfb,
+            retry_reason=call_log.retry_reason,
+        )
+
+
+def _format_kwargs(model: str, schema: OutputSchema | None) -> dict:
+    if schema is None or model in _SCHEMA_UNSUPPORTED:
+        return {}
+    return {"text": schema.text_format}
+
+
+def _prompt_cache_kwargs(prompt: str | Prompt, prompt_cache_key: str | None) -> dict:
+    if prompt_cache_key is None and isinstance(prompt, Prompt):
+        prompt_cache_key = prompt.cache_key
+    return {} if prompt_cache_key is None else {"prompt_cache_key": prompt_cache_key}
+
+
+def _is_schema_rejection(exc: BadRequestError, kwargs: dict) -> bool:
+    if "text" not in kwargs:
+        return False
+    if (getattr(exc, "param", None) or "").startswith("text"):
+        return True
+    return "json_schema" in str(exc) or "text.format" in str(exc)
+
+
+def _create(
+    messages: list, schema: OutputSchema | None, extra: dict, call_log: _CallLog
+) -> tuple[object, bool]:
+    """(response, whether it was schema-constrained). The attempt's timing
+    is noted on ``call_log``; one that fails at the API is logged as an
+    "api_error" event."""
+    model = call_log.model
+    call_log.attempt += 1
+    extra = {**extra, **_timeout_kwargs(call_log.call_type)}
+    kwargs = _format_kwargs(model, schema)
+    start = time.monotonic()
+    try:
+        try:
+            with span("api_call", structured=bool(kwargs)):
+                response = get_client().responses.create(model=model, input=messages, **kwargs, **extra)
+        except BadRequestError as e:
+            if not _is_schema_rejection(e, kwargs):
+                raise
+            _SCHEMA_UNSUPPORTED.add(model)
+            kwargs = {}
+            with span("api_call", structured=False):
+                response = get_client().responses.create(model=model, input=messages, **extra)
+    except _RETRYABLE_EXCEPTIONS as e:
+        call_log.latency, call_log.ttfb = time.monotonic() - start, None
+        call_log.failed("api_error", e)
+        raise
+    call_log.latency, call_log.ttfb = time.monotonic() - start, None
+    return response, bool(kwargs)
+
+
+async def _stream_async(
+    model: str, messages: list, kwargs: dict, checker: StreamChecker, start: float
+) -> tuple[object, float | None]:
+    """(the completed response, seconds to its first output text). Each
+    chunk of output text goes through ``checker``; the stream is closed as
+    soon as it raises."""
+    ttfb = None
+    stream = await get_async_client().responses.create(model=model, input=messages, stream=True, **kwargs)
+    try:
+        async for event in stream:
+            if event.type == "response.output_text.delta":
+                if ttfb is None:
+                    ttfb = time.monotonic() - start
+                checker.feed(event.delta)
+            elif event.type in ("response.completed", "response.incomplete"):
+                return event.response, ttfb
+            elif event.type == "response.failed":
+                raise ValueError(f"Response failed: {getattr(event.response, 'error', None)}")
+    finally:
+        await stream.close()
+    raise ValueError("Stream ended without a completed response")
+
+
+async def _create_async(
+    messages: list,
+    schema: OutputSchema | None,
+    extra: dict,
+    call_log: _CallLog,
+    stream_check: ItemStream | None = None,
+) -> tuple[object, bool]:
+    model = call_log.model
+    call_log.attempt += 1
+    call_log.ttfb = None
+    extra = {**extra, **_timeout_kwargs(call_log.call_type, streamed=stream_check is not None)}
+
+    async def request(kwargs: dict):
+        if stream_check is None:
+            return await get_async_client().responses.create(model=model, input=messages, **kwargs)
+        root_key = schema.root_key if schema is not None else None
+        checker = StreamChecker(stream_check, structured="text" in kwargs, root_key=root_key)
+        response, call_log.ttfb = await _stream_async(model, messages, kwargs, checker, start)
+        return response
+
+    async def hedged(kwargs: dict):
+        """See vibeai.llm.hedging; a no-op unless hedging is on."""
+        hedger = get_hedger()
+        if hedger is None:
+            return await request(kwargs)
+        return await hedger.run(call_log.call_type, model, lambda: request(kwargs))
+
+    kwargs = _format_kwargs(model, schema)
+    start = time.monotonic()
+    try:
+        try:
+            with span("api_call", structured=bool(kwargs), streamed=stream_check is not None):
+                response = await hedged({**kwargs, **extra})
+        except BadRequestError as e:
+            if not _is_schema_rejection(e, kwargs):
+                raise
+            _SCHEMA_UNSUPPORTED.add(model)
+            kwargs = {}
+            with span("api_call", structured=False, streamed=stream_check is not None):
+                response = await hedged(extra)
+    except (*_RETRYABLE_EXCEPTIONS, StreamAbortedError) as e:
+        call_log.latency = time.monotonic() - start
+        call_log.failed("stream_aborted" if isinstance(e, StreamAbortedError) else "api_error", e)
+        raise
+    call_log.latency = time.monotonic() - start
+    return response, bool(kwargs)
+
+
+def _checked_output(
+    response,
+    call_log: _CallLog,
+    schema: OutputSchema | None,
+    structured: bool,
+    validate: Callable[[str], None] | None,
+    accept_partial: bool = False,
+) -> tuple[str, PartialOutputError | None]:
+    """The call's output text once it passes ``validate``, or - with
+    ``accept_partial`` - once it passes but for a PartialOutputError, which
+    is returned alongside for the caller to repair. Usage is recorded either
+    way - the tokens were spent even if the output is rejected - and the
+    usage-log record notes a rejection, so retry rates per stage are visible
+    in ``vibeai.llm.usage_report``."""
+    output = response.output_text
+    error = None
+    with span("validation") as args:
+        try:
+            if structured:
+                output = schema.unwrap(output)
+            if validate is not None:
+                validate(output)
+        except ValueError as e:
+            error = e
+            args["rejected"] = type(e).__name__
+    _record_usage(response, call_log, structured, error)
+    if isinstance(error, PartialOutputError) and accept_partial:
+        return output, error
+    if error is not None:
+        raise error
+    return output, None
+
+
+def _text_parts(prompt: str | Prompt) -> tuple[list[dict], list[dict]]:
+    """(static, variable) input_text parts; see vibeai.llm.prompt_layout."""
+    if not isinstance(prompt, Prompt):
+        return [{"type": "input_text", "text": prompt}], []
+    static, variable = prompt.parts
+    return (
+        [{"type": "input_text", "text": static}],
+        [{"type": "input_text", "text": variable}] if variable else [],
+    )
+
+
+def _text_input(prompt: str | Prompt) -> list:
+    static, variable = _text_parts(prompt)
+    return [{"role": "user", "content": static + variable}]
+
+
+def _image_input(
+    prompt: str | Prompt, image_bytes: bytes | memoryview, mime_type: str, detail: str
+) -> list:
+    """Static text, then the image, then the variable text: the image is
+    the same for every call about it, the variable text isn't."""
+    image_b64 = base64.b64encode(image_bytes).decode("utf-8")
+    static, variable = _text_parts(prompt)
+    image = {
+        "type": "input_image",
+        "image_url": f"data:{mime_type};base64,{image_b64}",
+        "detail": detail,
+    }
+    return [{"role": "user", "content": static + [image] + variable}]
 
 
 def call_text(
-    prompt: str,
+    prompt: str | Prompt,
     model: str = DEFAULT_MODEL,
     use_cache: bool = True,
     call_type: str = "text",
     validate: Callable[[str], None] | None = None,
     max_retries: int = MAX_RETRIES,
+    schema: OutputSchema | None = None,
+    repair: Callable[[str, PartialOutputError], str] | None = None,
+    prompt_cache_key: str | None = None,
 ) -> str:
-    """``validate``, if given, is called on the raw output text; a ValueError
+    """``prompt`` may be a ``Prompt``, sent static part first to make the
+    most of provider-side prompt caching; ``prompt_cache_key`` defaults to
+    one derived from its static part (see ``vibeai.llm.prompt_layout``).
+
+    ``validate``, if given, is called on the raw output text; a ValueError
     it raises is retried under the same backoff budget as transient API
     errors (``max_retries`` total, shared - see ``_call_with_retry``). Only
-    output that passes ``validate`` is written to the cache."""
-    path = _cache_path(model, prompt, None)
-    if use_cache:
-        cached = _read_cache(path)
-        if cached is not None:
-            return cached
-
-    get_budget().check()
-
-    def attempt():
-        response = get_client().responses.create(
-            model=model,
-            input=[{"role": "user", "content": [{"type": "input_text", "text": prompt}]}],
+    output that passes ``validate`` is written to the cache. ``schema``
+    constrains the output to the stage's JSON shape; see
+    ``vibeai.llm.structured``. It isn't part of the cache key: a cached
+    output passed ``validate`` either way.
+
+    ``repair``, if given, handles a PartialOutputError from ``validate``
+    instead of a whole retry: it gets the output and the error, and returns
+    the fixed output (typically after a smaller call for just the bad
+    items). The fixed output is cached under a key tagged as repaired."""
+    with span("llm_call", stage=call_type, model=model):
+        path, repaired_path = _cache_paths(model, prompt, None, "auto", repair is not None)
+        call_log = _CallLog(model, call_type)
+        if use_cache:
+            cached = _read_cache(path, repaired_path)
+            if cached is not None:
+                call_log.cache_hit()
+                return cached
+
+        get_budget().check()
+        messages = _text_input(prompt)
+        extra = _prompt_cache_kwargs(prompt, prompt_cache_key)
+
+        def attempt():
+            response, structured = _create(messages, schema, extra, call_log)
+            return _checked_output(response, call_log, schema, structured, validate, repair is not None)
+
+        output, partial = _call_with_retry(
+            attempt,
+            max_retries=max_retries,
+            extra_retryable=(ValueError,) if validate or schema else (),
+            call_log=call_log,
         )
-        _record_usage(response, model, call_type)  # spent tokens even if validate() rejects it
-        if validate is not None:
-            validate(response.output_text)
-        return response
+        if partial is not None:
+            output, path = repair(output, partial), repaired_path
 
-    response = _call_with_retry(
-        attempt, max_retries=max_retries, extra_retryable=(ValueError,) if validate else ()
-    )
-    output = response.output_text
-
-    if use_cache:
-        _write_cache(path, output)
-    return output
+        if use_cache:
+            _write_cache(path, output)
+        return output
 
 
 async def call_text_async(
-    prompt: str,
+    prompt: str | Prompt,
     model: str = DEFAULT_MODEL,
     use_cache: bool = True,
     call_type: str = "text",
     validate: Callable[[str], None] | None = None,
     max_retries: int = MAX_RETRIES,
+    schema: OutputSchema | None = None,
+    repair: Callable[[str, PartialOutputError], Awaitable[str]] | None = None,
+    prompt_cache_key: str | None = None,
+    stream_check: ItemStream | None = None,
 ) -> str:
-    path = _cache_path(model, prompt, None)
-    if use_cache:
-        cached = _read_cache(path)
-        if cached is not None:
-            return cached
-
-    get_budget().check()
-
-    async def attempt():
-        response = await get_async_client().responses.create(
-            model=model,
-            input=[{"role": "user", "content": [{"type": "input_text", "text": prompt}]}],
+    """As ``call_text``. With ``stream_check``, the response is streamed
+    and checked as it arrives; one that can't pass ``validate`` is cut off
+    and retried at once (see ``vibeai.llm.incremental``)."""
+    with span("llm_call", stage=call_type, model=model):
+        path, repaired_path = _cache_paths(model, prompt, None, "auto", repair is not None)
+        call_log = _CallLog(model, call_type)
+        if use_cache:
+            cached = _read_cache(path, repaired_path)
+            if cached is not None:
+                call_log.cache_hit()
+                return cached
+
+        get_budget().check()
+        messages = _text_input(prompt)
+        extra = _prompt_cache_kwargs(prompt, prompt_cache_key)
+
+        async def attempt():
+            response, structured = await _create_async(messages, schema, extra, call_log, stream_check)
+            return _checked_output(response, call_log, schema, structured, validate, repair is not None)
+
+        output, partial = await _call_with_retry_async(
+            attempt,
+            max_retries=max_retries,
+            extra_retryable=(ValueError,) if validate or schema else (),
+            call_log=call_log,
         )
-        _record_usage(response, model, call_type)
-        if validate is not None:
-            validate(response.output_text)
-        return response
+        if partial is not None:
+            output, path = await repair(output, partial), repaired_path
 
-    response = await _call_with_retry_async(
-        attempt, max_retries=max_retries, extra_retryable=(ValueError,) if validate else ()
-    )
-    output = response.output_text
-
-    if use_cache:
-        _write_cache(path, output)
-    return output
+        if use_cache:
+            _write_cache(path, output)
+        return output
 
 
 def call_with_image(
-    prompt: str,
-    image_bytes: bytes,
+    prompt: str | Prompt,
+    image_bytes: bytes | memoryview,
     mime_type: str = "image/jpeg",
     model: str = DEFAULT_MODEL,
     use_cache: bool = True,
     call_type: str = "image",
     validate: Callable[[str], None] | None = None,
     max_retries: int = MAX_RETRIES,
+    detail: str = "auto",
+    schema: OutputSchema | None = None,
+    repair: Callable[[str, PartialOutputError], str] | None = None,
+    prompt_cache_key: str | None = None,
 ) -> str:
     """``validate``, if given, is called on the raw output text; a ValueError
     it raises (e.g. the judge's JSON is missing a required field) is retried
     under the same backoff budget as transient API errors (``max_retries``
     total, shared across both failure kinds - see ``_call_with_retry``).
-    Only output that passes ``validate`` is written to the cache."""
-    path = _cache_path(model, prompt, image_bytes)
-    if use_cache:
-        cached = _read_cache(path)
-        if cached is not None:
-            return cached
-
-    get_budget().check()
-    image_b64 = base64.b64encode(image_bytes).decode("utf-8")
-
-    def attempt():
-        response = get_client().responses.create(
-            model=model,
-            input=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "input_text", "text": prompt},
-                        {
-                            "type": "input_image",
-                            "image_url": f"data:{mime_type};base64,{image_b64}",
-                        },
-                    ],
-                }
-            ],
+    Only output that passes ``validate`` is written to the cache. ``detail``
+    is the input_image detail level ("low"/"high"/"auto"); see
+    ``vibeai.pipeline.image_policy``. ``schema``, ``repair`` and
+    ``prompt_cache_key`` are as for ``call_text``; a ``Prompt``'s image goes
+    between its static and variable parts."""
+    with span("llm_call", stage=call_type, model=model):
+        path, repaired_path = _cache_paths(model, prompt, image_bytes, detail, repair is not None)
+        call_log = _CallLog(model, call_type)
+        if use_cache:
+            cached = _read_cache(path, repaired_path)
+            if cached is not None:
+                call_log.cache_hit()
+                return cached
+
+        get_budget().check()
+        messages = _image_input(prompt, image_bytes, mime_type, detail)
+        extra = _prompt_cache_kwargs(prompt, prompt_cache_key)
+
+        def attempt():
+            response, structured = _create(messages, schema, extra, call_log)
+            return _checked_output(response, call_log, schema, structured, validate, repair is not None)
+
+        output, partial = _call_with_retry(
+            attempt,
+            max_retries=max_retries,
+            extra_retryable=(ValueError,) if validate or schema else (),
+            call_log=call_log,
         )
-        _record_usage(response, model, call_type)  # spent tokens even if validate() rejects it
-        if validate is not None:
-            validate(response.output_text)
-        return response
-
-    response = _call_with_retry(
-        attempt, max_retries=max_retries, extra_retryable=(ValueError,) if validate else ()
-    )
-    output = response.output_text
+        if partial is not None:
+            output, path = repair(output, partial), repaired_path
 
-    if use_cache:
-        _write_cache(path, output)
-    return output
+        if use_cache:
+            _write_cache(path, output)
+        return output
 
 
 async def call_with_image_async(
-    prompt: str,
-    image_bytes: bytes,
+    prompt: str | Prompt,
+    image_bytes: bytes | memoryview,
     mime_type: str = "image/jpeg",
     model: str = DEFAULT_MODEL,
     use_cache: bool = True,
     call_type: str = "image",
     validate: Callable[[str], None] | None = None,
     max_retries: int = MAX_RETRIES,
+    detail: str = "auto",
+    schema: OutputSchema | None = None,
+    repair: Callable[[str, PartialOutputError], Awaitable[str]] | None = None,
+    prompt_cache_key: str | None = None,
+    stream_check: ItemStream | None = None,
 ) -> str:
-    path = _cache_path(model, prompt, image_bytes)
-    if use_cache:
-        cached = _read_cache(path)
-        if cached is not None:
-            return cached
-
-    get_budget().check()
-    image_b64 = base64.b64encode(image_bytes).decode("utf-8")
-
-    async def attempt():
-        response = await get_async_client().responses.create(
-            model=model,
-            input=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "input_text", "text": prompt},
-                        {
-                            "type": "input_image",
-                            "image_url": f"data:{mime_type};base64,{image_b64}",
-                        },
-                    ],
-                }
-            ],
+    """As ``call_with_image``, with ``stream_check`` as for
+    ``call_text_async``."""
+    with span("llm_call", stage=call_type, model=model):
+        path, repaired_path = _cache_paths(model, prompt, image_bytes, detail, repair is not None)
+        call_log = _CallLog(model, call_type)
+        if use_cache:
+            cached = _read_cache(path, repaired_path)
+            if cached is not None:
+                call_log.cache_hit()
+                return cached
+
+        get_budget().check()
+        messages = _image_input(prompt, image_bytes, mime_type, detail)
+        extra = _prompt_cache_kwargs(prompt, prompt_cache_key)
+
+        async def attempt():
+            response, structured = await _create_async(messages, schema, extra, call_log, stream_check)
+            return _checked_output(response, call_log, schema, structured, validate, repair is not None)
+
+        output, partial = await _call_with_retry_async(
+            attempt,
+            max_retries=max_retries,
+            extra_retryable=(ValueError,) if validate or schema else (),
+            call_log=call_log,
         )
-        _record_usage(response, model, call_type)
-        if validate is not None:
-            validate(response.output_text)
-        return response
-
-    response = await _call_with_retry_async(
-        attempt, max_retries=max_retries, extra_retryable=(ValueError,) if validate else ()
-    )
-    output = response.output_text
+        if partial is not None:
+            output, path = await repair(output, partial), repaired_path
 
-    if use_cache:
-        _write_cache(path, output)
-    return output
+        if use_cache:
+            _write_cache(path, output)
+        return output
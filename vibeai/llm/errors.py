@@ -1,2 +1,25 @@
 class InsufficientQuotaError(RuntimeError):
     """Raised when the OpenAI account has no credit left. Retrying will not help."""
+
+
+class PartialOutputError(ValueError):
+    """Raised by a ``validate`` callback when an output is valid except for
+    some items, e.g. a few malformed per-atom verdicts. ``bad`` holds their
+    indices. As a ValueError it retries the whole call, unless the call was
+    given a ``repair`` callback to redo just those items."""
+
+    def __init__(self, message: str, bad: list[int]):
+        super().__init__(message)
+        self.bad = bad
+
+
+class StreamAbortedError(ValueError):
+    """Raised when a streamed output is cut off early because what has
+    arrived so far can't begin a valid output (see
+    ``vibeai.llm.incremental``). ``output_chars`` is how much had arrived.
+    Retried like a validation failure, but at once: backing off doesn't
+    help a bad generation."""
+
+    def __init__(self, message: str, output_chars: int = 0):
+        super().__init__(message)
+        self.output_chars = output_chars
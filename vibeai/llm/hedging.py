@@ -0,0 +1,143 @@
+"""Hedged requests: cut the latency tail of a batch run.
+
+At high concurrency a few calls per batch take 5-10x the median, and a
+run's wall time ends up set by its slowest stragglers. A ``Hedger`` learns
+each stage's (call type's, per model) latency distribution online. When a
+request has run past the stage's ``percentile`` latency, it sends a
+duplicate, keeps whichever finishes first and cancels the other. Only the
+slowest ~(100 - percentile)% of requests get hedged, so the cost is
+bounded, and it's capped outright too: hedges stop while the tokens they
+cost would exceed ``max_token_share`` of the tokens the stage has used.
+
+A cancelled request may still be billed in full, and its usage never
+arrives, so each hedge is charged the stage's mean tokens per request, to
+both the cap and the daily ``vibeai.llm.budget``. Hedges are logged to the
+usage log as "hedge" events, with whether the hedge won.
+
+Hedging is off unless ``set_hedging`` turns it on (``--hedge-percentile``
+in the batch tests); it only applies to the async client.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+from vibeai.llm.budget import get_budget
+from vibeai.llm.usage_log import log_event
+from vibeai.tracing import LatencyHistogram
+
+T = TypeVar("T")
+
+
+@dataclass
+class HedgeStats:
+    requests: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    completed: int = 0  # requests that reported their usage
+    tokens: int = 0
+    hedge_tokens: int = 0  # estimated; see the module docstring
+
+    @property
+    def mean_tokens(self) -> float:
+        return self.tokens / self.completed if self.completed else 0.0
+
+
+class Hedger:
+    def __init__(self, percentile: float = 95, min_samples: int = 20, max_token_share: float = 0.1):
+        self.percentile = percentile
+        # Don't hedge on a latency estimate from too few requests.
+        self.min_samples = min_samples
+        self.max_token_share = max_token_share
+        self.latencies: dict[tuple[str, str], LatencyHistogram] = {}
+        self.stats: dict[tuple[str, str], HedgeStats] = {}
+
+    def _stage(self, key: tuple[str, str]) -> tuple[LatencyHistogram, HedgeStats]:
+        if key not in self.stats:
+            self.latencies[key], self.stats[key] = LatencyHistogram(), HedgeStats()
+        return self.latencies[key], self.stats[key]
+
+    def delay(self, call_type: str, model: str) -> float | None:
+        """Seconds to wait before hedging a request, or None to not hedge."""
+        latencies, stats = self._stage((call_type, model))
+        if latencies.count < self.min_samples:
+            return None
+        if stats.hedge_tokens + stats.mean_tokens > self.max_token_share * stats.tokens:
+            return None
+        return latencies.percentile(self.percentile) / 1e6
+
+    async def run(self, call_type: str, model: str, request: Callable[[], Awaitable[T]]) -> T:
+        """``request()``'s result, from whichever of it and (if it runs
+        past the stage's hedge delay) a duplicate finishes first. The other
+        is cancelled. Only if both fail is the original's error raised."""
+        key = (call_type, model)
+        latencies, stats = self._stage(key)
+        stats.requests += 1
+        delay = self.delay(call_type, model)
+        start = time.monotonic()
+        primary = asyncio.ensure_future(request())
+        tasks, winner = {primary}, None
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    tasks.add(asyncio.ensure_future(request()))
+                    self._charge(stats)
+            pending = set(tasks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((t for t in done if t.exception() is None), None)
+        finally:
+            losers = tasks - {winner}
+            for task in losers:
+                task.cancel()
+            await asyncio.gather(*losers, return_exceptions=True)
+        elapsed = time.monotonic() - start
+
+        if winner is None:
+            return primary.result()  # raises the original's error
+        latencies.record(int(elapsed * 1e6))
+        result = winner.result()
+        usage = getattr(result, "usage", None)
+        if usage is not None:
+            stats.completed += 1
+            stats.tokens += usage.total_tokens
+        if len(tasks) > 1:
+            won = winner is not primary
+            stats.hedge_wins += won
+            log_event(model, call_type, "hedge", won=won, latency=elapsed)
+        return result
+
+    def _charge(self, stats: HedgeStats) -> None:
+        stats.hedges += 1
+        estimate = round(stats.mean_tokens)
+        stats.hedge_tokens += estimate
+        get_budget().record(estimate)
+
+    def summary(self) -> str:
+        lines = [
+            f"Hedging at p{self.percentile:g} latency",
+            f"{'':32s}{'requests':>10s}{'hedges':>8s}{'won':>6s}{'p-delay s':>11s}{'hedge tok':>11s}",
+        ]
+        for (call_type, model), stats in sorted(self.stats.items()):
+            latencies = self.latencies[(call_type, model)]
+            lines.append(
+                f"{f'{call_type} / {model}':32s}{stats.requests:>10d}{stats.hedges:>8d}"
+                f"{stats.hedge_wins:>6d}{latencies.percentile(self.percentile) / 1e6:>11.2f}"
+                f"{stats.hedge_tokens:>11d}"
+            )
+        return "\n".join(lines)
+
+
+_hedger: Hedger | None = None
+
+
+def set_hedging(hedger: Hedger | None) -> None:
+    global _hedger
+    _hedger = hedger
+
+
+def get_hedger() -> Hedger | None:
+    return _hedger
@@ -0,0 +1,179 @@
+"""Incremental checks on a streamed JSON output, for aborting bad ones early.
+
+Without streaming, a judge output that went wrong in its first few hundred
+tokens (not JSON, wrong shape, a malformed first verdict) is still paid for
+and waited on in full before ``validate`` rejects it. Stages whose output is
+a JSON array of items - or an object holding one under a known key -
+describe it with an ``ItemStream``. The client feeds a ``StreamChecker``
+the output as it streams in, and cuts the stream off with a
+StreamAbortedError as soon as the text so far can't begin an output the
+stage's ``validate`` would accept:
+
+- it doesn't start with JSON of the right top-level shape;
+- its brackets don't match;
+- a finished item isn't valid JSON, or fails the stage's per-item check;
+- it has more items than the stage expects.
+
+Plain (not schema-constrained) outputs are parsed by
+``vibeai.eval.parsing.extract_json``, which also accepts a ```json fence
+after some prose. So a plain output that opens with prose is left alone to
+finish; one that opens with JSON or a fence is taken at its word.
+"""
+
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from vibeai.llm.errors import StreamAbortedError
+
+_WHITESPACE = " \t\r\n"
+_FENCE = "```"
+
+
+@dataclass(frozen=True)
+class ItemStream:
+    # The items are the array under this key of a top-level object, or the
+    # top-level array itself if None (or, for a schema-constrained output,
+    # the array under the schema's root_key).
+    key: str | None = None
+    # Raises ValueError for an item that makes the whole output invalid;
+    # an item a ``repair`` callback could fix shouldn't be checked here.
+    check_item: Callable[[int, object], None] | None = None
+    max_items: int | None = None
+
+
+class StreamChecker:
+    def __init__(self, spec: ItemStream, structured: bool = False, root_key: str | None = None):
+        self.spec = spec
+        self.structured = structured
+        self.key = spec.key if spec.key is not None or not structured else root_key
+        self.chars = 0
+        self.items = 0
+        self._lead = ""  # text before the JSON starts, until it does
+        self._started = False
+        self._done = False  # past the items, or gave up on a prose lead-in
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False  # at the top level of an object, before a ':'
+        self._key: list[str] | None = None
+        self._last_key: str | None = None
+        self._items_depth: int | None = None
+        self._item: list[str] | None = None
+
+    def _abort(self, reason: str):
+        raise StreamAbortedError(f"Aborted stream after {self.chars} chars: {reason}", self.chars)
+
+    def feed(self, delta: str) -> None:
+        """Consume the next chunk of output text; raises StreamAbortedError
+        once the output is known to be invalid."""
+        self.chars += len(delta)
+        if self._done:
+            return
+        if not self._started:
+            self._lead += delta
+            delta = self._skip_lead_in()
+            if delta is None:
+                return
+        for ch in delta:
+            self._step(ch)
+            if self._done:
+                return
+
+    def _skip_lead_in(self) -> str | None:
+        """The text from the JSON's first character on, once it's known;
+        None while still waiting (or after giving up)."""
+        text = self._lead.lstrip(_WHITESPACE)
+        in_fence = False
+        if text.startswith(_FENCE[: len(text)]) and not self.structured:
+            if len(text) < len(_FENCE) or "\n" not in text:
+                return None  # wait for the end of the fence line
+            header, text = text[len(_FENCE) :].split("\n", 1)
+            if header.strip() not in ("", "json"):
+                self._done = True
+                return None
+            text, in_fence = text.lstrip(_WHITESPACE), True
+            if not text:
+                self._lead = _FENCE + "\n"
+                return None
+        if not text:
+            return None
+        expected = "[" if self.key is None else "{"
+        if text[0] in "[{":
+            if text[0] != expected:
+                self._abort(f"expected a JSON {'array' if expected == '[' else 'object'}")
+            self._started = True
+            return text
+        if self.structured or in_fence:
+            self._abort("output isn't JSON")
+        self._done = True  # prose first: a fence may still follow
+        return None
+
+    def _step(self, ch: str) -> None:
+        depth = len(self._stack)
+        if self._item is not None:
+            self._item.append(ch)
+        elif depth == self._items_depth and not self._in_string and ch not in _WHITESPACE + ",]":
+            self._item = [ch]
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if self._key is not None:
+                    self._last_key, self._key = "".join(self._key), None
+            elif self._key is not None:
+                self._key.append(ch)
+            return
+
+        if ch == '"':
+            self._in_string = True
+            if depth == 1 and self._expect_key:
+                self._key = []
+        elif ch in "[{":
+            if depth == 0 and self.key is None:
+                self._items_depth = 1
+            elif depth == 1 and self._stack[0] == "{" and not self._expect_key and ch == "[":
+                if self._last_key == self.key:
+                    self._items_depth = 2
+            self._stack.append(ch)
+            if len(self._stack) == 1 and ch == "{":
+                self._expect_key = True
+        elif ch in "]}":
+            if not self._stack or "[{"["]}".index(ch)] != self._stack[-1]:
+                self._abort(f"unexpected {ch!r}")
+            if depth == self._items_depth:
+                if self._item is not None:
+                    self._finish_item()
+                self._done = True  # the rest is left to validate
+            self._stack.pop()
+            if not self._stack:
+                self._done = True
+        elif ch == ",":
+            if depth == self._items_depth:
+                if self._item is None:
+                    self._abort("empty item")
+                self._finish_item()
+            elif depth == 1 and self._stack[0] == "{":
+                self._expect_key = True
+        elif ch == ":" and depth == 1:
+            self._expect_key = False
+
+    def _finish_item(self) -> None:
+        text, self._item = "".join(self._item[:-1]), None
+        index = self.items
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError:
+            self._abort(f"item {index} isn't valid JSON: {text[:80]!r}")
+        if self.spec.max_items is not None and index >= self.spec.max_items:
+            self._abort(f"more than the expected {self.spec.max_items} items")
+        if self.spec.check_item is not None:
+            try:
+                self.spec.check_item(index, item)
+            except ValueError as e:
+                self._abort(str(e))
+        self.items += 1
@@ -0,0 +1,345 @@
+"""A local fake of the OpenAI Responses API, for load-testing our own code.
+
+Measuring the pipeline's own throughput against the real API costs tokens,
+and its numbers are dominated by the provider's latency on the day. This
+server answers ``POST /v1/responses`` the way the pipeline needs - plain or
+streamed (SSE), schema-constrained or not - after a latency drawn from a
+configurable distribution, and never looks at an image:
+
+- Structured outputs are generated from the request's JSON schema, with one
+  array item per numbered atom in the prompt's variable part (the atoms to
+  judge), so they pass the stages' ``validate`` callbacks. Plain requests
+  get a short prose representation.
+- ``rate_limit_share`` of requests get a 429, and ``malformed_share`` an
+  output the stage must reject: cut off halfway, or a refusal.
+- Usage is accounted like the API's: ~4 chars per token, a flat token count
+  per image, and a prompt's static first part billed as cached once it has
+  been seen before (past 1024 tokens, in 128-token steps). ``GET /usage``
+  reports the totals; ``POST /usage/reset`` clears them.
+
+Outputs are seeded from the request, so the same request gets the same
+answer (fault injection aside). ``benchmarks/bench_pipeline.py`` runs
+``evaluate_image`` against it.
+
+Usage:
+    uv run -m vibeai.llm.mock_server --port 8100 --latency lognormal:0.8,0.5
+    uv run -m vibeai.llm.mock_server --latency fixed:0.1 --rate-limit-share 0.05 --malformed-share 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=mock uv run pytest tests/test_plausibility.py -s
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from dataclasses import asdict, dataclass, field
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+CHARS_PER_TOKEN = 4
+IMAGE_TOKENS = {"low": 85, "high": 765, "auto": 765}
+CACHE_MIN_TOKENS = 1024
+CACHE_STEP_TOKENS = 128
+STREAM_CHUNK_CHARS = 16
+
+_NUMBERED_LINE = re.compile(r"^\s*\d+\.\s+(.+)$", re.MULTILINE)
+_WORDS = (
+    "warm light soft shadows quiet street morning haze muted colours calm water open sky "
+    "weathered wood busy market neon reflections long exposure faded film grain golden hour"
+).split()
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """Seconds to the first output byte: ``fixed:S``, ``uniform:LO,HI`` or
+    ``lognormal:MEDIAN,SIGMA``. A ``tail_share`` of requests take
+    ``tail_factor`` times as long, for stragglers."""
+
+    kind: str = "lognormal"
+    params: tuple[float, ...] = (0.5, 0.4)
+    tail_share: float = 0.0
+    tail_factor: float = 8.0
+
+    @classmethod
+    def parse(cls, spec: str, **tail) -> "LatencyModel":
+        kind, _, raw = spec.partition(":")
+        params = tuple(float(x) for x in raw.split(",")) if raw else ()
+        arity = {"fixed": 1, "uniform": 2, "lognormal": 2}
+        if kind not in arity or len(params) != arity[kind]:
+            raise ValueError(
+                f"Bad latency spec {spec!r}; expected fixed:S, uniform:LO,HI or lognormal:MEDIAN,SIGMA"
+            )
+        return cls(kind, params, **tail)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            seconds = self.params[0]
+        elif self.kind == "uniform":
+            seconds = rng.uniform(*self.params)
+        else:
+            median, sigma = self.params
+            seconds = rng.lognormvariate(math.log(median), sigma)
+        return seconds * (self.tail_factor if rng.random() < self.tail_share else 1)
+
+
+@dataclass(frozen=True)
+class MockConfig:
+    latency: LatencyModel = LatencyModel()
+    seconds_per_output_token: float = 0.002
+    rate_limit_share: float = 0.0
+    malformed_share: float = 0.0
+    seed: int = 0
+
+
+@dataclass
+class MockUsage:
+    requests: int = 0
+    streamed: int = 0
+    rate_limited: int = 0
+    malformed: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+
+
+@dataclass
+class MockReply:
+    status: int  # 200 or 429
+    text: str = ""
+    response: dict = field(default_factory=dict)
+    delay: float = 0.0  # seconds before the first byte
+    seconds_per_chunk: float = 0.0
+
+
+def _tokens(chars: int) -> int:
+    return max(1, math.ceil(chars / CHARS_PER_TOKEN))
+
+
+def _content_parts(body: dict) -> list[dict]:
+    if isinstance(body.get("input"), str):
+        return [{"type": "input_text", "text": body["input"]}]
+    return [part for message in body.get("input", []) for part in message.get("content", [])]
+
+
+def _fake(schema: dict, rng: random.Random, atoms: list[str], key: str | None = None):
+    """A value matching ``schema``: arrays get one item per input atom (or a
+    few, if there are none) and ``atom`` fields are filled with the atom."""
+    if "anyOf" in schema:
+        return _fake(next(s for s in schema["anyOf"] if s.get("type") != "null"), rng, atoms, key)
+    kind = schema.get("type")
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if kind == "object":
+        return {k: _fake(s, rng, atoms, k) for k, s in schema.get("properties", {}).items()}
+    if kind == "array":
+        if atoms and schema.get("items", {}).get("type") == "object":
+            return [_fake(schema["items"], rng, [atom], None) for atom in atoms]
+        return [_fake(schema.get("items", {}), rng, [], None) for _ in range(rng.randint(3, 8))]
+    if kind == "boolean":
+        return rng.random() < 0.85
+    if kind in ("integer", "number"):
+        lo, hi = schema.get("minimum", 0), schema.get("maximum", 10)
+        return rng.randint(lo, hi) if kind == "integer" else round(rng.uniform(lo, hi), 2)
+    if key == "atom" and len(atoms) == 1:
+        return atoms[0]
+    return " ".join(rng.choices(_WORDS, k=rng.randint(4, 12))).capitalize() + "."
+
+
+def _consistent(name: str, value):
+    """Fix-ups for what a stage's validator checks beyond its schema."""
+    if name == "decomposition_judgement":
+        entries = value["atomic_judgement"]
+        for entry in entries:
+            entry["verdict"] = "Good" if all(entry["evaluation"].values()) else "Bad"
+        good = sum(entry["verdict"] == "Good" for entry in entries)
+        value["final_verdict"]["atom_quality"].update(
+            good_atom_count=good,
+            total_atom_count=len(entries),
+            verdict=round(5 * good / max(len(entries), 1), 2),
+        )
+    return value
+
+
+def fake_output(body: dict, rng: random.Random) -> str:
+    """The output text a well-behaved model might give for ``body``."""
+    text_parts = [p["text"] for p in _content_parts(body) if p.get("type") == "input_text"]
+    atoms = _NUMBERED_LINE.findall(text_parts[-1]) if len(text_parts) > 1 else []
+    text_format = (body.get("text") or {}).get("format") or {}
+    if text_format.get("type") != "json_schema":
+        return " ".join(rng.choices(_WORDS, k=60)).capitalize() + "."
+    value = _fake(text_format["schema"], rng, atoms)
+    return json.dumps(_consistent(text_format.get("name"), value))
+
+
+def _malformed(text: str, rng: random.Random) -> str:
+    return text[: len(text) // 2] if rng.random() < 0.5 else "I'm sorry, I can't help with that."
+
+
+class MockResponses:
+    """The server's state: what to answer, and the usage totals."""
+
+    def __init__(self, config: MockConfig = MockConfig()):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.usage = MockUsage()
+        self._seen_prefixes: set[str] = set()
+
+    def reply(self, body: dict) -> MockReply:
+        config, rng = self.config, self.rng
+        self.usage.requests += 1
+        self.usage.streamed += bool(body.get("stream"))
+        delay = config.latency.sample(rng)
+        if rng.random() < config.rate_limit_share:
+            self.usage.rate_limited += 1
+            return MockReply(429, delay=delay)
+
+        seed = hashlib.sha256(json.dumps(body, sort_keys=True).encode()).digest()
+        text = fake_output(body, random.Random(seed))
+        if rng.random() < config.malformed_share:
+            self.usage.malformed += 1
+            text = _malformed(text, rng)
+        response = self._response(body, text)
+        chunks = max(1, math.ceil(len(text) / STREAM_CHUNK_CHARS))
+        per_chunk = response["usage"]["output_tokens"] * config.seconds_per_output_token / chunks
+        return MockReply(200, text, response, delay, per_chunk)
+
+    def _response(self, body: dict, text: str) -> dict:
+        parts = _content_parts(body)
+        input_tokens = sum(
+            IMAGE_TOKENS.get(p.get("detail"), IMAGE_TOKENS["auto"])
+            if p.get("type") == "input_image"
+            else _tokens(len(p["text"]))
+            for p in parts
+        )
+        cached = 0
+        if parts and parts[0].get("type") == "input_text":
+            prefix_tokens = _tokens(len(parts[0]["text"]))
+            key = hashlib.sha256(f"{body.get('model')}\n{parts[0]['text']}".encode()).hexdigest()
+            if key in self._seen_prefixes and prefix_tokens >= CACHE_MIN_TOKENS:
+                cached = prefix_tokens // CACHE_STEP_TOKENS * CACHE_STEP_TOKENS
+            self._seen_prefixes.add(key)
+        output_tokens = _tokens(len(text))
+        self.usage.input_tokens += input_tokens
+        self.usage.cached_tokens += cached
+        self.usage.output_tokens += output_tokens
+        n = self.usage.requests
+        return {
+            "id": f"resp_mock_{n}",
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": "completed",
+            "model": body.get("model"),
+            "output": [
+                {
+                    "id": f"msg_mock_{n}",
+                    "type": "message",
+                    "role": "assistant",
+                    "status": "completed",
+                    "content": [{"type": "output_text", "text": text, "annotations": []}],
+                }
+            ],
+            "usage": {
+                "input_tokens": input_tokens,
+                "input_tokens_details": {"cached_tokens": cached},
+                "output_tokens": output_tokens,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": input_tokens + output_tokens,
+            },
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "error": None,
+            "incomplete_details": None,
+        }
+
+
+def _sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def _stream(reply: MockReply):
+    sequence = iter(range(1_000_000))
+    created = {**reply.response, "status": "in_progress", "output": []}
+    yield _sse({"type": "response.created", "sequence_number": next(sequence), "response": created})
+    await asyncio.sleep(reply.delay)
+    item_id = reply.response["output"][0]["id"]
+    for i in range(0, len(reply.text), STREAM_CHUNK_CHARS):
+        yield _sse(
+            {
+                "type": "response.output_text.delta",
+                "sequence_number": next(sequence),
+                "item_id": item_id,
+                "output_index": 0,
+                "content_index": 0,
+                "delta": reply.text[i : i + STREAM_CHUNK_CHARS],
+                "logprobs": [],
+            }
+        )
+        await asyncio.sleep(reply.seconds_per_chunk)
+    yield _sse({"type": "response.completed", "sequence_number": next(sequence), "response": reply.response})
+
+
+def create_app(config: MockConfig = MockConfig()) -> FastAPI:
+    app = FastAPI(title="Mock OpenAI Responses API")
+    mock = MockResponses(config)
+    app.state.mock = mock
+
+    @app.post("/v1/responses")
+    async def responses(request: Request):
+        body = await request.json()
+        reply = mock.reply(body)
+        if reply.status == 429:
+            await asyncio.sleep(min(reply.delay, 0.05))
+            error = {"message": "Rate limit reached (mock)", "code": "rate_limit_exceeded"}
+            return JSONResponse({"error": error}, status_code=429)
+        if body.get("stream"):
+            return StreamingResponse(_stream(reply), media_type="text/event-stream")
+        chunks = math.ceil(len(reply.text) / STREAM_CHUNK_CHARS)
+        await asyncio.sleep(reply.delay + chunks * reply.seconds_per_chunk)
+        return reply.response
+
+    @app.get("/usage")
+    def usage() -> dict:
+        return asdict(mock.usage)
+
+    @app.post("/usage/reset")
+    def reset_usage() -> dict:
+        mock.usage = MockUsage()
+        return asdict(mock.usage)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument(
+        "--latency", default="lognormal:0.5,0.4", help="fixed:S, uniform:LO,HI or lognormal:MEDIAN,SIGMA"
+    )
+    parser.add_argument("--tail-share", type=float, default=0.0, help="Share of requests slowed down")
+    parser.add_argument("--tail-factor", type=float, default=8.0)
+    parser.add_argument("--seconds-per-output-token", type=float, default=0.002)
+    parser.add_argument("--rate-limit-share", type=float, default=0.0)
+    parser.add_argument("--malformed-share", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import uvicorn  # only needed to serve; the app itself doesn't
+
+    config = MockConfig(
+        latency=LatencyModel.parse(args.latency, tail_share=args.tail_share, tail_factor=args.tail_factor),
+        seconds_per_output_token=args.seconds_per_output_token,
+        rate_limit_share=args.rate_limit_share,
+        malformed_share=args.malformed_share,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
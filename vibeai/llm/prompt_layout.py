@@ -0,0 +1,66 @@
+"""Static-first prompt layout, for provider-side prompt caching.
+
+The API bills (and serves faster) input tokens that repeat a recently seen
+prompt prefix. Our templates put the per-call content - representation,
+atom list - in the middle or at the end of the text, and the image came
+after all of it. So the prefix shared by every call of a stage stopped
+wherever the first variable field appeared.
+
+A ``Prompt`` keeps the template and its fields apart. The client sends its
+``static`` part first, then the image if any, then the ``variable`` part.
+A placeholder on a line of its own is moved, with the heading line just
+above it ("### Vibe Representation", "Vibe Representation:"), to the
+variable part at the end, in template order. The judges' long rubrics then
+form one prefix shared by every image. For the plausibility judge, the
+image extends that prefix across decomposition versions of the same
+image.
+
+The LLM response cache stays keyed by the ``inline`` prompt (the template
+filled in place, as before), so existing cache entries still hit.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+
+_PLACEHOLDER_LINE = re.compile(r"^\{(\w+)\}$")
+
+
+def _is_heading(line: str) -> bool:
+    line = line.strip()
+    return bool(line) and (line.startswith("#") or line.endswith(":"))
+
+
+@dataclass(frozen=True)
+class Prompt:
+    template: str
+    fields: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def inline(self) -> str:
+        return self.template.format(**self.fields)
+
+    @property
+    def parts(self) -> tuple[str, str]:
+        """(static, variable). Raises ValueError if a field is used inline
+        in a sentence rather than on a line of its own."""
+        static_lines, sections = [], []
+        for line in self.template.split("\n"):
+            match = _PLACEHOLDER_LINE.match(line.strip())
+            if match is None:
+                static_lines.append(line)
+                continue
+            heading = static_lines.pop().strip() if static_lines and _is_heading(static_lines[-1]) else None
+            value = self.fields[match.group(1)]
+            sections.append(value if heading is None else f"{heading}\n{value}")
+        try:
+            static = "\n".join(static_lines).format()  # un-escapes {{ }}
+        except (KeyError, IndexError) as e:
+            raise ValueError(f"Template uses field {e} inline; can't move it last") from e
+        static = re.sub(r"\n{3,}", "\n\n", static).strip()
+        return static, "\n\n".join(sections)
+
+    @property
+    def cache_key(self) -> str:
+        """A ``prompt_cache_key`` grouping calls that share the static part."""
+        return "vibeai-" + hashlib.sha256(self.parts[0].encode()).hexdigest()[:16]
@@ -0,0 +1,65 @@
+"""Structured outputs: JSON-schema-constrained responses.
+
+Each stage whose output is parsed as JSON declares an ``OutputSchema``, and
+``vibeai.llm.client`` sends it as the Responses API's ``text.format``. The
+model's decoding is then constrained to that shape, so malformed JSON,
+missing keys and wrong types no longer cost a validation retry (each of
+which is a whole paid call plus backoff). Stage ``validate`` callbacks
+still run on top for what a schema can't say, e.g. "one entry per input
+atom" or a verdict consistent with its criteria.
+
+Strict mode needs an object at the root, so stages whose output is a JSON
+array set ``root_key``: the request asks for ``{root_key: [...]}`` and the
+client hands back just the array, so validators and the LLM cache see the
+same text either way. If a model rejects the schema, the client drops back
+to plain prompting for that model, with ``vibeai.eval.parsing`` doing the
+parsing as before.
+"""
+
+import json
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class OutputSchema:
+    name: str
+    schema: dict  # JSON schema of the stage's output (of the array, if root_key is set)
+    root_key: str | None = None
+
+    @property
+    def text_format(self) -> dict:
+        schema = self.schema
+        if self.root_key is not None:
+            schema = strict_object({self.root_key: schema})
+        return {"format": {"type": "json_schema", "name": self.name, "schema": schema, "strict": True}}
+
+    def unwrap(self, output_text: str) -> str:
+        """The stage's output from a schema-constrained response. Raises
+        ValueError (retried like a validation failure) on a truncated or
+        refused response."""
+        if self.root_key is None:
+            return output_text
+        try:
+            return json.dumps(json.loads(output_text)[self.root_key])
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            raise ValueError(f"Structured output missing {self.root_key!r}: {output_text!r}") from e
+
+
+def strict_object(properties: dict[str, dict]) -> dict:
+    """An object schema as strict mode wants it: every property required,
+    nothing else allowed."""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def nullable(schema: dict) -> dict:
+    return {"anyOf": [schema, {"type": "null"}]}
+
+
+STRING = {"type": "string"}
+BOOLEAN = {"type": "boolean"}
+STRING_LIST = {"type": "array", "items": STRING}
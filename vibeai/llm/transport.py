@@ -0,0 +1,104 @@
+"""Connection pool, keep-alive, HTTP/2 and timeouts for the OpenAI clients.
+
+The SDK's default HTTP client is tuned for a handful of requests, not a
+batch run's 30-100 concurrent ones: idle connections are closed after 5s,
+so the gaps between an image's stages (image loading, parsing, a retry's
+backoff) are enough to cost a new TCP + TLS handshake on the next call, and
+only 100 idle connections are kept at all. ``TransportConfig`` sizes the
+pool for a run's concurrency, keeps connections alive across those gaps,
+multiplexes requests over HTTP/2 where the ``h2`` package is installed, and
+sets connect/read timeouts explicitly. A streamed request gets its stage's
+(call type's) read timeout, so a stuck stream fails fast and is retried
+instead of waiting out the SDK's 600s. A non-streamed response only sends
+its first byte once it's complete, so it keeps the full 600s: a judge call
+on a reasoning model can legitimately take that long.
+
+The sync and async clients are built from the same config. Everything is
+built from types the ``openai`` package re-exports, so it follows whichever
+httpx build the SDK was installed with. ``benchmarks/bench_transport.py``
+measures what a config saves per request against a local server.
+"""
+
+import importlib.util
+from dataclasses import dataclass
+
+from openai import DEFAULT_CONNECTION_LIMITS, DefaultAsyncHttpxClient, DefaultHttpxClient, Timeout
+
+# The SDK's httpx Limits type; openai re-exports its default limits but not the class.
+Limits = type(DEFAULT_CONNECTION_LIMITS)
+
+# Seconds between bytes of a streamed response, per stage. Judge calls on
+# reasoning models can think for minutes before their first output;
+# decomposition and repair calls don't.
+DEFAULT_READ_TIMEOUTS = (
+    ("decompose", 120.0),
+    ("judge", 300.0),
+    ("judge_repair", 180.0),
+)
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    max_connections: int = 200
+    max_keepalive_connections: int = 200
+    # Seconds an idle connection is kept open for reuse (the SDK default is 5).
+    keepalive_expiry: float = 90.0
+    # Only takes effect with the h2 package installed (httpx's "http2" extra).
+    http2: bool = True
+    connect_timeout: float = 10.0
+    # Seconds a request waits for a free connection from the pool.
+    pool_timeout: float = 60.0
+    write_timeout: float = 60.0
+    # Seconds to wait for a non-streamed response, or between bytes of a
+    # streamed one whose call type isn't in read_timeouts.
+    read_timeout: float = 600.0
+    read_timeouts: tuple[tuple[str, float], ...] = DEFAULT_READ_TIMEOUTS
+
+    @classmethod
+    def for_concurrency(cls, concurrency: int, **overrides) -> "TransportConfig":
+        """A pool sized for ``concurrency`` images in flight: twice that many
+        connections, for judges fanning out and hedged or speculative
+        duplicates of a request (see vibeai.llm.hedging)."""
+        size = max(2 * concurrency, 10)
+        return cls(max_connections=size, max_keepalive_connections=size, **overrides)
+
+    @property
+    def uses_http2(self) -> bool:
+        return self.http2 and http2_available()
+
+    def limits(self):
+        return Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeout(self, call_type: str | None = None, streamed: bool = False) -> Timeout:
+        read = dict(self.read_timeouts).get(call_type, self.read_timeout) if streamed else self.read_timeout
+        return Timeout(
+            connect=self.connect_timeout, read=read, write=self.write_timeout, pool=self.pool_timeout
+        )
+
+    def http_client(self) -> DefaultHttpxClient:
+        return DefaultHttpxClient(limits=self.limits(), timeout=self.timeout(), http2=self.uses_http2)
+
+    def async_http_client(self) -> DefaultAsyncHttpxClient:
+        return DefaultAsyncHttpxClient(limits=self.limits(), timeout=self.timeout(), http2=self.uses_http2)
+
+
+_transport = TransportConfig()
+
+
+def set_transport(config: TransportConfig) -> None:
+    """Use ``config`` for clients built from now on (``vibeai.llm.client``
+    keeps one client per config, so earlier ones keep theirs)."""
+    global _transport
+    _transport = config
+
+
+def get_transport() -> TransportConfig:
+    return _transport
@@ -5,6 +5,21 @@ each day, no history). This module appends one JSONL record per actual API
 call (cache hits don't call the API, so they aren't logged), so usage can be
 broken down by day / model / call type after the fact - e.g. to see which
 pipeline step or prompt-iteration run is driving spend.
+
+Each record also says which attempt of its call it was, whether the output
+was schema-constrained (``vibeai.llm.structured``), and why the stage's
+validation rejected it if it did, so retry rates are measurable too. It
+records the call's wall-clock latency, its time to first byte where that's
+known (streamed calls), and, for a retry, what made the previous attempt
+fail.
+
+Besides these "call" records, the log holds events without token counts
+(``log_event``): "cache_hit" when a client call was answered from the LLM
+cache, "api_error" when an attempt failed at the API (rate limit, server
+error, dropped connection), and "stream_aborted" when a streamed output was
+cut off as invalid. So cache hit rates and time lost to failed attempts
+are visible in ``vibeai.llm.usage_report`` too. Records written before
+events existed have no "event" field and are calls.
 """
 
 import json
@@ -15,15 +30,47 @@ from pathlib import Path
 USAGE_LOG_PATH = Path(".cache/llm_usage/calls.jsonl")
 
 _lock = threading.Lock()
+# Rejected outputs are often whole JSON documents; the log keeps the start.
+_MAX_ERROR_CHARS = 200
+
+
+def describe_error(exc: Exception) -> str:
+    return f"{type(exc).__name__}: {exc}"[:_MAX_ERROR_CHARS]
 
 
-def log_call(model: str, call_type: str, usage) -> None:
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def _append(record: dict) -> None:
+    with _lock:
+        USAGE_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with USAGE_LOG_PATH.open("a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def log_call(
+    model: str,
+    call_type: str,
+    usage,
+    *,
+    attempt: int = 1,
+    structured: bool = False,
+    validation_error: Exception | None = None,
+    latency: float | None = None,
+    ttfb: float | None = None,
+    retry_reason: str | None = None,
+) -> None:
     """Append one record for a real (non-cached) API call.
 
     ``usage`` is the ``response.usage`` object from the OpenAI Responses API.
+    ``attempt`` counts from 1 within one client call, across transient-error
+    and validation retries alike; ``retry_reason`` says why attempt - 1
+    failed. ``latency`` and ``ttfb`` are in seconds, logged as ms.
     """
     record = {
         "timestamp": datetime.now(UTC).isoformat(),
+        "event": "call",
         "model": model,
         "call_type": call_type,
         "input_tokens": usage.input_tokens,
@@ -31,20 +78,68 @@ def log_call(model: str, call_type: str, usage) -> None:
         "output_tokens": usage.output_tokens,
         "reasoning_tokens": usage.output_tokens_details.reasoning_tokens,
         "total_tokens": usage.total_tokens,
+        "attempt": attempt,
+        "structured": structured,
+        "validation_error": None if validation_error is None else describe_error(validation_error),
+        "retry_reason": retry_reason,
+        "latency_ms": _ms(latency),
+        "ttfb_ms": _ms(ttfb),
     }
-    with _lock:
-        USAGE_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with USAGE_LOG_PATH.open("a") as f:
-            f.write(json.dumps(record) + "\n")
+    _append(record)
 
 
-def read_calls(path: Path = USAGE_LOG_PATH) -> list[dict]:
+def log_event(
+    model: str,
+    call_type: str,
+    event: str,
+    *,
+    attempt: int | None = None,
+    retry_reason: str | None = None,
+    latency: float | None = None,
+    error: Exception | None = None,
+    **fields,
+) -> None:
+    """Append a token-free record: a "cache_hit"; for an attempt that
+    ended without a response, an "api_error" or a "stream_aborted" (see
+    ``vibeai.llm.incremental``; its output tokens were billed, but the
+    stream was cut off before reporting them); or a "hedge" (see
+    ``vibeai.llm.hedging``). ``fields`` are added to the record as is."""
+    record = {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "event": event,
+        "model": model,
+        "call_type": call_type,
+    }
+    if attempt is not None:
+        record.update(attempt=attempt, retry_reason=retry_reason)
+    if latency is not None:
+        record["latency_ms"] = _ms(latency)
+    if error is not None:
+        record["error"] = describe_error(error)
+        record["status_code"] = getattr(error, "status_code", None)
+        if hasattr(error, "output_chars"):
+            record["output_chars"] = error.output_chars
+    record.update(fields)
+    _append(record)
+
+
+def is_call(record: dict) -> bool:
+    return record.get("event", "call") == "call"
+
+
+def read_records(path: Path = USAGE_LOG_PATH) -> list[dict]:
+    """Every record: calls and events."""
     if not path.exists():
         return []
-    calls = []
+    records = []
     with path.open() as f:
         for line in f:
             line = line.strip()
             if line:
-                calls.append(json.loads(line))
-    return calls
+                records.append(json.loads(line))
+    return records
+
+
+def read_calls(path: Path = USAGE_LOG_PATH) -> list[dict]:
+    """Only the token-spending call records."""
+    return [r for r in read_records(path) if is_call(r)]
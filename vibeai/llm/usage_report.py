@@ -3,7 +3,17 @@
 Breaks down token usage (and estimated cost) by day, model, and call type
 (represent / decompose / judge / etc.) so it's possible to see which
 pipeline step or run is driving spend, rather than only the single running
-daily total kept by ``vibeai.llm.budget``.
+daily total kept by ``vibeai.llm.budget``. Per call type it also shows how
+many calls were schema-constrained, how many outputs failed validation, and
+how many calls were retries. It also shows the share of input tokens served
+from the provider's prompt cache, per call type and model (see
+``vibeai.llm.prompt_layout``).
+
+Per call type and model it also shows latency percentiles, the tokens
+spent on outputs that validation rejected (the retry overhead), failed API
+attempts, streams aborted as invalid and the LLM cache hit rate, plus what
+triggered retries and how often hedged requests won. Records from before
+latency and events were logged just don't contribute there.
 
 Usage:
     python -m vibeai.llm.usage_report
@@ -11,10 +21,11 @@ Usage:
 """
 
 import argparse
+import math
 from collections import defaultdict
 from datetime import date
 
-from vibeai.llm.usage_log import USAGE_LOG_PATH, read_calls
+from vibeai.llm.usage_log import USAGE_LOG_PATH, is_call, read_records
 
 # $ per 1M tokens, standard (non-batch/flex) API pricing. Cached input tokens
 # are a subset of input_tokens, billed at the cheaper cached rate instead of
@@ -81,14 +92,150 @@ def _print_table(title: str, totals: dict) -> None:
         )
 
 
+def _print_validation_table(calls: list[dict]) -> None:
+    """Records from before attempts/validation were logged count as
+    unstructured first attempts that passed."""
+    totals = defaultdict(lambda: {"calls": 0, "structured": 0, "rejected": 0, "retries": 0})
+    for call in calls:
+        bucket = totals[call["call_type"]]
+        bucket["calls"] += 1
+        bucket["structured"] += bool(call.get("structured"))
+        bucket["rejected"] += call.get("validation_error") is not None
+        bucket["retries"] += call.get("attempt", 1) > 1
+    print("\nValidation by call type")
+    print(f"{'':20s}{'calls':>8s}{'structured':>12s}{'rejected':>10s}{'reject %':>10s}{'retry %':>10s}")
+    for key in sorted(totals):
+        t = totals[key]
+        print(
+            f"{key:20s}{t['calls']:>8d}{t['structured']:>12d}{t['rejected']:>10d}"
+            f"{t['rejected'] / t['calls']:>10.1%}{t['retries'] / t['calls']:>10.1%}"
+        )
+
+
+def _print_prompt_cache_table(calls: list[dict]) -> None:
+    totals = defaultdict(lambda: {"calls": 0, "hits": 0, "input_tokens": 0, "cached_tokens": 0})
+    for call in calls:
+        bucket = totals[(call["call_type"], call["model"])]
+        bucket["calls"] += 1
+        bucket["hits"] += call["cached_tokens"] > 0
+        bucket["input_tokens"] += call["input_tokens"]
+        bucket["cached_tokens"] += call["cached_tokens"]
+    print("\nPrompt caching by call type / model")
+    print(f"{'':32s}{'calls':>8s}{'hit %':>8s}{'input':>12s}{'cached':>12s}{'cached %':>10s}")
+    for (call_type, model) in sorted(totals):
+        t = totals[(call_type, model)]
+        ratio = t["cached_tokens"] / t["input_tokens"] if t["input_tokens"] else 0.0
+        print(
+            f"{f'{call_type} / {model}':32s}{t['calls']:>8d}{t['hits'] / t['calls']:>8.0%}"
+            f"{t['input_tokens']:>12d}{t['cached_tokens']:>12d}{ratio:>10.1%}"
+        )
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending, non-empty list."""
+    rank = max(math.ceil(q / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def _fmt_seconds(values: list[float], q: float) -> str:
+    return f"{_percentile(values, q) / 1000:.2f}" if values else "-"
+
+
+def _print_latency_table(records: list[dict]) -> None:
+    """A cache lookup that missed shows up as the first attempt of a call
+    (or an "api_error" event for it), so the hit rate is hits over hits
+    plus first attempts."""
+    totals = defaultdict(
+        lambda: {
+            "calls": 0,
+            "latencies": [],
+            "ttfbs": [],
+            "tokens": 0,
+            "rejected_tokens": 0,
+            "api_errors": 0,
+            "aborted": 0,
+            "hits": 0,
+            "lookups": 0,
+        }
+    )
+    for record in records:
+        event = record.get("event", "call")
+        if event not in ("call", "cache_hit", "api_error", "stream_aborted"):
+            continue  # e.g. "hedge": see _print_hedge_table
+        bucket = totals[(record["call_type"], record["model"])]
+        if event == "cache_hit":
+            bucket["hits"] += 1
+            bucket["lookups"] += 1
+            continue
+        bucket["lookups"] += record.get("attempt", 1) == 1
+        if event in ("api_error", "stream_aborted"):
+            bucket["api_errors" if event == "api_error" else "aborted"] += 1
+            continue
+        bucket["calls"] += 1
+        bucket["tokens"] += record["total_tokens"]
+        if record.get("validation_error") is not None:
+            bucket["rejected_tokens"] += record["total_tokens"]
+        if record.get("latency_ms") is not None:
+            bucket["latencies"].append(record["latency_ms"])
+        if record.get("ttfb_ms") is not None:
+            bucket["ttfbs"].append(record["ttfb_ms"])
+
+    print("\nLatency (s), retry overhead and LLM cache hits by call type / model")
+    print(
+        f"{'':32s}{'calls':>7s}{'p50':>7s}{'p95':>7s}{'p99':>7s}{'ttfb50':>8s}"
+        f"{'retry tok':>11s}{'retry %':>9s}{'api err':>9s}{'aborted':>9s}{'cache hit':>11s}"
+    )
+    for (call_type, model) in sorted(totals):
+        t = totals[(call_type, model)]
+        latencies, ttfbs = sorted(t["latencies"]), sorted(t["ttfbs"])
+        overhead = t["rejected_tokens"] / t["tokens"] if t["tokens"] else 0.0
+        hit_rate = f"{t['hits'] / t['lookups']:.0%}" if t["lookups"] else "-"
+        print(
+            f"{f'{call_type} / {model}':32s}{t['calls']:>7d}"
+            f"{_fmt_seconds(latencies, 50):>7s}{_fmt_seconds(latencies, 95):>7s}"
+            f"{_fmt_seconds(latencies, 99):>7s}{_fmt_seconds(ttfbs, 50):>8s}"
+            f"{t['rejected_tokens']:>11d}{overhead:>9.1%}"
+            f"{t['api_errors']:>9d}{t['aborted']:>9d}{hit_rate:>11s}"
+        )
+
+
+def _print_retry_reasons(records: list[dict]) -> None:
+    counts = defaultdict(int)
+    for record in records:
+        if record.get("retry_reason"):
+            counts[(record["call_type"], record["retry_reason"])] += 1
+    if not counts:
+        return
+    print("\nRetries by reason")
+    for (call_type, reason), count in sorted(counts.items(), key=lambda kv: (kv[0][0], -kv[1])):
+        print(f"{call_type:20s}{reason:48s}{count:>8d}")
+
+
+def _print_hedge_table(records: list[dict]) -> None:
+    totals = defaultdict(lambda: {"hedges": 0, "won": 0})
+    for record in records:
+        if record.get("event") == "hedge":
+            bucket = totals[(record["call_type"], record["model"])]
+            bucket["hedges"] += 1
+            bucket["won"] += bool(record.get("won"))
+    if not totals:
+        return
+    print("\nHedged requests by call type / model (see vibeai.llm.hedging)")
+    print(f"{'':32s}{'hedges':>8s}{'won':>8s}{'won %':>8s}")
+    for (call_type, model) in sorted(totals):
+        t = totals[(call_type, model)]
+        print(f"{f'{call_type} / {model}':32s}{t['hedges']:>8d}{t['won']:>8d}{t['won'] / t['hedges']:>8.0%}")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--since", type=date.fromisoformat, default=None, help="YYYY-MM-DD, inclusive")
     args = parser.parse_args()
 
-    calls = read_calls()
+    records = read_records()
     if args.since is not None:
-        calls = [c for c in calls if date.fromisoformat(c["timestamp"][:10]) >= args.since]
+        records = [r for r in records if date.fromisoformat(r["timestamp"][:10]) >= args.since]
+    calls = [r for r in records if is_call(r)]
 
     if not calls:
         print(f"No usage recorded in {USAGE_LOG_PATH} (yet).")
@@ -108,6 +255,11 @@ def main() -> None:
     _print_table("By day", _bucket_totals(calls, lambda c: c["timestamp"][:10]))
     _print_table("By model", _bucket_totals(calls, lambda c: c["model"]))
     _print_table("By call type", _bucket_totals(calls, lambda c: c["call_type"]))
+    _print_validation_table(calls)
+    _print_prompt_cache_table(calls)
+    _print_latency_table(records)
+    _print_retry_reasons(records)
+    _print_hedge_table(records)
 
 
 if __name__ == "__main__":
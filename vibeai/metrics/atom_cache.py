@@ -0,0 +1,58 @@
+"""Per-atom judge verdict cache.
+
+The LLM response cache (``vibeai.llm.client``) is keyed by the whole
+prompt, so a judge that sees all of a representation's atoms at once
+re-judges every atom when any one of them changes. Iterating on a
+decomposition prompt typically changes only a few atoms per image. This
+cache stores verdicts one atom at a time, keyed by (image content hash,
+normalized atom text, judge prompt version, model), so a judge only needs
+to be sent the atoms it hasn't seen with that image before.
+
+One JSON file per entry, like the LLM cache, so concurrent writers never
+contend on a shared file.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+ATOM_CACHE_DIR = Path(".cache/atom_verdicts")
+
+
+def normalize_atom(atom: str) -> str:
+    """Atoms that differ only in case or whitespace get the same verdict."""
+    return " ".join(atom.split()).casefold()
+
+
+def prompt_version(template: str) -> str:
+    """A judge prompt's version: its content hash, so editing the prompt
+    invalidates its cached verdicts without anyone bumping a number."""
+    return hashlib.sha256(template.encode()).hexdigest()[:12]
+
+
+class AtomVerdictCache:
+    def __init__(self, judge: str, judge_prompt_version: str, model: str, root: Path | None = None):
+        self.judge = judge
+        self.judge_prompt_version = judge_prompt_version
+        self.model = model
+        self.root = root
+
+    def _path(self, image_hash: str, atom: str) -> Path:
+        h = hashlib.sha256()
+        for part in (self.judge, self.judge_prompt_version, self.model, image_hash, normalize_atom(atom)):
+            h.update(part.encode())
+            h.update(b"\0")
+        return (self.root or ATOM_CACHE_DIR) / self.judge / f"{h.hexdigest()}.json"
+
+    def get(self, image_hash: str, atom: str) -> dict | None:
+        path = self._path(image_hash, atom)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def put(self, image_hash: str, atom: str, verdict: dict) -> None:
+        path = self._path(image_hash, atom)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{id(verdict)}.tmp")
+        tmp.write_text(json.dumps(verdict))
+        tmp.replace(path)
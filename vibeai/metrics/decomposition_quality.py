@@ -1,18 +1,25 @@
 """Decomposition-quality metric: scores Completeness and Atom Quality for a
 (representation, atoms) pair via LLM-as-a-judge."""
 
+import json
+from dataclasses import replace
+
 from vibeai.eval.parsing import extract_json
 from vibeai.eval.test_cases import DecompositionTestCase
 from vibeai.llm.client import DEFAULT_EVAL_MODEL, call_text, call_text_async
+from vibeai.llm.errors import PartialOutputError
+from vibeai.llm.incremental import ItemStream
+from vibeai.llm.prompt_layout import Prompt
+from vibeai.llm.structured import BOOLEAN, STRING, OutputSchema, strict_object
 from vibeai.metrics.base import Metric, MetricResult
 from vibeai.prompts.decomposition_eval import DECOMPOSITION_EVAL_PROMPT
 
 
-def _build_prompt(test_case: DecompositionTestCase) -> str:
+def _build_prompt(test_case: DecompositionTestCase) -> Prompt:
     atoms_block = "\n".join(f"{i + 1}. {atom}" for i, atom in enumerate(test_case.atoms))
-    return DECOMPOSITION_EVAL_PROMPT.format(
-        representation=test_case.representation,
-        atoms=atoms_block,
+    return Prompt(
+        DECOMPOSITION_EVAL_PROMPT,
+        {"representation": test_case.representation, "atoms": atoms_block},
     )
 
 
@@ -20,6 +27,40 @@ _REQUIRED_JUDGEMENT_ENTRY_KEYS = {"atom", "reason", "evaluation", "verdict"}
 _REQUIRED_EVAL_KEYS = {"affectiveness", "atomicity", "fidelity", "evidence_preservation"}
 
 
+def _verdict(verdict: dict, **extra: dict) -> dict:
+    return strict_object({**extra, "reason": STRING, "verdict": verdict})
+
+
+OUTPUT_SCHEMA = OutputSchema(
+    "decomposition_judgement",
+    strict_object(
+        {
+            "atomic_judgement": {
+                "type": "array",
+                "items": strict_object(
+                    {
+                        "atom": STRING,
+                        "reason": STRING,
+                        "evaluation": strict_object({key: BOOLEAN for key in sorted(_REQUIRED_EVAL_KEYS)}),
+                        "verdict": {"type": "string", "enum": ["Good", "Bad"]},
+                    }
+                ),
+            },
+            "final_verdict": strict_object(
+                {
+                    "completeness": _verdict({"type": "integer", "minimum": 1, "maximum": 5}),
+                    "atom_quality": _verdict(
+                        {"type": "number", "minimum": 0, "maximum": 5},
+                        good_atom_count={"type": "integer"},
+                        total_atom_count={"type": "integer"},
+                    ),
+                }
+            ),
+        }
+    ),
+)
+
+
 def _is_number(x, lo: float, hi: float) -> bool:
     return isinstance(x, (int, float)) and not isinstance(x, bool) and lo <= x <= hi
 
@@ -57,7 +98,9 @@ def _validate_judgement_entry(entry: dict, index: int) -> None:
 def _validate_judgement(raw: str, expected_atom_count: int) -> dict:
     """Parse + validate the judge's JSON. Raises ValueError on any failure -
     used both as call_text's retry-triggering ``validate`` callback and to
-    build the final MetricResult once a call has passed validation."""
+    build the final MetricResult once a call has passed validation. If the
+    only failures are individual atomic_judgement entries, it's a
+    PartialOutputError naming them, which repair mode fixes in place."""
     judgement = extract_json(raw)
     if not isinstance(judgement, dict):
         raise ValueError(f"Expected a JSON object, got: {raw!r}")
@@ -70,8 +113,13 @@ def _validate_judgement(raw: str, expected_atom_count: int) -> dict:
             f"'atomic_judgement' has {len(atomic_judgement)} entries, expected "
             f"{expected_atom_count} (one per input atom): {raw!r}"
         )
+    bad, problems = [], []
     for i, entry in enumerate(atomic_judgement):
-        _validate_judgement_entry(entry, i)
+        try:
+            _validate_judgement_entry(entry, i)
+        except ValueError as e:
+            bad.append(i)
+            problems.append(str(e))
 
     fv = judgement.get("final_verdict")
     if not isinstance(fv, dict):
@@ -95,9 +143,30 @@ def _validate_judgement(raw: str, expected_atom_count: int) -> dict:
     ):
         raise ValueError(f"'final_verdict.atom_quality' malformed: {raw!r}")
 
+    if bad:
+        raise PartialOutputError("; ".join(problems), bad=bad)
     return judgement
 
 
+def _merge_repair(raw: str, bad: list[int], repaired_raw: str) -> str:
+    """``raw`` with the entries at ``bad`` replaced by the re-judged ones
+    (marked ``"repaired": true``), and Atom Quality recomputed over the
+    merged verdicts with the prompt's own formula. Completeness stays as
+    first judged: it's a property of the whole decomposition."""
+    judgement = extract_json(raw)
+    repaired = _validate_judgement(repaired_raw, len(bad))["atomic_judgement"]
+    entries = judgement["atomic_judgement"]
+    for index, entry in zip(bad, repaired):
+        entries[index] = {**entry, "repaired": True}
+    good = sum(1 for entry in entries if entry["verdict"] == "Good")
+    judgement["final_verdict"]["atom_quality"].update(
+        good_atom_count=good,
+        total_atom_count=len(entries),
+        verdict=round(5 * good / len(entries), 2),
+    )
+    return json.dumps(judgement)
+
+
 def _parse_result(raw: str, expected_atom_count: int) -> MetricResult:
     judgement = _validate_judgement(raw, expected_atom_count)
 
@@ -113,32 +182,83 @@ def _parse_result(raw: str, expected_atom_count: int) -> MetricResult:
     return MetricResult(score=overall_0_5 / 5, reason=reason, details=judgement)
 
 
+def _stream_check(atom_count: int, check_entries: bool) -> ItemStream:
+    """The part of ``_validate_judgement`` that can be checked while the
+    atomic_judgement entries stream in."""
+    return ItemStream(
+        key="atomic_judgement",
+        check_item=(lambda i, entry: _validate_judgement_entry(entry, i)) if check_entries else None,
+        max_items=atom_count,
+    )
+
+
+def _repair_prompt(test_case: DecompositionTestCase, bad: list[int]) -> Prompt:
+    return _build_prompt(replace(test_case, atoms=[test_case.atoms[i] for i in bad]))
+
+
 class DecompositionQualityMetric(Metric):
     name = "decomposition_quality"
     threshold = 0.7  # normalized; i.e. avg raw score >= 3.5 / 5
 
-    def __init__(self, model: str = DEFAULT_EVAL_MODEL, threshold: float | None = None):
+    def __init__(
+        self,
+        model: str = DEFAULT_EVAL_MODEL,
+        threshold: float | None = None,
+        repair_atoms: bool = False,
+    ):
         self.model = model
         if threshold is not None:
             self.threshold = threshold
+        # Re-judge only malformed/inconsistent atomic_judgement entries
+        # instead of retrying the whole call; see _merge_repair.
+        self.repair_atoms = repair_atoms
 
     def measure(self, test_case: DecompositionTestCase) -> MetricResult:
         expected_atom_count = len(test_case.atoms)
+
+        def repair(raw: str, error: PartialOutputError) -> str:
+            repaired = call_text(
+                _repair_prompt(test_case, error.bad),
+                model=self.model,
+                call_type="judge_repair",
+                validate=lambda text: _validate_judgement(text, len(error.bad)),
+                schema=OUTPUT_SCHEMA,
+            )
+            return _merge_repair(raw, error.bad, repaired)
+
         raw = call_text(
             _build_prompt(test_case),
             model=self.model,
             call_type="judge",
             validate=lambda text: _validate_judgement(text, expected_atom_count),
+            schema=OUTPUT_SCHEMA,
+            repair=repair if self.repair_atoms else None,
         )
         return _parse_result(raw, expected_atom_count)
 
     async def measure_async(self, test_case: DecompositionTestCase) -> MetricResult:
         expected_atom_count = len(test_case.atoms)
+
+        async def repair(raw: str, error: PartialOutputError) -> str:
+            repaired = await call_text_async(
+                _repair_prompt(test_case, error.bad),
+                model=self.model,
+                call_type="judge_repair",
+                validate=lambda text: _validate_judgement(text, len(error.bad)),
+                schema=OUTPUT_SCHEMA,
+                stream_check=_stream_check(len(error.bad), check_entries=True),
+            )
+            return _merge_repair(raw, error.bad, repaired)
+
         raw = await call_text_async(
             _build_prompt(test_case),
             model=self.model,
             call_type="judge",
             validate=lambda text: _validate_judgement(text, expected_atom_count),
+            schema=OUTPUT_SCHEMA,
+            repair=repair if self.repair_atoms else None,
+            # A bad entry is only fatal without repair mode.
+            stream_check=_stream_check(expected_atom_count, check_entries=not self.repair_atoms),
         )
         return _parse_result(raw, expected_atom_count)
 
@@ -2,11 +2,20 @@
 about the image (checking stated evidence and vibe-inference separately),
 via LLM-as-a-judge."""
 
+import hashlib
+import json
+from dataclasses import replace
+
 from vibeai.eval.parsing import extract_json
 from vibeai.eval.test_cases import DecompositionTestCase
 from vibeai.llm.client import DEFAULT_EVAL_MODEL, call_with_image, call_with_image_async
+from vibeai.llm.errors import PartialOutputError
+from vibeai.llm.incremental import ItemStream
+from vibeai.llm.prompt_layout import Prompt
+from vibeai.llm.structured import BOOLEAN, STRING, STRING_LIST, OutputSchema, nullable, strict_object
+from vibeai.metrics.atom_cache import AtomVerdictCache, normalize_atom, prompt_version
 from vibeai.metrics.base import Metric, MetricResult
-from vibeai.pipeline.represent import MIME_TYPES
+from vibeai.pipeline.image_policy import DEFAULT_POLICY, ImagePolicy, load_image
 from vibeai.prompts.plausibility_eval import PLAUSIBILITY_EVAL_PROMPT
 
 # A representation passes when the proportion of plausible atoms
@@ -16,14 +25,9 @@ from vibeai.prompts.plausibility_eval import PLAUSIBILITY_EVAL_PROMPT
 PLAUSIBLE_RATE_THRESHOLD = 0.7
 
 
-def _build_prompt(test_case: DecompositionTestCase) -> str:
+def _build_prompt(test_case: DecompositionTestCase) -> Prompt:
     atom_list = "\n".join(f"{i + 1}. {atom}" for i, atom in enumerate(test_case.atoms))
-    return PLAUSIBILITY_EVAL_PROMPT.format(atom_list=atom_list)
-
-
-def _load_image(test_case: DecompositionTestCase) -> tuple[bytes, str]:
-    mime_type = MIME_TYPES.get(test_case.image_path.suffix.lower(), "image/jpeg")
-    return test_case.image_path.read_bytes(), mime_type
+    return Prompt(PLAUSIBILITY_EVAL_PROMPT, {"atom_list": atom_list})
 
 
 _REQUIRED_ATOM_KEYS = {
@@ -38,7 +42,36 @@ _REQUIRED_ATOM_KEYS = {
 }
 
 
+def _check(extra: dict | None = None) -> dict:
+    return strict_object({"reasoning": STRING, **(extra or {}), "verdict": BOOLEAN})
+
+
+OUTPUT_SCHEMA = OutputSchema(
+    "plausibility_verdicts",
+    {
+        "type": "array",
+        "items": strict_object(
+            {
+                "atom": STRING,
+                "type": {"type": "string", "enum": ["vibe_only", "evidence_backed"]},
+                "stated_evidence": nullable(STRING_LIST),
+                "stated_vibe": STRING,
+                "evidence_presence_check": nullable(_check()),
+                "direct_check": nullable(
+                    _check({"supporting_evidence": STRING_LIST, "contradicting_evidence": STRING_LIST})
+                ),
+                "mapping_check": nullable(_check()),
+                "final_verdict": BOOLEAN,
+            }
+        ),
+    },
+    root_key="atoms",
+)
+
+
 def _validate_atom(atom: dict, index: int) -> None:
+    if not isinstance(atom, dict):
+        raise ValueError(f"Judge atom {index} is not an object: {atom!r}")
     missing = _REQUIRED_ATOM_KEYS - atom.keys()
     if missing:
         raise ValueError(f"Judge atom {index} missing key(s) {sorted(missing)}: {atom!r}")
@@ -46,21 +79,48 @@ def _validate_atom(atom: dict, index: int) -> None:
         raise ValueError(f"Judge atom {index} has empty/invalid stated_vibe: {atom!r}")
 
 
-def _extract_and_validate_atoms(raw: str) -> list[dict]:
+def _extract_and_validate_atoms(raw: str, expected_atom_count: int | None = None) -> list[dict]:
     """Parse + validate the judge's JSON. Raises ValueError on any failure
     (malformed JSON, missing required key, empty stated_vibe, ...) - used
     both as call_with_image's retry-triggering ``validate`` callback and to
-    build the final MetricResult once a call has passed validation."""
+    build the final MetricResult once a call has passed validation. If the
+    only failures are individual atoms, it's a PartialOutputError naming
+    them, which repair mode fixes in place - given ``expected_atom_count``,
+    so that verdict i is known to belong to input atom i."""
     atoms = extract_json(raw)
-    if not atoms:
+    if not isinstance(atoms, list) or not atoms:
         raise ValueError(f"Judge returned no atom verdicts: {raw!r}")
+    if expected_atom_count is not None and len(atoms) != expected_atom_count:
+        raise ValueError(
+            f"Judge returned {len(atoms)} verdicts, expected {expected_atom_count}: {raw!r}"
+        )
+    bad, problems = [], []
     for i, atom in enumerate(atoms):
-        _validate_atom(atom, i)
+        try:
+            _validate_atom(atom, i)
+        except ValueError as e:
+            bad.append(i)
+            problems.append(str(e))
+    if bad:
+        raise PartialOutputError("; ".join(problems), bad=bad)
     return atoms
 
 
-def _parse_result(raw: str) -> MetricResult:
-    atoms = _extract_and_validate_atoms(raw)
+def _merge_repair(raw: str, bad: list[int], repaired_raw: str) -> str:
+    """``raw`` with the verdicts at ``bad`` replaced by the re-judged ones,
+    marked ``"repaired": true``."""
+    atoms = extract_json(raw)
+    repaired = _extract_and_validate_atoms(repaired_raw, len(bad))
+    for index, atom in zip(bad, repaired):
+        atoms[index] = {**atom, "repaired": True}
+    return json.dumps(atoms)
+
+
+def _repair_prompt(test_case: DecompositionTestCase, bad: list[int]) -> Prompt:
+    return _build_prompt(replace(test_case, atoms=[test_case.atoms[i] for i in bad]))
+
+
+def _result_from_atoms(atoms: list[dict]) -> MetricResult:
     plausible = sum(1 for atom in atoms if atom["final_verdict"])
     evidence_backed = sum(1 for atom in atoms if atom["type"] == "evidence_backed")
     total = len(atoms)
@@ -76,34 +136,163 @@ class PlausibilityMetric(Metric):
     name = "plausibility"
     threshold = PLAUSIBLE_RATE_THRESHOLD
 
-    def __init__(self, model: str = DEFAULT_EVAL_MODEL, threshold: float | None = None):
+    def __init__(
+        self,
+        model: str = DEFAULT_EVAL_MODEL,
+        threshold: float | None = None,
+        image_policy: ImagePolicy = DEFAULT_POLICY,
+        repair_atoms: bool = False,
+        atom_cache: bool = False,
+    ):
         self.model = model
         if threshold is not None:
             self.threshold = threshold
+        # What the judge sees of the image; see vibeai.pipeline.image_policy.
+        self.image_policy = image_policy
+        # Re-judge only malformed atom verdicts instead of retrying the
+        # whole call; see _merge_repair.
+        self.repair_atoms = repair_atoms
+        # Judge only atoms without a cached verdict for this image; see
+        # vibeai.metrics.atom_cache. Verdicts depend on the prompt and on
+        # the detail level the image is sent at (the image hash covers its
+        # resolution).
+        self.atom_cache = (
+            AtomVerdictCache(
+                self.name,
+                f"{prompt_version(PLAUSIBILITY_EVAL_PROMPT)}-{image_policy.detail}",
+                model,
+            )
+            if atom_cache
+            else None
+        )
+
+    def _validate(self, test_case: DecompositionTestCase):
+        if not self.repair_atoms and self.atom_cache is None:
+            return _extract_and_validate_atoms
+        # Verdict i must belong to atom i, to repair it or to cache it.
+        expected_atom_count = len(test_case.atoms)
+        return lambda text: _extract_and_validate_atoms(text, expected_atom_count)
+
+    def _stream_check(self, test_case: DecompositionTestCase) -> ItemStream:
+        """What of ``_validate`` can be checked as verdicts stream in. A bad
+        verdict is only fatal without repair mode."""
+        counted = self.repair_atoms or self.atom_cache is not None
+        return ItemStream(
+            check_item=None if self.repair_atoms else lambda i, atom: _validate_atom(atom, i),
+            max_items=len(test_case.atoms) if counted else None,
+        )
+
+    def _judge(self, test_case: DecompositionTestCase, image_bytes, mime_type: str) -> list[dict]:
+        def repair(raw: str, error: PartialOutputError) -> str:
+            repaired = call_with_image(
+                _repair_prompt(test_case, error.bad),
+                image_bytes,
+                mime_type=mime_type,
+                model=self.model,
+                call_type="judge_repair",
+                validate=lambda text: _extract_and_validate_atoms(text, len(error.bad)),
+                detail=self.image_policy.detail,
+                schema=OUTPUT_SCHEMA,
+            )
+            return _merge_repair(raw, error.bad, repaired)
 
-    def measure(self, test_case: DecompositionTestCase) -> MetricResult:
-        image_bytes, mime_type = _load_image(test_case)
         raw = call_with_image(
             _build_prompt(test_case),
             image_bytes,
             mime_type=mime_type,
             model=self.model,
             call_type="judge",
-            validate=_extract_and_validate_atoms,
+            validate=self._validate(test_case),
+            detail=self.image_policy.detail,
+            schema=OUTPUT_SCHEMA,
+            repair=repair if self.repair_atoms else None,
         )
-        return _parse_result(raw)
+        return _extract_and_validate_atoms(raw)
+
+    async def _judge_async(
+        self, test_case: DecompositionTestCase, image_bytes, mime_type: str
+    ) -> list[dict]:
+        async def repair(raw: str, error: PartialOutputError) -> str:
+            repaired = await call_with_image_async(
+                _repair_prompt(test_case, error.bad),
+                image_bytes,
+                mime_type=mime_type,
+                model=self.model,
+                call_type="judge_repair",
+                validate=lambda text: _extract_and_validate_atoms(text, len(error.bad)),
+                detail=self.image_policy.detail,
+                schema=OUTPUT_SCHEMA,
+                stream_check=ItemStream(
+                    check_item=lambda i, atom: _validate_atom(atom, i), max_items=len(error.bad)
+                ),
+            )
+            return _merge_repair(raw, error.bad, repaired)
 
-    async def measure_async(self, test_case: DecompositionTestCase) -> MetricResult:
-        image_bytes, mime_type = _load_image(test_case)
         raw = await call_with_image_async(
             _build_prompt(test_case),
             image_bytes,
             mime_type=mime_type,
             model=self.model,
             call_type="judge",
-            validate=_extract_and_validate_atoms,
+            validate=self._validate(test_case),
+            detail=self.image_policy.detail,
+            schema=OUTPUT_SCHEMA,
+            repair=repair if self.repair_atoms else None,
+            stream_check=self._stream_check(test_case),
         )
-        return _parse_result(raw)
+        return _extract_and_validate_atoms(raw)
+
+    def _uncached(
+        self, test_case: DecompositionTestCase, image_hash: str
+    ) -> tuple[dict[str, dict], DecompositionTestCase]:
+        """(cached verdicts by normalized atom, test case of the distinct
+        atoms still to judge)."""
+        known, pending = {}, {}
+        for atom in test_case.atoms:
+            key = normalize_atom(atom)
+            if key in known or key in pending:
+                continue
+            verdict = self.atom_cache.get(image_hash, atom)
+            if verdict is None:
+                pending[key] = atom
+            else:
+                known[key] = verdict
+        return known, replace(test_case, atoms=list(pending.values()))
+
+    def _assemble(
+        self,
+        test_case: DecompositionTestCase,
+        image_hash: str,
+        known: dict[str, dict],
+        pending: DecompositionTestCase,
+        judged: list[dict],
+    ) -> MetricResult:
+        """Cache the new verdicts, then rebuild the full verdict list in the
+        test case's atom order."""
+        for atom, verdict in zip(pending.atoms, judged):
+            self.atom_cache.put(image_hash, atom, verdict)
+            known[normalize_atom(atom)] = verdict
+        return _result_from_atoms(
+            [{**known[normalize_atom(atom)], "atom": atom} for atom in test_case.atoms]
+        )
+
+    def measure(self, test_case: DecompositionTestCase) -> MetricResult:
+        image_bytes, mime_type = load_image(test_case.image_path, self.image_policy)
+        if self.atom_cache is None:
+            return _result_from_atoms(self._judge(test_case, image_bytes, mime_type))
+        image_hash = hashlib.sha256(image_bytes).hexdigest()
+        known, pending = self._uncached(test_case, image_hash)
+        judged = self._judge(pending, image_bytes, mime_type) if pending.atoms else []
+        return self._assemble(test_case, image_hash, known, pending, judged)
+
+    async def measure_async(self, test_case: DecompositionTestCase) -> MetricResult:
+        image_bytes, mime_type = load_image(test_case.image_path, self.image_policy)
+        if self.atom_cache is None:
+            return _result_from_atoms(await self._judge_async(test_case, image_bytes, mime_type))
+        image_hash = hashlib.sha256(image_bytes).hexdigest()
+        known, pending = self._uncached(test_case, image_hash)
+        judged = await self._judge_async(pending, image_bytes, mime_type) if pending.atoms else []
+        return self._assemble(test_case, image_hash, known, pending, judged)
 
     def extract_submetrics(self, result: MetricResult) -> dict[str, float]:
         atoms = result.details["atoms"]
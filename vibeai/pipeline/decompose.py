@@ -2,8 +2,13 @@
 
 from vibeai.eval.parsing import extract_json
 from vibeai.llm.client import DEFAULT_MODEL, call_text, call_text_async
+from vibeai.llm.incremental import ItemStream
+from vibeai.llm.prompt_layout import Prompt
+from vibeai.llm.structured import STRING_LIST, OutputSchema
 from vibeai.prompts.decomposition import PROMPTS
 
+OUTPUT_SCHEMA = OutputSchema("vibe_atoms", STRING_LIST, root_key="atoms")
+
 _REQUIRED_REPRESENTATION_KEYS = {
     "vibe_description",
     "vibe_decomposition",
@@ -48,6 +53,15 @@ def decompose_direct(representation: str) -> list[str]:
     return atoms
 
 
+def _check_atom(index: int, atom) -> None:
+    if not isinstance(atom, str) or not atom.strip():
+        raise ValueError(f"Atom {index} is not a non-empty string: {atom!r}")
+
+
+# Lets a streamed decomposition be cut off at its first bad atom.
+STREAM_CHECK = ItemStream(check_item=_check_atom)
+
+
 def _extract_and_validate_atoms(raw: str) -> list[str]:
     """Parse + validate the decomposer's JSON array of atoms. Raises
     ValueError on any failure (not a JSON array, empty, non-string or
@@ -60,8 +74,7 @@ def _extract_and_validate_atoms(raw: str) -> list[str]:
     if not atoms:
         raise ValueError(f"Decomposer returned an empty atom list: {raw!r}")
     for i, atom in enumerate(atoms):
-        if not isinstance(atom, str) or not atom.strip():
-            raise ValueError(f"Atom {i} is not a non-empty string: {atom!r}")
+        _check_atom(i, atom)
     return atoms
 
 
@@ -70,9 +83,13 @@ def decompose(
     prompt_version: str = "baseline",
     model: str = DEFAULT_MODEL,
 ) -> list[str]:
-    prompt = PROMPTS[prompt_version].format(representation=representation)
+    prompt = Prompt(PROMPTS[prompt_version], {"representation": representation})
     raw = call_text(
-        prompt, model=model, call_type="decompose", validate=_extract_and_validate_atoms
+        prompt,
+        model=model,
+        call_type="decompose",
+        validate=_extract_and_validate_atoms,
+        schema=OUTPUT_SCHEMA,
     )
     return _extract_and_validate_atoms(raw)
 
@@ -82,8 +99,13 @@ async def decompose_async(
     prompt_version: str = "baseline",
     model: str = DEFAULT_MODEL,
 ) -> list[str]:
-    prompt = PROMPTS[prompt_version].format(representation=representation)
+    prompt = Prompt(PROMPTS[prompt_version], {"representation": representation})
     raw = await call_text_async(
-        prompt, model=model, call_type="decompose", validate=_extract_and_validate_atoms
+        prompt,
+        model=model,
+        call_type="decompose",
+        validate=_extract_and_validate_atoms,
+        schema=OUTPUT_SCHEMA,
+        stream_check=STREAM_CHECK,
     )
     return _extract_and_validate_atoms(raw)
@@ -2,15 +2,21 @@
 
 Exists so tests (and anything else that needs to score many images) share one
 implementation of the represent -> decompose -> judge chain instead of each
-re-assembling it.
+re-assembling it. ``evaluate_images`` runs it over a stream of images (a list,
+a generator, or ``vibeai.eval.dataset.watch_image_paths``) with bounded
+concurrency, so a run's memory doesn't grow with the size of the corpus.
 """
 
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
 from pathlib import Path
 
+from vibeai.eval.concurrency import StragglerReport, map_speculative_as_completed
 from vibeai.eval.test_cases import DecompositionTestCase
 from vibeai.metrics.base import Metric, MetricResult
 from vibeai.pipeline.decompose import decompose_async, decompose_direct
+from vibeai.pipeline.image_policy import DEFAULT_POLICY, ImagePolicy
 from vibeai.pipeline.represent import generate_representation_async
+from vibeai.tracing import span, tracer
 
 # Sentinel decomposition_prompt_version for representation prompts (e.g. "v2")
 # that already emit a decomposed vibe representation - skips the separate
@@ -23,21 +29,68 @@ async def evaluate_image(
     metric: Metric,
     representation_prompt_version: str = "baseline",
     decomposition_prompt_version: str = "baseline",
+    representation_image_policy: ImagePolicy = DEFAULT_POLICY,
 ) -> tuple[DecompositionTestCase, MetricResult]:
-    representation = await generate_representation_async(
-        image_path, prompt_version=representation_prompt_version
-    )
-    if decomposition_prompt_version == DIRECT_DECOMPOSITION:
-        atoms = decompose_direct(representation)
-    else:
-        atoms = await decompose_async(representation, prompt_version=decomposition_prompt_version)
-
-    test_case = DecompositionTestCase(
-        image_path=image_path,
-        representation=representation,
-        atoms=atoms,
-        representation_prompt_version=representation_prompt_version,
-        decomposition_prompt_version=decomposition_prompt_version,
-    )
-    result = await metric.measure_async(test_case)
+    """The judge's image policy, if its metric looks at the image, is set on
+    the metric itself (e.g. ``PlausibilityMetric(image_policy=...)``).
+
+    Each step is a ``vibeai.tracing`` span, under one ``evaluate_image``
+    span per image."""
+    tracer.name_lane(Path(image_path).name)
+    with span("evaluate_image", image=Path(image_path).name):
+        with span("represent"):
+            representation = await generate_representation_async(
+                image_path,
+                prompt_version=representation_prompt_version,
+                image_policy=representation_image_policy,
+            )
+        with span("decompose"):
+            if decomposition_prompt_version == DIRECT_DECOMPOSITION:
+                atoms = decompose_direct(representation)
+            else:
+                atoms = await decompose_async(representation, prompt_version=decomposition_prompt_version)
+
+        test_case = DecompositionTestCase(
+            image_path=image_path,
+            representation=representation,
+            atoms=atoms,
+            representation_prompt_version=representation_prompt_version,
+            decomposition_prompt_version=decomposition_prompt_version,
+        )
+        with span("measure", stage=metric.name):
+            result = await metric.measure_async(test_case)
     return test_case, result
+
+
+async def evaluate_images(
+    image_paths: Iterable[Path] | AsyncIterable[Path],
+    metric: Metric,
+    representation_prompt_version: str = "baseline",
+    decomposition_prompt_version: str = "baseline",
+    representation_image_policy: ImagePolicy = DEFAULT_POLICY,
+    limit: int = 10,
+    deadline: float | None = None,
+    speculate: bool = False,
+    stragglers: StragglerReport | None = None,
+) -> AsyncIterator[tuple[Path, tuple[DecompositionTestCase, MetricResult] | BaseException]]:
+    """``evaluate_image`` over ``image_paths``, pulled lazily with at most
+    ``limit`` images in flight. Yields (image_path, outcome) in completion
+    order; a failed image's outcome is its exception, and one still running
+    ``deadline`` seconds after it started is cancelled and yields a
+    TimeoutError. With ``speculate``, the slowest images are re-run once
+    capacity frees up at the end of the batch; ``stragglers`` collects which
+    images were slow (see ``vibeai.eval.concurrency.map_speculative_as_completed``)."""
+
+    def evaluate(image_path: Path):
+        return evaluate_image(
+            image_path,
+            metric,
+            representation_prompt_version=representation_prompt_version,
+            decomposition_prompt_version=decomposition_prompt_version,
+            representation_image_policy=representation_image_policy,
+        )
+
+    async for image_path, outcome in map_speculative_as_completed(
+        evaluate, image_paths, limit=limit, deadline=deadline, speculate=speculate, report=stragglers
+    ):
+        yield image_path, outcome
@@ -0,0 +1,146 @@
+"""Per-stage image policies: the resolution and ``detail`` level an LLM call
+sees.
+
+Image input tokens are a large share of per-image cost, and preprocess.py's
+1024px pool isn't necessarily what every stage needs. Representation
+may want the full image while the plausibility judge, which only checks
+claims against it, can get by with fewer tiles. An ``ImagePolicy`` names
+that choice. Derived variants are rendered once and cached on disk under
+``VARIANT_CACHE_DIR``, keyed by the source image's content hash plus the
+policy. That key makes the LLM response cache (keyed by image bytes)
+distinguish policies automatically.
+
+Sizes are chosen against the API's tiling. A high-detail image is scaled to
+fit 2048x2048, then its shorter side to 768, then billed per 512px tile, so
+an image just over a tile boundary pays for a mostly empty tile.
+``max_tiles`` picks the largest size covering at most that many tiles.
+``vibeai.eval.image_policy_experiment`` measures what each policy costs and
+how much it moves scores.
+"""
+
+import hashlib
+import io
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image
+
+from vibeai.eval.shards import read_image
+from vibeai.tracing import span
+
+MIME_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+}
+VARIANT_CACHE_DIR = Path(".cache/image_variants")
+
+TILE_SIDE = 512
+# Published image-token accounting for tiled input: a fixed base plus a cost
+# per 512px tile; detail="low" is the base alone. Only used to choose sizes
+# and as a prediction - the experiment harness reports measured tokens.
+BASE_IMAGE_TOKENS = 85
+TOKENS_PER_TILE = 170
+_API_FIT_SIDE = 2048
+_API_SHORT_SIDE = 768
+
+
+@dataclass(frozen=True)
+class ImagePolicy:
+    max_side: int | None = None  # cap on the longer side; None = as preprocessed
+    max_tiles: int | None = None  # cap on billed 512px tiles; see tile_aligned_size
+    quality: int = 85  # JPEG quality of resized variants
+    detail: str = "auto"  # input_image detail: "low", "high" or "auto"
+
+    @property
+    def resizes(self) -> bool:
+        return self.max_side is not None or self.max_tiles is not None
+
+    @property
+    def key(self) -> str:
+        return f"s{self.max_side}_t{self.max_tiles}_q{self.quality}"
+
+
+POLICIES = {
+    "full": ImagePolicy(),
+    "tiles4": ImagePolicy(max_tiles=4),
+    "tiles2": ImagePolicy(max_tiles=2),
+    "tiles1": ImagePolicy(max_tiles=1),
+    "low": ImagePolicy(max_side=512, detail="low"),
+}
+DEFAULT_POLICY = POLICIES["full"]
+
+
+def _api_scaled(width: int, height: int) -> tuple[float, float]:
+    scale = min(1.0, _API_FIT_SIDE / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, _API_SHORT_SIDE / min(width, height))
+    return width * scale, height * scale
+
+
+def estimate_image_tokens(width: int, height: int, detail: str = "auto") -> int:
+    if detail == "low":
+        return BASE_IMAGE_TOKENS
+    width, height = _api_scaled(width, height)
+    tiles = math.ceil(width / TILE_SIDE) * math.ceil(height / TILE_SIDE)
+    return BASE_IMAGE_TOKENS + TOKENS_PER_TILE * tiles
+
+
+def tile_aligned_size(width: int, height: int, max_tiles: int) -> tuple[int, int]:
+    """The largest aspect-preserving size (never upscaled) that fits a grid
+    of at most ``max_tiles`` 512px tiles, so no tile is paid for but mostly
+    empty."""
+    best = 0.0
+    for cols in range(1, max_tiles + 1):
+        rows = max_tiles // cols
+        best = max(best, min(cols * TILE_SIDE / width, rows * TILE_SIDE / height))
+    scale = min(1.0, best)
+    return max(1, math.floor(width * scale)), max(1, math.floor(height * scale))
+
+
+def target_size(width: int, height: int, policy: ImagePolicy) -> tuple[int, int] | None:
+    """What ``policy`` resizes a width x height image to, or None if it
+    leaves it as is."""
+    new_width, new_height = width, height
+    if policy.max_side is not None and max(width, height) > policy.max_side:
+        scale = policy.max_side / max(width, height)
+        new_width, new_height = max(1, round(width * scale)), max(1, round(height * scale))
+    if policy.max_tiles is not None:
+        new_width, new_height = tile_aligned_size(new_width, new_height, policy.max_tiles)
+    if (new_width, new_height) == (width, height):
+        return None
+    return new_width, new_height
+
+
+def render_variant(img: Image.Image, size: tuple[int, int], quality: int) -> bytes:
+    img.draft("RGB", size)  # cheap JPEG downscale; no-op for other formats
+    img = img.convert("RGB").resize(size, Image.LANCZOS)
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+@span("image_load")
+def load_image(path: Path, policy: ImagePolicy | None = None) -> tuple[bytes | memoryview, str]:
+    """(image bytes, MIME type) for ``path`` as ``policy`` wants it sent."""
+    path = Path(path)
+    data = read_image(path)
+    mime_type = MIME_TYPES.get(path.suffix.lower(), "image/jpeg")
+    if policy is None or not policy.resizes:
+        return data, mime_type
+
+    variant_path = VARIANT_CACHE_DIR / f"{hashlib.sha256(data).hexdigest()}_{policy.key}.jpg"
+    if variant_path.exists():
+        return variant_path.read_bytes(), "image/jpeg"
+    with Image.open(io.BytesIO(data)) as img:
+        size = target_size(*img.size, policy)
+        if size is None:
+            return data, mime_type
+        variant = render_variant(img, size, policy.quality)
+    VARIANT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = variant_path.with_suffix(f".{id(variant)}.tmp")
+    tmp.write_bytes(variant)
+    tmp.replace(variant_path)
+    return variant, "image/jpeg"
@@ -3,13 +3,30 @@
 from pathlib import Path
 
 from vibeai.llm.client import DEFAULT_MODEL, call_with_image, call_with_image_async
+from vibeai.llm.structured import STRING, OutputSchema, strict_object
+from vibeai.pipeline.image_policy import DEFAULT_POLICY, ImagePolicy, load_image
 from vibeai.prompts.representation import PROMPTS
 
-MIME_TYPES = {
-    ".jpg": "image/jpeg",
-    ".jpeg": "image/jpeg",
-    ".png": "image/png",
-    ".webp": "image/webp",
+
+def _vibe_list(second_key: str) -> dict:
+    return {"type": "array", "items": strict_object({"vibe": STRING, second_key: STRING})}
+
+
+# Output schemas of the prompt versions that answer in JSON; the others
+# answer in prose and are sent unconstrained.
+OUTPUT_SCHEMAS = {
+    "v2": OutputSchema(
+        "vibe_representation",
+        strict_object(
+            {
+                "vibe_description": STRING,
+                "vibe_decomposition": _vibe_list("evidence"),
+                "contradiction_scan": _vibe_list("scan"),
+                "removal_test": _vibe_list("test"),
+                "final_representation": _vibe_list("evidence"),
+            }
+        ),
+    ),
 }
 
 
@@ -17,13 +34,19 @@ def generate_representation(
     image_path: Path,
     prompt_version: str = "baseline",
     model: str = DEFAULT_MODEL,
+    image_policy: ImagePolicy = DEFAULT_POLICY,
 ) -> str:
-    image_path = Path(image_path)
     prompt = PROMPTS[prompt_version]
-    mime_type = MIME_TYPES.get(image_path.suffix.lower(), "image/jpeg")
-    image_bytes = image_path.read_bytes()
+    image_bytes, mime_type = load_image(image_path, image_policy)
     return call_with_image(
-        prompt, image_bytes, mime_type=mime_type, model=model, call_type="represent"
+        prompt,
+        image_bytes,
+        mime_type=mime_type,
+        model=model,
+        call_type="represent",
+        detail=image_policy.detail,
+        schema=OUTPUT_SCHEMAS.get(prompt_version),
+        prompt_cache_key=f"vibeai-represent-{prompt_version}",
     )
 
 
@@ -31,11 +54,17 @@ async def generate_representation_async(
     image_path: Path,
     prompt_version: str = "baseline",
     model: str = DEFAULT_MODEL,
+    image_policy: ImagePolicy = DEFAULT_POLICY,
 ) -> str:
-    image_path = Path(image_path)
     prompt = PROMPTS[prompt_version]
-    mime_type = MIME_TYPES.get(image_path.suffix.lower(), "image/jpeg")
-    image_bytes = image_path.read_bytes()
+    image_bytes, mime_type = load_image(image_path, image_policy)
     return await call_with_image_async(
-        prompt, image_bytes, mime_type=mime_type, model=model, call_type="represent"
+        prompt,
+        image_bytes,
+        mime_type=mime_type,
+        model=model,
+        call_type="represent",
+        detail=image_policy.detail,
+        schema=OUTPUT_SCHEMAS.get(prompt_version),
+        prompt_cache_key=f"vibeai-represent-{prompt_version}",
     )
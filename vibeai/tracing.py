@@ -0,0 +1,185 @@
+"""Lightweight tracing: where a slow run's wall-clock time goes.
+
+Token accounting (``vibeai.llm.usage_log``) says what a run cost, not why
+it was slow - waiting on represent calls, judge calls, retry backoff,
+cache I/O, or queueing for a concurrency slot all look the same from the
+outside. ``span`` times a block of code and records it:
+
+- always, into a latency histogram keyed by (span name, stage, model),
+  HDR-style (log-linear buckets), so memory stays bounded however long
+  the run is and percentiles stay within ~3% of the true value;
+- with ``tracer.record_events`` set, also as a Chrome-trace event, one
+  lane per asyncio task (so one per image in ``evaluate_images``), for
+  viewing in Perfetto (ui.perfetto.dev) or chrome://tracing.
+
+``stage`` and ``model`` are inherited by nested spans, so e.g. the retry
+sleeps inside a judge call are filed under the judge's stage and model.
+The pytest session prints ``tracer.summary()`` after any run that
+evaluated images; ``--trace-out`` writes the Chrome trace.
+"""
+
+import asyncio
+import json
+import math
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+# Span attributes nested spans inherit from the enclosing one.
+_INHERITED = ("stage", "model")
+_inherited: ContextVar[dict] = ContextVar("vibeai_span", default={})
+
+SUB_BUCKET_BITS = 5  # 32 linear sub-buckets per power of two: <= 1/32 relative error
+
+
+class LatencyHistogram:
+    """Log-linear histogram of integer microsecond latencies.
+
+    Values below 2**SUB_BUCKET_BITS get exact buckets; above that, each
+    power-of-two range is split into 2**SUB_BUCKET_BITS equal buckets, so
+    a bucket's width is at most 1/32 of its value. Count, sum, min and max
+    are exact."""
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = math.inf
+        self.max = 0
+
+    @staticmethod
+    def _index(value: int) -> int:
+        shift = max(value.bit_length() - SUB_BUCKET_BITS - 1, 0)
+        return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+    @staticmethod
+    def _value(index: int) -> int:
+        """Midpoint of the bucket's value range."""
+        shift = max((index >> SUB_BUCKET_BITS) - 1, 0)
+        mantissa = index - (shift << SUB_BUCKET_BITS)
+        return (mantissa << shift) + (1 << shift >> 1)
+
+    def record(self, value_us: int) -> None:
+        value_us = max(int(value_us), 0)
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value_us
+        self.min = min(self.min, value_us)
+        self.max = max(self.max, value_us)
+
+    def percentile(self, q: float) -> int:
+        """The ``q``-th percentile (0-100), in microseconds."""
+        if not self.count:
+            return 0
+        rank = max(math.ceil(round(q / 100 * self.count, 9)), 1)  # round: 99.9% of 20000 isn't 19980.0...
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class Tracer:
+    def __init__(self, record_events: bool = False):
+        self.record_events = record_events
+        self.histograms: dict[tuple[str, str, str], LatencyHistogram] = {}
+        self.events: list[dict] = []
+        self._lanes: dict[int, int] = {}
+        self._lane_names: dict[int, str] = {}
+        self._origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def _lane(self) -> int:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = id(task) if task is not None else threading.get_ident()
+        return self._lanes.setdefault(key, len(self._lanes) + 1)
+
+    def name_lane(self, name: str) -> None:
+        """Label the current task's lane in the Chrome trace (e.g. with
+        the image it's evaluating)."""
+        if self.record_events:
+            with self._lock:
+                self._lane_names[self._lane()] = name
+
+    def record(self, name: str, start_ns: int, end_ns: int, args: dict) -> None:
+        key = (name, args.get("stage", "-"), args.get("model", "-"))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.record((end_ns - start_ns) // 1000)
+            if self.record_events:
+                self.events.append(
+                    {
+                        "name": name,
+                        "cat": args.get("stage", name),
+                        "ph": "X",
+                        "ts": (start_ns - self._origin_ns) / 1000,
+                        "dur": (end_ns - start_ns) / 1000,
+                        "pid": 1,
+                        "tid": self._lane(),
+                        "args": args,
+                    }
+                )
+
+    def chrome_trace(self) -> dict:
+        lane_names = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": lane, "args": {"name": name}}
+            for lane, name in self._lane_names.items()
+        ]
+        return {"traceEvents": lane_names + self.events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace(), default=str))
+        return path
+
+    def summary(self) -> str:
+        """A table of latency percentiles (ms) per span name, stage and
+        model, slowest total first."""
+        header = (
+            f"{'span':16s}{'stage':18s}{'model':16s}{'count':>7s}"
+            f"{'p50':>9s}{'p95':>9s}{'p99':>9s}{'max':>9s}{'total s':>10s}"
+        )
+        lines = ["Latency by span / stage / model (ms)", header]
+        for (name, stage, model), h in sorted(self.histograms.items(), key=lambda kv: -kv[1].total):
+            lines.append(
+                f"{name:16s}{stage:18s}{model:16s}{h.count:>7d}"
+                f"{h.percentile(50) / 1000:>9.1f}{h.percentile(95) / 1000:>9.1f}"
+                f"{h.percentile(99) / 1000:>9.1f}{h.max / 1000:>9.1f}{h.total / 1e6:>10.1f}"
+            )
+        return "\n".join(lines)
+
+
+tracer = Tracer()
+
+
+@contextmanager
+def span(name: str, **args) -> Iterator[dict]:
+    """Time the block as a ``name`` span. Yields its args dict, to which
+    the block may add attributes (e.g. whether a cache lookup hit)."""
+    parent = _inherited.get()
+    args = {**{k: parent[k] for k in _INHERITED if k in parent}, **args}
+    token = _inherited.set(args)
+    start = time.perf_counter_ns()
+    try:
+        yield args
+    except BaseException as e:
+        args["error"] = type(e).__name__
+        raise
+    finally:
+        _inherited.reset(token)
+        tracer.record(name, start, time.perf_counter_ns(), args)
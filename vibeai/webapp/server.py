@@ -11,7 +11,16 @@ anchoring bias.
 Also serves read-only results viewers (static/results.html + results.js,
 static/plausibility_results.html + plausibility_results.js) for browsing a
 run's images, representations, decompositions, and the LLM judge's
-verdicts/reasoning directly — no annotation involved.
+verdicts/reasoning directly — no annotation involved. Run-level aggregates
+and two-run comparisons (``.../summary``, ``.../compare``) are computed
+server-side by ``vibeai.eval.run_compare`` and cached by results-file mtime,
+so viewers don't need to pull a whole dataset to show them.
+
+Finally, serves a live dashboard (static/live.html + live.js) for batch runs
+still in progress: the runner's ``vibeai.eval.run_status.RunStatusReporter``
+rewrites ``results/_live/<run_id>.json`` as images complete, and
+``/api/live/status/<run_id>/events`` streams each new version of that file as
+a Server-Sent Event.
 
 Every metric (decomposition_quality, plausibility, and any added later —
 interpretability, richness, ...) shares the same run-discovery, dataset,
@@ -25,21 +34,37 @@ parameterized by ``metric``. Adding a new metric only requires:
      irreducibly metric-specific, since every metric's rubric differs.
 """
 
+import asyncio
 import json
+import os
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, Callable, Literal
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
+from vibeai.eval.run_compare import compare_runs, summarize_run
+from vibeai.eval.run_status import read_status
+from vibeai.eval.shards import open_shards
+from vibeai.pipeline.image_policy import MIME_TYPES
+
 REPO_ROOT = Path(__file__).resolve().parents[2]
 RESULTS_ROOT = REPO_ROOT / "results"
-DATA_DIR = REPO_ROOT / "data" / "main_processed"
+# Image dirs under here are served by /api/image - plain directories of
+# processed images, or packed shard directories (vibeai.eval.shards).
+DATA_ROOT = REPO_ROOT / "data"
+LIVE_DIR = RESULTS_ROOT / "_live"
 STATIC_DIR = Path(__file__).resolve().parent / "static"
 
+# How often an open SSE stream checks its status file for a new version, and
+# how long it may stay silent before sending a keep-alive comment (so
+# proxies don't drop an idle connection during a slow stretch of a run).
+LIVE_POLL_SECONDS = 1.0
+LIVE_KEEPALIVE_SECONDS = 15.0
+
 app = FastAPI(title="Vibe Eval — Human Annotation")
 
 
@@ -126,20 +151,91 @@ def _human_path(metric: str, run: str, annotator: str) -> Path:
     return hd / f"{run}__{safe_annotator}.json"
 
 
-def _load_human(metric: str, run: str, annotator: str) -> dict[str, dict]:
-    path = _human_path(metric, run, annotator)
+class _AnnotationFileWriter:
+    """Serializes every write to one human-annotation file.
+
+    POST handlers used to load, patch, and rewrite the whole file inline,
+    so two tabs (or two annotators sharing an id) saving at once could each
+    read the old file and the later write would drop the earlier update.
+    Instead, each save enqueues its ``(image_path, record)`` update and
+    awaits a single writer task per file. That task drains every update
+    queued since its last write and applies them all to the in-memory copy.
+    It then persists the file once (tmp file + one fsync + atomic replace)
+    in a worker thread. A burst of saves therefore costs one rewrite and one
+    fsync, not one each, and nothing is lost because only the writer
+    touches the file.
+
+    Assumes a single server process (uvicorn's default); separate processes
+    writing the same file are not coordinated.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        # Replaced (never mutated) after each successful write, so readers in
+        # the sync GET handlers' threadpool always see a complete snapshot.
+        self.data: dict[str, dict] | None = None
+        self._pending: list[tuple[str, dict, asyncio.Future]] = []
+        self._task: asyncio.Task | None = None
+
+    async def put(self, image_path: str, record: dict) -> None:
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        self._pending.append((image_path, record, done))
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._drain())
+        await done
+
+    async def _drain(self) -> None:
+        while self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                if self.data is None:
+                    self.data = await asyncio.to_thread(_read_human_file, self.path)
+                updated = {**self.data, **{image_path: record for image_path, record, _ in batch}}
+                await asyncio.to_thread(_write_human_file, self.path, updated)
+            except Exception as e:
+                for _, _, done in batch:
+                    if not done.done():
+                        done.set_exception(e)
+                continue
+            self.data = updated
+            for _, _, done in batch:
+                if not done.done():
+                    done.set_result(None)
+
+
+_writers: dict[Path, _AnnotationFileWriter] = {}
+
+
+def _read_human_file(path: Path) -> dict[str, dict]:
     if not path.exists():
         return {}
     return json.loads(path.read_text())
 
 
-def _save_human(metric: str, run: str, annotator: str, data: dict[str, dict]) -> None:
-    path = _human_path(metric, run, annotator)
+def _write_human_file(path: Path, data: dict[str, dict]) -> None:
     tmp = path.with_suffix(".json.tmp")
-    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+    with tmp.open("w") as f:
+        f.write(json.dumps(data, indent=2, ensure_ascii=False))
+        f.flush()
+        os.fsync(f.fileno())
     tmp.replace(path)
 
 
+def _load_human(metric: str, run: str, annotator: str) -> dict[str, dict]:
+    path = _human_path(metric, run, annotator)
+    writer = _writers.get(path)
+    if writer is not None and writer.data is not None:
+        return writer.data
+    return _read_human_file(path)
+
+
+async def _save_human(metric: str, run: str, annotator: str, image_path: str, record: dict) -> None:
+    path = _human_path(metric, run, annotator)
+    writer = _writers.setdefault(path, _AnnotationFileWriter(path))
+    await writer.put(image_path, record)
+
+
 def _dataset_image_paths(metric: str, run: str) -> set[str]:
     return {item["image_path"] for item in _load_dataset(metric, run)}
 
@@ -169,6 +265,29 @@ def get_dataset(metric: str, run: str):
     return {"items": _load_dataset(metric, run)}
 
 
+def _check_runs(metric: str, *runs: str) -> None:
+    known = set(_list_runs(metric))
+    for run in runs:
+        if run not in known:
+            raise HTTPException(404, f"unknown run: {run}")
+
+
+@app.get("/api/{metric}/summary")
+def get_summary(metric: str, run: str):
+    _check_metric(metric)
+    _check_runs(metric, run)
+    return summarize_run(metric, run)
+
+
+@app.get("/api/{metric}/compare")
+def get_comparison(metric: str, run_a: str, run_b: str):
+    """Per-image score/submetric deltas (run_b - run_a) and pass/fail
+    agreement over the images both runs scored, most-changed first."""
+    _check_metric(metric)
+    _check_runs(metric, run_a, run_b)
+    return compare_runs(metric, run_a, run_b)
+
+
 @app.get("/api/{metric}/llm_judgement")
 def get_llm_judgement(metric: str, run: str, image_path: str):
     """Opt-in lookup of the LLM judge's own verdicts + reasons for one image,
@@ -198,9 +317,69 @@ def get_progress(metric: str, run: str, annotator: str):
 @app.get("/api/image")
 def get_image(path: str):
     candidate = (REPO_ROOT / path).resolve()
-    if not candidate.is_relative_to(DATA_DIR.resolve()) or not candidate.is_file():
+    if not candidate.is_relative_to(DATA_ROOT.resolve()) or candidate.suffix.lower() not in MIME_TYPES:
+        raise HTTPException(404, "image not found")
+    if candidate.is_file():
+        return FileResponse(candidate)
+    reader = open_shards(candidate.parent)
+    if reader is None or candidate.name not in reader:
         raise HTTPException(404, "image not found")
-    return FileResponse(candidate)
+    # A memoryview into the mmapped shard - sent without copying.
+    return Response(reader.read(candidate.name), media_type=MIME_TYPES[candidate.suffix.lower()])
+
+
+# --- live run status (SSE) -------------------------------------------------
+
+
+def _live_path(run_id: str) -> Path:
+    path = (LIVE_DIR / f"{run_id}.json").resolve()
+    if not path.is_relative_to(LIVE_DIR.resolve()) or not path.exists():
+        raise HTTPException(404, f"unknown live run: {run_id}")
+    return path
+
+
+@app.get("/api/live/status")
+def list_live_runs():
+    if not LIVE_DIR.exists():
+        return {"runs": []}
+    statuses = [read_status(p) for p in LIVE_DIR.glob("*.json")]
+    runs = sorted((s for s in statuses if s is not None), key=lambda s: -s["started_at"])
+    return {"runs": runs}
+
+
+async def _live_events(path: Path):
+    last_mtime = None
+    last_sent = asyncio.get_running_loop().time()
+    while True:
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            yield "event: gone\ndata: {}\n\n"
+            return
+        now = asyncio.get_running_loop().time()
+        if mtime != last_mtime:
+            status = read_status(path)
+            if status is not None:
+                last_mtime = mtime
+                last_sent = now
+                yield f"data: {json.dumps(status)}\n\n"
+                if status["finished"]:
+                    return
+        elif now - last_sent >= LIVE_KEEPALIVE_SECONDS:
+            last_sent = now
+            yield ": keep-alive\n\n"
+        await asyncio.sleep(LIVE_POLL_SECONDS)
+
+
+@app.get("/api/live/status/{run_id}/events")
+def stream_live_run(run_id: str):
+    """Server-Sent Events: one ``data:`` event per new status snapshot,
+    ending after the run reports ``finished``."""
+    return StreamingResponse(
+        _live_events(_live_path(run_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 # --- decomposition_quality: annotation POST (rubric-specific) -------------
@@ -227,8 +406,9 @@ class DecompAnnotationIn(BaseModel):
 
 
 @app.post("/api/decomposition_quality/annotations")
-def save_decomposition_annotation(body: DecompAnnotationIn):
-    if body.image_path not in _dataset_image_paths("decomposition_quality", body.run):
+async def save_decomposition_annotation(body: DecompAnnotationIn):
+    dataset_paths = await asyncio.to_thread(_dataset_image_paths, "decomposition_quality", body.run)
+    if body.image_path not in dataset_paths:
         raise HTTPException(400, "image_path not part of this run's dataset")
 
     def is_good(aj: AtomJudgement) -> bool:
@@ -269,9 +449,7 @@ def save_decomposition_annotation(body: DecompAnnotationIn):
         "score": round((body.completeness + atom_quality) / 2 / 5, 4),
     }
 
-    data = _load_human("decomposition_quality", body.run, body.annotator)
-    data[body.image_path] = record
-    _save_human("decomposition_quality", body.run, body.annotator, data)
+    await _save_human("decomposition_quality", body.run, body.annotator, body.image_path, record)
     return {"saved": record}
 
 
@@ -293,8 +471,9 @@ class PlausAnnotationIn(BaseModel):
 
 
 @app.post("/api/plausibility/annotations")
-def save_plausibility_annotation(body: PlausAnnotationIn):
-    if body.image_path not in _dataset_image_paths("plausibility", body.run):
+async def save_plausibility_annotation(body: PlausAnnotationIn):
+    dataset_paths = await asyncio.to_thread(_dataset_image_paths, "plausibility", body.run)
+    if body.image_path not in dataset_paths:
         raise HTTPException(400, "image_path not part of this run's dataset")
 
     plausible_count = sum(1 for a in body.atoms if a.plausible)
@@ -317,9 +496,7 @@ def save_plausibility_annotation(body: PlausAnnotationIn):
         "score": round(plausible_count / total, 4) if total else 0.0,
     }
 
-    data = _load_human("plausibility", body.run, body.annotator)
-    data[body.image_path] = record
-    _save_human("plausibility", body.run, body.annotator, data)
+    await _save_human("plausibility", body.run, body.annotator, body.image_path, record)
     return {"saved": record}
 
 
@@ -0,0 +1,75 @@
+// A run that hasn't reported in this long without finishing most likely
+// died (e.g. the pytest process was killed) rather than stalled.
+const STALE_AFTER_SECONDS = 60;
+
+const $ = (sel) => document.querySelector(sel);
+
+const panels = {};
+
+function formatDuration(seconds) {
+  if (seconds == null) return "–";
+  const s = Math.round(seconds);
+  const h = Math.floor(s / 3600);
+  const m = Math.floor((s % 3600) / 60);
+  const rest = s % 60;
+  return h ? `${h}h ${m}m` : m ? `${m}m ${rest}s` : `${rest}s`;
+}
+
+function renderRun(status) {
+  let panel = panels[status.run_id];
+  if (!panel) {
+    panel = document.createElement("div");
+    panel.className = "panel";
+    panels[status.run_id] = panel;
+    $("#live-runs").appendChild(panel);
+  }
+
+  const done = status.completed + status.errored;
+  const pct = status.total ? (done / status.total) * 100 : 0;
+  const stale = !status.finished && Date.now() / 1000 - status.updated_at > STALE_AFTER_SECONDS;
+  const state = status.finished ? "finished" : stale ? "stale — no update recently" : "running";
+  const passRate = status.completed ? (status.passed / status.completed).toFixed(3) : "–";
+
+  panel.innerHTML = `
+    <h2>${status.run_id} (${state})</h2>
+    <div style="color:var(--muted); font-size:0.85rem;">
+      ${status.metric_name} · representation=${status.representation_prompt_version} ·
+      decomposition=${status.decomposition_prompt_version} · ${status.model} ·
+      concurrency=${status.concurrency}
+    </div>
+    <div class="live-progress-track"><div class="live-progress-fill" style="width:${pct}%"></div></div>
+    <div style="margin-top:10px; font-size:0.9rem;">
+      <strong>${done}/${status.total}</strong> done
+      (${status.completed} scored, ${status.errored} errored; pass rate ${passRate}) ·
+      ${status.images_per_sec.toFixed(2)} images/s ·
+      ${status.tokens_used.toLocaleString()} tokens ·
+      elapsed ${formatDuration(status.updated_at - status.started_at)} ·
+      ETA ${status.finished ? "done" : formatDuration(status.eta_seconds)}
+    </div>
+  `;
+}
+
+function follow(runId) {
+  const source = new EventSource(`/api/live/status/${encodeURIComponent(runId)}/events`);
+  source.onmessage = (e) => {
+    const status = JSON.parse(e.data);
+    renderRun(status);
+    if (status.finished) source.close();
+  };
+  source.addEventListener("gone", () => source.close());
+}
+
+async function init() {
+  const res = await fetch("/api/live/status");
+  const { runs } = await res.json();
+  if (!runs.length) {
+    $("#live-runs").innerHTML = `<p style="color:var(--muted);">No runs recorded yet.</p>`;
+    return;
+  }
+  for (const status of runs) {
+    renderRun(status);
+    if (!status.finished) follow(status.run_id);
+  }
+}
+
+init();